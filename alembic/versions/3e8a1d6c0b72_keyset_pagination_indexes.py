@@ -0,0 +1,31 @@
+"""keyset pagination indexes
+
+Revision ID: 3e8a1d6c0b72
+Revises: 5b7e2c9d4a1f
+Create Date: 2026-10-17 15:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8a1d6c0b72'
+down_revision: Union[str, Sequence[str], None] = '5b7e2c9d4a1f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_order_created_at_id', 'order', ['created_at', 'id'], unique=False)
+    op.create_index('ix_product_created_at_id', 'product', ['created_at', 'id'], unique=False)
+    op.create_index('ix_user_created_at_id', 'user', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_created_at_id', table_name='user')
+    op.drop_index('ix_product_created_at_id', table_name='product')
+    op.drop_index('ix_order_created_at_id', table_name='order')
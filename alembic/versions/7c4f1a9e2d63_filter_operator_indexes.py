@@ -0,0 +1,33 @@
+"""filter operator indexes
+
+Revision ID: 7c4f1a9e2d63
+Revises: 3e8a1d6c0b72
+Create Date: 2026-10-17 18:40:12.206415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4f1a9e2d63'
+down_revision: Union[str, Sequence[str], None] = '3e8a1d6c0b72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_order_product_id', 'order', ['product_id'], unique=False)
+    op.create_index('ix_product_category_id', 'product', ['category_id'], unique=False)
+    op.create_index('ix_product_price', 'product', ['price'], unique=False)
+    op.create_index('ix_product_name_pattern', 'product', ['name'], unique=False, postgresql_ops={'name': 'text_pattern_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_name_pattern', table_name='product')
+    op.drop_index('ix_product_price', table_name='product')
+    op.drop_index('ix_product_category_id', table_name='product')
+    op.drop_index('ix_order_product_id', table_name='order')
@@ -1,5 +1,5 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies.get_db import connection
 from app.schemas.access_rule import (
@@ -18,14 +18,17 @@ router = APIRouter()
 
 @router.get("", summary="Get access_rules")
 async def get_access_rules(
+    response: Response,
     filters: SchemaAccessRuleFilter = Depends(),
-    session: AsyncSession = Depends(connection()),
+    session: AsyncSession = Depends(connection(read_only=True, replica=True)),
     access: AccessContext = Depends(require_permission("access_rule")),
     pagination: PaginationParams = Depends(),
 ):
-    return await find_many_access_rule(
+    access_rules = await find_many_access_rule(
         access=access, filters=filters, session=session, pagination=pagination
     )
+    response.headers.update(pagination.page_headers())
+    return access_rules
 
 
 @router.patch(
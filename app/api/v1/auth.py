@@ -1,8 +1,15 @@
-from uuid import uuid4
 import structlog
-from fastapi import APIRouter, Depends, status, Cookie, HTTPException, Response
+from fastapi import (
+    APIRouter,
+    Depends,
+    status,
+    Cookie,
+    HTTPException,
+    Request,
+    Response,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.schemas.permission import AccessContext
+from app.core.login_throttle import get_throttle_ip, login_throttler
 from app.schemas.user import SchemaUserCreate, SchemaUserLogin, UserPublic
 from app.services.auth_service import AuthService
 from app.services.user import (
@@ -10,7 +17,6 @@ from app.services.user import (
     authenticate_user_api,
     refresh_user_tokens,
     set_token_in_cookie,
-    get_user_by_email,
 )
 from app.dependencies.get_db import connection
 
@@ -42,22 +48,18 @@ async def register_user(
 @router.post("/login")
 async def login_for_access_token(
     form_data: SchemaUserLogin,
+    request: Request,
     response: Response,
     session: AsyncSession = Depends(connection()),
 ) -> dict:
     filters = SchemaUserLogin(email=form_data.email, password="*****")
-    fake_uuid = uuid4()
-    access = AccessContext(user_id=fake_uuid, permissions=["read_all_permission"])
-    user = await get_user_by_email(
-        access=access, email=form_data.email, session=session
-    )
+    await login_throttler.check(email=form_data.email, ip=get_throttle_ip(request))
 
-    logger.debug("Login user", user_id=user.id, filters=filters)
+    logger.debug("Login user", filters=filters)
     tokens = await authenticate_user_api(user_in=form_data, session=session)
-    logger.info("Logined user", user_id=user.id, filters=filters)
 
     message = await set_token_in_cookie(response=response, tokens=tokens)
-    logger.info("Set token in cookie", user_id=user.id)
+    logger.info("Set token in cookie", filters=filters)
     return message
 
 
@@ -67,18 +69,18 @@ async def logout(
     access_token: str = Cookie(None, alias="access_token"),
     refresh_token: str = Cookie(None, alias="refresh_token"),
 ) -> dict:
-    payload = AuthService.decode_access_token(token=access_token)
+    payload = await AuthService.decode_access_token(token=access_token)
     user_id = payload.sub
 
     if access_token:
         logger.debug("Logout user: ban access token", user_id=user_id)
-        AuthService.ban_token(access_token)
+        await AuthService.ban_token(access_token)
         logger.info("Logouted user: baned access token", user_id=user_id)
     else:
         logger.debug("Logout user: has no access token", user_id=user_id)
     if refresh_token:
         logger.debug("Logout user: ban refresh token", user_id=user_id)
-        AuthService.ban_token(refresh_token)
+        await AuthService.ban_token(refresh_token)
         logger.info("Logouted user: baned refresh token", user_id=user_id)
     else:
         logger.debug("Logout user: has no refresh token", user_id=user_id)
@@ -101,7 +103,7 @@ async def refresh_token_endpoint(
     if not refresh_token:
         raise HTTPException(status_code=401, detail="Refresh token missing")
 
-    payload = AuthService.decode_refresh_token(token=refresh_token)
+    payload = await AuthService.decode_refresh_token(token=refresh_token)
     user_id = payload.sub
 
     logger.debug("Refresh token", user_id=user_id)
@@ -109,7 +111,7 @@ async def refresh_token_endpoint(
     logger.info("Refreshed token", user_id=user_id)
 
     logger.debug("Ban old refresh token", user_id=user_id)
-    AuthService.ban_token(refresh_token)
+    await AuthService.ban_token(refresh_token)
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
     logger.info("Baned old refresh token. deleted cookie", user_id=user_id)
@@ -1,8 +1,11 @@
+from typing import Annotated, List
 from uuid import UUID
 import structlog
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, Response, status
+from app.core.config import settings
 from app.core.enums import BusinessDomain, IsolationLevel
-from app.dependencies.get_db import auth_db_context
+from app.db.unit_of_work import run_in_transaction
+from app.dependencies.get_db import auth_context, auth_db_context
 from app.schemas.category import (
     SchemaCategoryBase,
     SchemaCategoryCreate,
@@ -12,11 +15,13 @@ from app.schemas.category import (
 from app.services.category import (
     find_many_category,
     add_one_category,
+    add_many_category,
+    upsert_many_category,
     update_one_category,
     delete_one_category,
 )
-from app.schemas.base import PaginationParams
-from app.schemas.permission import RequestContext
+from app.schemas.base import BulkCreateResult, FieldsParams, PaginationParams
+from app.schemas.permission import AccessContext, RequestContext
 
 
 logger = structlog.get_logger()
@@ -26,15 +31,19 @@ router = APIRouter()
 
 @router.get("", summary="Get categorys")
 async def get_categorys(
+    response: Response,
     request_context: RequestContext = Depends(
         auth_db_context(
             business_element=BusinessDomain.CATEGORY,
-            isolation_level=IsolationLevel.REPEATABLE_READ,
+            isolation_level=IsolationLevel.READ_COMMITTED,
             commit=False,
+            read_only=True,
+            replica=True,
         )
     ),
     filters: SchemaCategoryFilter = Depends(),
     pagination: PaginationParams = Depends(),
+    projection: FieldsParams = Depends(),
 ):
     logger.info("Get categorys", filters=filters, pagination=pagination)
     category = await find_many_category(
@@ -43,8 +52,10 @@ async def get_categorys(
         access=request_context.access,
         filters=filters,
         pagination=pagination,
+        fields=projection.columns,
     )
     logger.info("Geted categorys", filters=filters, pagination=pagination)
+    response.headers.update(pagination.page_headers())
     return category
 
 
@@ -70,6 +81,35 @@ async def create_category(
     return category
 
 
+@router.post(
+    "/bulk",
+    summary="Create or upsert categories in bulk",
+    response_model=BulkCreateResult[SchemaCategoryBase],
+)
+async def create_categories_bulk(
+    data: Annotated[
+        List[SchemaCategoryCreate],
+        Body(min_length=1, max_length=settings.BULK_MAX_ITEMS),
+    ],
+    upsert: bool = False,
+    access: AccessContext = Depends(
+        auth_context(business_element=BusinessDomain.CATEGORY)
+    ),
+):
+    logger.info("Add categories bulk", data=len(data), upsert=upsert)
+    add_many = upsert_many_category if upsert else add_many_category
+    results = await run_in_transaction(
+        add_many,
+        isolation_level=IsolationLevel.REPEATABLE_READ,
+        business_element=BusinessDomain.CATEGORY,
+        access=access,
+        data=data,
+    )
+    affected = sum(result.status != "failed" for result in results)
+    logger.info("Added categories bulk", data=affected, upsert=upsert)
+    return BulkCreateResult(affected=affected, results=results)
+
+
 @router.patch(
     "/{category_id}", summary="Update category", response_model=SchemaCategoryBase
 )
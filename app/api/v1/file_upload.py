@@ -1,10 +1,10 @@
 from pathlib import Path
 from uuid import UUID
 import structlog
-from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi import APIRouter, Depends, File, Response, UploadFile
 from app.core.enums import BusinessDomain, IsolationLevel
 from app.dependencies.get_db import auth_db_context
-from app.schemas.base import PaginationParams
+from app.schemas.base import FieldsParams, PaginationParams
 from app.schemas.permission import RequestContext
 from app.schemas.file_upload import (
     SchemaFileUploadBase,
@@ -28,15 +28,19 @@ OWNER_FIELD = "user_id"
 
 @router.get("", summary="Upload file")
 async def get_upload_files(
+    response: Response,
     request_context: RequestContext = Depends(
         auth_db_context(
             business_element=BusinessDomain.FILE_UPLOAD,
-            isolation_level=IsolationLevel.REPEATABLE_READ,
+            isolation_level=IsolationLevel.READ_COMMITTED,
             commit=False,
+            read_only=True,
+            replica=True,
         )
     ),
     filters: SchemaFileUploadFilter = Depends(),
     pagination: PaginationParams = Depends(),
+    projection: FieldsParams = Depends(),
 ):
     logger.info(
         "Get upload_files",
@@ -50,6 +54,7 @@ async def get_upload_files(
         filters=filters,
         session=request_context.session,
         pagination=pagination,
+        fields=projection.columns,
     )
     logger.info(
         "Geted upload_files",
@@ -57,6 +62,7 @@ async def get_upload_files(
         filters=filters,
         pagination=pagination,
     )
+    response.headers.update(pagination.page_headers())
     return file_upload
 
 
@@ -1,22 +1,33 @@
+from typing import Annotated, List
 from uuid import UUID
 import structlog
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, Response, status
+from app.core.config import settings
 from app.core.enums import BusinessDomain, IsolationLevel
-from app.dependencies.get_db import auth_db_context
+from app.db.unit_of_work import run_in_transaction
+from app.dependencies.get_db import auth_context, auth_db_context
+from app.schemas.base import BulkCreateResult, BulkResult
 from app.schemas.order import (
     SchemaOrderBase,
+    SchemaOrderBulkDelete,
+    SchemaOrderBulkPatch,
     SchemaOrderCreate,
     SchemaOrderFilter,
     SchemaOrderPatch,
 )
 from app.services.order import (
     find_many_order,
+    stream_many_order,
     add_one_order,
+    add_many_order,
     update_one_order,
     delete_one_order,
+    update_many_order,
+    delete_many_order,
 )
-from app.schemas.base import PaginationParams
-from app.schemas.permission import RequestContext
+from app.schemas.base import FieldsParams, PaginationParams
+from app.schemas.permission import AccessContext, RequestContext
+from app.utils.ndjson_stream import NDJSONResponse, ndjson_response
 
 
 logger = structlog.get_logger()
@@ -29,15 +40,19 @@ OWNER_FIELD = "user_id"
 
 @router.get("", summary="Get orders")
 async def get_orders(
+    response: Response,
     request_context: RequestContext = Depends(
         auth_db_context(
             business_element=BusinessDomain.ORDER,
-            isolation_level=IsolationLevel.REPEATABLE_READ,
+            isolation_level=IsolationLevel.READ_COMMITTED,
             commit=False,
+            read_only=True,
+            replica=True,
         )
     ),
     filters: SchemaOrderFilter = Depends(),
     pagination: PaginationParams = Depends(),
+    projection: FieldsParams = Depends(),
 ):
     logger.info(
         "Get orders", owner_field=OWNER_FIELD, filters=filters, pagination=pagination
@@ -48,53 +63,145 @@ async def get_orders(
         filters=filters,
         session=request_context.session,
         pagination=pagination,
+        fields=projection.columns,
     )
     logger.info(
         "Geted orders", owner_field=OWNER_FIELD, filters=filters, pagination=pagination
     )
+    response.headers.update(pagination.page_headers())
     return order
 
 
-@router.post("", summary="Create order")
-async def create_order(
-    data: SchemaOrderCreate,
+@router.get(
+    "/export",
+    summary="Export orders (NDJSON stream)",
+    response_class=NDJSONResponse,
+)
+async def export_orders(
     request_context: RequestContext = Depends(
         auth_db_context(
             business_element=BusinessDomain.ORDER,
-            isolation_level=IsolationLevel.REPEATABLE_READ,
-            commit=True,
+            isolation_level=IsolationLevel.READ_COMMITTED,
+            commit=False,
+            read_only=True,
+            replica=True,
         )
     ),
+    filters: SchemaOrderFilter = Depends(),
+    projection: FieldsParams = Depends(),
 ):
-    logger.info("Add order", data=data)
-    order = await add_one_order(
+    logger.info("Export orders", owner_field=OWNER_FIELD, filters=filters)
+    batches = await stream_many_order(
         business_element=BusinessDomain.ORDER,
         access=request_context.access,
-        data=data,
+        filters=filters,
         session=request_context.session,
+        fields=projection.columns,
+    )
+    return ndjson_response(batches, filename="orders")
+
+
+@router.post("", summary="Create order")
+async def create_order(
+    data: SchemaOrderCreate,
+    access: AccessContext = Depends(
+        auth_context(business_element=BusinessDomain.ORDER)
+    ),
+):
+    logger.info("Add order", data=data)
+    order = await run_in_transaction(
+        add_one_order,
+        isolation_level=IsolationLevel.REPEATABLE_READ,
+        business_element=BusinessDomain.ORDER,
+        access=access,
+        data=data,
     )
     logger.info("Added order", data=data)
     return order
 
 
+@router.post(
+    "/bulk",
+    summary="Create orders in bulk",
+    response_model=BulkCreateResult[SchemaOrderBase],
+)
+async def create_orders_bulk(
+    data: Annotated[
+        List[SchemaOrderCreate],
+        Body(min_length=1, max_length=settings.BULK_MAX_ITEMS),
+    ],
+    access: AccessContext = Depends(
+        auth_context(business_element=BusinessDomain.ORDER)
+    ),
+):
+    logger.info("Add orders bulk", data=len(data))
+    results = await run_in_transaction(
+        add_many_order,
+        isolation_level=IsolationLevel.REPEATABLE_READ,
+        business_element=BusinessDomain.ORDER,
+        access=access,
+        data=data,
+    )
+    affected = sum(result.status != "failed" for result in results)
+    logger.info("Added orders bulk", data=affected)
+    return BulkCreateResult(affected=affected, results=results)
+
+
+@router.patch("/bulk", summary="Update orders in bulk", response_model=BulkResult)
+async def edit_orders_bulk(
+    data: SchemaOrderBulkPatch,
+    access: AccessContext = Depends(
+        auth_context(business_element=BusinessDomain.ORDER)
+    ),
+):
+    logger.info("Update orders bulk", filters=data.filters, data=data.ids)
+    results = await run_in_transaction(
+        update_many_order,
+        isolation_level=IsolationLevel.REPEATABLE_READ,
+        business_element=BusinessDomain.ORDER,
+        access=access,
+        data=data,
+    )
+    affected = sum(result.status == "updated" for result in results)
+    logger.info("Updated orders bulk", filters=data.filters, data=affected)
+    return BulkResult(affected=affected, results=results)
+
+
+@router.delete("/bulk", summary="Delete orders in bulk", response_model=BulkResult)
+async def delete_orders_bulk(
+    data: SchemaOrderBulkDelete,
+    access: AccessContext = Depends(
+        auth_context(business_element=BusinessDomain.ORDER)
+    ),
+):
+    logger.info("Delete orders bulk", filters=data.filters, data=data.ids)
+    results = await run_in_transaction(
+        delete_many_order,
+        isolation_level=IsolationLevel.REPEATABLE_READ,
+        business_element=BusinessDomain.ORDER,
+        access=access,
+        data=data,
+    )
+    affected = sum(result.status == "deleted" for result in results)
+    logger.info("Deleted orders bulk", filters=data.filters, data=affected)
+    return BulkResult(affected=affected, results=results)
+
+
 @router.patch("/{order_id}", summary="Update order", response_model=SchemaOrderBase)
 async def edit_order(
     order_id: UUID,
     data: SchemaOrderPatch,
-    request_context: RequestContext = Depends(
-        auth_db_context(
-            business_element=BusinessDomain.ORDER,
-            isolation_level=IsolationLevel.REPEATABLE_READ,
-            commit=True,
-        )
+    access: AccessContext = Depends(
+        auth_context(business_element=BusinessDomain.ORDER)
     ),
 ):
     logger.info("Update order", data=data, model_id=order_id)
-    updated_order = await update_one_order(
+    updated_order = await run_in_transaction(
+        update_one_order,
+        isolation_level=IsolationLevel.REPEATABLE_READ,
         business_element=BusinessDomain.ORDER,
-        access=request_context.access,
+        access=access,
         data=data,
-        session=request_context.session,
         order_id=order_id,
     )
     logger.info("Updated order", data=data, model_id=order_id)
@@ -106,19 +213,16 @@ async def edit_order(
 )
 async def delete_product(
     order_id: UUID,
-    request_context: RequestContext = Depends(
-        auth_db_context(
-            business_element=BusinessDomain.ORDER,
-            isolation_level=IsolationLevel.REPEATABLE_READ,
-            commit=True,
-        )
+    access: AccessContext = Depends(
+        auth_context(business_element=BusinessDomain.ORDER)
     ),
 ):
     logger.info("Delete order", model_id=order_id)
-    await delete_one_order(
+    await run_in_transaction(
+        delete_one_order,
+        isolation_level=IsolationLevel.REPEATABLE_READ,
         business_element=BusinessDomain.ORDER,
-        access=request_context.access,
-        session=request_context.session,
+        access=access,
         order_id=order_id,
     )
     logger.info("Deleted order", model_id=order_id)
@@ -22,7 +22,7 @@ router = APIRouter()
 @router.get("", response_model=List[dict], summary="Get roles")
 async def get_users(
     filters: SchemaUserRolesFilter = Depends(),
-    session: AsyncSession = Depends(connection()),
+    session: AsyncSession = Depends(connection(read_only=True, replica=True)),
     access: AccessContext = Depends(require_permission("user_roles")),
 ):
     return await get_all_user_roles(filters=filters, access=access, session=session)
@@ -1,8 +1,11 @@
+from typing import Annotated, List
 from uuid import UUID
 import structlog
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, Response, status
+from app.core.config import settings
 from app.core.enums import BusinessDomain, IsolationLevel
-from app.dependencies.get_db import auth_db_context
+from app.db.unit_of_work import run_in_transaction
+from app.dependencies.get_db import auth_context, auth_db_context
 from app.schemas.product import (
     SchemaProductBase,
     SchemaProductCreate,
@@ -11,12 +14,16 @@ from app.schemas.product import (
 )
 from app.services.product import (
     find_many_product,
+    stream_many_product,
     add_one_product,
+    add_many_product,
+    upsert_many_product,
     update_one_product,
     delete_one_product,
 )
-from app.schemas.base import PaginationParams
-from app.schemas.permission import RequestContext
+from app.schemas.base import BulkCreateResult, FieldsParams, PaginationParams
+from app.schemas.permission import AccessContext, RequestContext
+from app.utils.ndjson_stream import NDJSONResponse, ndjson_response
 
 
 logger = structlog.get_logger()
@@ -27,15 +34,19 @@ router = APIRouter()
 
 @router.get("", summary="Get products")
 async def get_products(
+    response: Response,
     request_context: RequestContext = Depends(
         auth_db_context(
             business_element=BusinessDomain.PRODUCT,
-            isolation_level=IsolationLevel.REPEATABLE_READ,
+            isolation_level=IsolationLevel.READ_COMMITTED,
             commit=False,
+            read_only=True,
+            replica=True,
         )
     ),
     filters: SchemaProductFilter = Depends(),
     pagination: PaginationParams = Depends(),
+    projection: FieldsParams = Depends(),
 ):
     logger.info("Get products", filters=filters, pagination=pagination)
     product = await find_many_product(
@@ -44,11 +55,42 @@ async def get_products(
         access=request_context.access,
         filters=filters,
         pagination=pagination,
+        fields=projection.columns,
     )
     logger.info("Geted products", filters=filters, pagination=pagination)
+    response.headers.update(pagination.page_headers())
     return product
 
 
+@router.get(
+    "/export",
+    summary="Export products (NDJSON stream)",
+    response_class=NDJSONResponse,
+)
+async def export_products(
+    request_context: RequestContext = Depends(
+        auth_db_context(
+            business_element=BusinessDomain.PRODUCT,
+            isolation_level=IsolationLevel.READ_COMMITTED,
+            commit=False,
+            read_only=True,
+            replica=True,
+        )
+    ),
+    filters: SchemaProductFilter = Depends(),
+    projection: FieldsParams = Depends(),
+):
+    logger.info("Export products", filters=filters)
+    batches = await stream_many_product(
+        business_element=BusinessDomain.PRODUCT,
+        access=request_context.access,
+        filters=filters,
+        session=request_context.session,
+        fields=projection.columns,
+    )
+    return ndjson_response(batches, filename="products")
+
+
 @router.post("", summary="Create product")
 async def create_product(
     data: SchemaProductCreate,
@@ -71,6 +113,35 @@ async def create_product(
     return product
 
 
+@router.post(
+    "/bulk",
+    summary="Create or upsert products in bulk",
+    response_model=BulkCreateResult[SchemaProductBase],
+)
+async def create_products_bulk(
+    data: Annotated[
+        List[SchemaProductCreate],
+        Body(min_length=1, max_length=settings.BULK_MAX_ITEMS),
+    ],
+    upsert: bool = False,
+    access: AccessContext = Depends(
+        auth_context(business_element=BusinessDomain.PRODUCT)
+    ),
+):
+    logger.info("Add products bulk", data=len(data), upsert=upsert)
+    add_many = upsert_many_product if upsert else add_many_product
+    results = await run_in_transaction(
+        add_many,
+        isolation_level=IsolationLevel.REPEATABLE_READ,
+        business_element=BusinessDomain.PRODUCT,
+        access=access,
+        data=data,
+    )
+    affected = sum(result.status != "failed" for result in results)
+    logger.info("Added products bulk", data=affected, upsert=upsert)
+    return BulkCreateResult(affected=affected, results=results)
+
+
 @router.patch(
     "/{product_id}", summary="Update product", response_model=SchemaProductBase
 )
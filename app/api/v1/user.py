@@ -1,16 +1,22 @@
-from typing import List
+from typing import Any, Dict, List
 from uuid import UUID
 import structlog
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.enums import BusinessDomain, IsolationLevel
 from app.schemas.user import SchemaUserPatch, SchemaUserFilter, SchemaUserBase
-from app.services.user import find_many_user, update_user, soft_delete_user
+from app.services.user import (
+    find_many_user,
+    stream_many_user,
+    update_user,
+    soft_delete_user,
+)
 from app.dependencies.get_db import connection, auth_db_context
 from app.dependencies.permissions import require_permission
 from app.schemas.permission import AccessContext
-from app.schemas.base import PaginationParams
+from app.schemas.base import FieldsParams, PaginationParams
 from app.schemas.permission import RequestContext
+from app.utils.ndjson_stream import NDJSONResponse, ndjson_response
 
 
 logger = structlog.get_logger()
@@ -19,17 +25,26 @@ logger = structlog.get_logger()
 router = APIRouter()
 
 
-@router.get("", summary="Get users", response_model=List[SchemaUserBase])
+# с fields= строки приходят словарями только с запрошенными полями
+@router.get(
+    "",
+    summary="Get users",
+    response_model=List[SchemaUserBase | Dict[str, Any]],
+)
 async def get_users(
+    response: Response,
     request_context: RequestContext = Depends(
         auth_db_context(
             business_element=BusinessDomain.USER,
-            isolation_level=IsolationLevel.REPEATABLE_READ,
+            isolation_level=IsolationLevel.READ_COMMITTED,
             commit=False,
+            read_only=True,
+            replica=True,
         )
     ),
     filters: SchemaUserFilter = Depends(),
     pagination: PaginationParams = Depends(),
+    projection: FieldsParams = Depends(),
 ):
     user = await find_many_user(
         business_element=BusinessDomain.USER,
@@ -37,11 +52,42 @@ async def get_users(
         access=request_context.access,
         filters=filters,
         pagination=pagination,
+        fields=projection.columns,
     )
     logger.info("Get users", filters=filters, pagination=pagination)
+    response.headers.update(pagination.page_headers())
     return user
 
 
+@router.get(
+    "/export",
+    summary="Export users (NDJSON stream)",
+    response_class=NDJSONResponse,
+)
+async def export_users(
+    request_context: RequestContext = Depends(
+        auth_db_context(
+            business_element=BusinessDomain.USER,
+            isolation_level=IsolationLevel.READ_COMMITTED,
+            commit=False,
+            read_only=True,
+            replica=True,
+        )
+    ),
+    filters: SchemaUserFilter = Depends(),
+    projection: FieldsParams = Depends(),
+):
+    logger.info("Export users", filters=filters)
+    batches = await stream_many_user(
+        business_element=BusinessDomain.USER,
+        access=request_context.access,
+        filters=filters,
+        session=request_context.session,
+        fields=projection.columns,
+    )
+    return ndjson_response(batches, filename="users")
+
+
 @router.patch("/{id}", summary="Update user", response_model=SchemaUserBase)
 async def edit_user(
     user_id: UUID,
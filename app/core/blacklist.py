@@ -1,6 +1,241 @@
-from cachetools import TTLCache
+"""
+Чёрный список отозванных токенов.
+Ключ - дайджест токена (128 бит sha256), а не сам JWT: запись в разы меньше.
+Бэкенды (TOKEN_BLACKLIST_BACKEND):
+    memory   - TLRUCache в памяти воркера, запись живёт до exp токена
+    postgres - таблица revokedtoken, общая для всех воркеров uvicorn
+Перед бэкендом стоит фильтр Блума, поэтому частая проверка "токен не отозван"
+не уходит в сеть. Для postgres фильтр догружается из таблицы не реже
+TOKEN_BLACKLIST_SYNC_SECONDS: отзыв в соседнем воркере начинает действовать
+с задержкой не больше этого интервала, в своём воркере - сразу
+"""
+
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+import structlog
+from cachetools import TLRUCache
+from prometheus_client import Counter, Gauge
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.bloom_filter import BloomFilter
 from app.core.config import settings
+from app.db.session import async_session_maker
+from app.models.revoked_token import RevokedToken
+
+
+logger = structlog.get_logger()
+
+TOKEN_BLACKLIST_CHECKS = Counter(
+    "token_blacklist_checks_total",
+    "Проверки токена по чёрному списку",
+    ["result"],
+)
+TOKEN_BLACKLIST_BLOOM_SIZE = Gauge(
+    "token_blacklist_bloom_entries", "Количество записей в фильтре Блума"
+)
+
+# перекрытие окна догрузки: запись, закоммиченная чуть позже своего created_at,
+# не должна выпасть между двумя синхронизациями
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+class MemoryBlacklistBackend:
+    """Чёрный список в памяти воркера. Подходит для запуска с одним воркером"""
+
+    shared = False
+
+    def __init__(self, maxsize: int):
+        self.cache = TLRUCache(
+            maxsize=maxsize,
+            ttu=lambda _key, expires_at, _now: expires_at,
+            timer=time.time,
+        )
+
+    async def add(self, digest: str, expires_at: datetime) -> None:
+        self.cache[digest] = expires_at.timestamp()
+
+    async def contains(self, digest: str) -> bool:
+        return digest in self.cache
+
+    async def fetch_since(
+        self, since: Optional[datetime]
+    ) -> Tuple[List[str], Optional[datetime]]:
+        return list(self.cache.keys()), None
+
+    async def purge_expired(self) -> None:
+        self.cache.expire()
+
+
+class PostgresBlacklistBackend:
+    """Чёрный список в таблице revokedtoken, общий для всех воркеров"""
+
+    shared = True
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    async def add(self, digest: str, expires_at: datetime) -> None:
+        stmt = (
+            insert(RevokedToken)
+            .values(digest=digest, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedToken.digest])
+        )
+        async with self.session_factory() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def contains(self, digest: str) -> bool:
+        query = select(
+            exists().where(
+                RevokedToken.digest == digest,
+                RevokedToken.expires_at > func.now(),
+            )
+        )
+        async with self.session_factory() as session:
+            return bool(await session.scalar(query))
+
+    async def fetch_since(
+        self, since: Optional[datetime]
+    ) -> Tuple[List[str], Optional[datetime]]:
+        query = select(RevokedToken.digest, RevokedToken.created_at).where(
+            RevokedToken.expires_at > func.now()
+        )
+        if since is not None:
+            query = query.where(RevokedToken.created_at > since)
+        async with self.session_factory() as session:
+            rows = (await session.execute(query)).all()
+        watermark = max((row.created_at for row in rows), default=since)
+        return [row.digest for row in rows], watermark
+
+    async def purge_expired(self) -> None:
+        async with self.session_factory() as session:
+            await session.execute(
+                delete(RevokedToken).where(RevokedToken.expires_at <= func.now())
+            )
+            await session.commit()
+
+
+class TokenBlacklist:
+    def __init__(
+        self,
+        backend,
+        bloom_capacity: int,
+        bloom_error_rate: float,
+        sync_seconds: float,
+        rebuild_seconds: float,
+    ):
+        self.backend = backend
+        self.bloom = BloomFilter(capacity=bloom_capacity, error_rate=bloom_error_rate)
+        self.sync_seconds = sync_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self._synced_at: Optional[float] = None
+        self._rebuilt_at: Optional[float] = None
+        self._watermark: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+        TOKEN_BLACKLIST_BLOOM_SIZE.set_function(lambda: self.bloom.count)
+
+    async def ban(self, token: str, expires_at: datetime) -> None:
+        digest = token_digest(token)
+        await self.backend.add(digest, expires_at)
+        self.bloom.add(digest)
+
+    async def is_revoked(self, token: str) -> bool:
+        await self._maybe_sync()
+        digest = token_digest(token)
+        if digest not in self.bloom:
+            TOKEN_BLACKLIST_CHECKS.labels(result="bloom_negative").inc()
+            return False
+        revoked = await self.backend.contains(digest)
+        TOKEN_BLACKLIST_CHECKS.labels(
+            result="revoked" if revoked else "false_positive"
+        ).inc()
+        return revoked
+
+    async def _maybe_sync(self) -> None:
+        if not self.backend.shared:
+            return
+        if self._synced_at is not None:
+            if time.monotonic() - self._synced_at < self.sync_seconds:
+                return
+            # синхронизацию уже выполняет другой запрос - не ждём его
+            if self._lock.locked():
+                return
+        # до первой синхронизации фильтр пуст, поэтому её дожидаются все запросы
+        async with self._lock:
+            now = time.monotonic()
+            if (
+                self._synced_at is not None
+                and now - self._synced_at < self.sync_seconds
+            ):
+                return
+            try:
+                await self._sync(now)
+            except (SQLAlchemyError, OSError, asyncio.TimeoutError) as exc:
+                logger.error("Token blacklist sync failed", error=str(exc))
+            self._synced_at = now
+
+    async def _sync(self, now: float) -> None:
+        # из фильтра Блума нельзя удалять, поэтому периодически он пересобирается
+        # только из неистёкших записей
+        if self._rebuilt_at is None or now - self._rebuilt_at >= self.rebuild_seconds:
+            await self.backend.purge_expired()
+            digests, self._watermark = await self.backend.fetch_since(None)
+            bloom = BloomFilter(
+                capacity=self.bloom.capacity, error_rate=self.bloom.error_rate
+            )
+            for digest in digests:
+                bloom.add(digest)
+            self.bloom = bloom
+            self._rebuilt_at = now
+            if bloom.count > bloom.capacity:
+                logger.warning(
+                    "Token blacklist bloom filter over capacity",
+                    data=bloom.count,
+                )
+            return
+
+        since = self._watermark - SYNC_OVERLAP if self._watermark else None
+        digests, watermark = await self.backend.fetch_since(since)
+        for digest in digests:
+            self.bloom.add(digest)
+        if watermark is not None:
+            self._watermark = watermark
+
+
+def create_token_blacklist() -> TokenBlacklist:
+    if settings.TOKEN_BLACKLIST_BACKEND == "postgres":
+        backend = PostgresBlacklistBackend(session_factory=async_session_maker)
+    elif settings.TOKEN_BLACKLIST_BACKEND == "memory":
+        backend = MemoryBlacklistBackend(maxsize=settings.TOKEN_BLACKLIST_MAXSIZE)
+    else:
+        raise ValueError(
+            f"Unknown TOKEN_BLACKLIST_BACKEND: {settings.TOKEN_BLACKLIST_BACKEND}"
+        )
+    return TokenBlacklist(
+        backend=backend,
+        bloom_capacity=settings.TOKEN_BLACKLIST_BLOOM_CAPACITY,
+        bloom_error_rate=settings.TOKEN_BLACKLIST_BLOOM_ERROR_RATE,
+        sync_seconds=settings.TOKEN_BLACKLIST_SYNC_SECONDS,
+        rebuild_seconds=settings.TOKEN_BLACKLIST_REBUILD_SECONDS,
+    )
+
+
+token_blacklist = create_token_blacklist()
 
 
-TTL = (settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60) + 60
-token_blacklist = TTLCache(maxsize=10000, ttl=TTL)
+def token_expires_at(payload: dict) -> datetime:
+    """Срок жизни записи в чёрном списке - до exp токена"""
+    exp = payload.get("exp")
+    if exp is None:
+        return datetime.now(timezone.utc) + timedelta(
+            hours=settings.REFRESH_TOKEN_EXPIRE_HOURS
+        )
+    return datetime.fromtimestamp(exp, tz=timezone.utc)
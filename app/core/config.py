@@ -36,6 +36,68 @@ class Settings(BaseSettings):
     DB_PORT_EXTERNAL: int
     DB_PORT_INTERNAL: int
 
+    # пул соединений на каждый воркер uvicorn
+    DB_POOL_SIZE: int = 5
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = -1  # -1 - не пересоздавать соединения
+    DB_POOL_PRE_PING: bool = False
+    # кеш prepared statements asyncpg на соединение, 0 для pgbouncer.
+    # Шаблоны запросов BaseDAO дают по форме на набор фильтров - с запасом
+    DB_STATEMENT_CACHE_SIZE: int = 500
+
+    # реплики для читающих запросов: postgresql+asyncpg://... через запятую
+    DB_REPLICA_URLS: str = ""
+    DB_REPLICA_STRATEGY: str = "round_robin"  # round_robin | least_connections
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5
+    DB_REPLICA_LAG_CHECK_SECONDS: float = 5
+
+    # повтор транзакции при 40001 / 40P01 (run_in_transaction)
+    DB_RETRY_ATTEMPTS: int = 3
+    DB_RETRY_BASE_DELAY_SECONDS: float = 0.02
+    DB_RETRY_MAX_DELAY_SECONDS: float = 0.5
+
+    # одна форма SQL чаще N раз за запрос - предупреждение о N+1
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # X-Total-Count без фильтров: выше стольких строк (pg_class.reltuples)
+    # отдаётся оценка вместо count(*)
+    COUNT_ESTIMATE_THRESHOLD: int = 100000
+
+    # bulk-эндпоинты: максимум объектов в теле и порог перехода на COPY
+    BULK_MAX_ITEMS: int = 1000
+    BULK_COPY_THRESHOLD: int = 500
+
+    # NDJSON-выгрузка (/export): строк за одну выборку серверного курсора
+    EXPORT_BATCH_SIZE: int = 1000
+
+    PERMISSION_CACHE_MAXSIZE: int = 10000
+    PERMISSION_CACHE_TTL_SECONDS: int = 300
+    AUTH_PERMISSIONS_IN_TOKEN: bool = False
+    PERMISSION_VERSION_TTL_SECONDS: int = 5
+
+    TOKEN_BLACKLIST_BACKEND: str = "memory"  # memory | postgres
+    TOKEN_BLACKLIST_MAXSIZE: int = 100000
+    TOKEN_BLACKLIST_BLOOM_CAPACITY: int = 100000
+    TOKEN_BLACKLIST_BLOOM_ERROR_RATE: float = 0.001
+    TOKEN_BLACKLIST_SYNC_SECONDS: float = 2
+    TOKEN_BLACKLIST_REBUILD_SECONDS: float = 600
+    ACCESS_TOKEN_CACHE_MAXSIZE: int = 10000
+
+    PASSWORD_HASHER_WORKERS: int = 0  # 0 - по числу ядер CPU
+    PASSWORD_HASHER_MAX_QUEUE: int = 100
+
+    LOGIN_THROTTLE_BACKEND: str = "memory"  # memory | postgres
+    LOGIN_THROTTLE_MAXSIZE: int = 100000
+    LOGIN_THROTTLE_EMAIL_BURST: int = 5
+    LOGIN_THROTTLE_EMAIL_PER_MINUTE: float = 5
+    LOGIN_THROTTLE_IP_BURST: int = 20
+    LOGIN_THROTTLE_IP_PER_MINUTE: float = 30
+    LOGIN_THROTTLE_PURGE_SECONDS: float = 600
+    # прокси, которым верим X-Forwarded-For: IP или CIDR через запятую.
+    # Пусто - корзина IP по адресу TCP-соединения
+    LOGIN_THROTTLE_TRUSTED_PROXIES: str = ""
+
     @property
     def DATABASE_URL(self) -> str:  # pylint: disable=invalid-name
         if settings.DEBUG:
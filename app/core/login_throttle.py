@@ -0,0 +1,211 @@
+"""
+Ограничение попыток входа: корзина токенов на email и на IP клиента.
+Каждая попытка логина стоит полной проверки bcrypt, поэтому перебор паролей
+не должен вытеснять обычных пользователей из пула хеширования.
+Бэкенды (LOGIN_THROTTLE_BACKEND):
+    memory   - корзины в памяти воркера, лимит действует на каждый воркер отдельно
+    postgres - таблица loginthrottle, лимит общий для всех воркеров uvicorn
+"""
+
+import ipaddress
+import math
+import time
+from functools import lru_cache
+from typing import Tuple, Union
+import structlog
+from cachetools import TLRUCache
+from fastapi import Request
+from prometheus_client import Counter
+from sqlalchemy import case, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.config import settings
+from app.core.security import password_hasher
+from app.db.session import async_session_maker
+from app.exceptions.base import PasswordHasherBusyError, TooManyLoginAttemptsError
+from app.models.login_throttle import LoginThrottle
+
+
+logger = structlog.get_logger()
+
+LOGIN_THROTTLE_REJECTED = Counter(
+    "login_throttle_rejected_total",
+    "Отклонённые попытки входа",
+    ["scope"],
+)
+
+
+class MemoryLoginThrottleBackend:
+    """Корзины в памяти воркера. Запись живёт, пока корзина не наполнится"""
+
+    def __init__(self, maxsize: int):
+        self.buckets = TLRUCache(
+            maxsize=maxsize,
+            ttu=lambda _key, bucket, _now: bucket[2],
+            timer=time.monotonic,
+        )
+
+    async def take(self, key: str, capacity: int, rate: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, refilled_at, _full_at = self.buckets.get(key, (capacity, now, now))
+        tokens = min(capacity, tokens + (now - refilled_at) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self.buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+        return allowed, tokens
+
+
+class PostgresLoginThrottleBackend:
+    """Корзины в таблице loginthrottle: пополнение и списание одним upsert"""
+
+    def __init__(self, session_factory, purge_seconds: float):
+        self.session_factory = session_factory
+        # purge_seconds должен быть не меньше времени полного пополнения корзины
+        self.purge_seconds = purge_seconds
+        self._purged_at = time.monotonic()
+
+    async def take(self, key: str, capacity: int, rate: float) -> Tuple[bool, float]:
+        elapsed = func.extract("epoch", func.now() - LoginThrottle.refilled_at)
+        refilled = func.least(capacity, LoginThrottle.tokens + elapsed * rate)
+        stmt = (
+            insert(LoginThrottle)
+            .values(
+                key=key,
+                tokens=capacity - 1,
+                refilled_at=func.now(),
+                last_allowed=True,
+            )
+            .on_conflict_do_update(
+                index_elements=[LoginThrottle.key],
+                set_={
+                    "tokens": case((refilled >= 1, refilled - 1), else_=refilled),
+                    "refilled_at": func.now(),
+                    "last_allowed": refilled >= 1,
+                },
+            )
+            .returning(LoginThrottle.last_allowed, LoginThrottle.tokens)
+        )
+        async with self.session_factory() as session:
+            row = (await session.execute(stmt)).one()
+            await session.commit()
+        await self._maybe_purge()
+        return row.last_allowed, row.tokens
+
+    async def _maybe_purge(self) -> None:
+        now = time.monotonic()
+        if now - self._purged_at < self.purge_seconds:
+            return
+        self._purged_at = now
+        # давно не тронутая корзина уже полная - строка не нужна
+        stmt = delete(LoginThrottle).where(
+            LoginThrottle.refilled_at
+            < func.now() - func.make_interval(0, 0, 0, 0, 0, 0, self.purge_seconds)
+        )
+        async with self.session_factory() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+
+class LoginThrottler:
+    def __init__(
+        self,
+        backend,
+        email_burst: int,
+        email_per_minute: float,
+        ip_burst: int,
+        ip_per_minute: float,
+    ):
+        self.backend = backend
+        self.limits = {
+            "ip": (ip_burst, ip_per_minute / 60),
+            "email": (email_burst, email_per_minute / 60),
+        }
+
+    async def check(self, email: str, ip: str) -> None:
+        """
+        Вызывается до запроса в БД и bcrypt. Сначала отсекает попытку,
+        если пул хеширования уже заполнен (503), затем списывает токены
+        из корзин IP и email (429)
+        """
+        if password_hasher.busy:
+            LOGIN_THROTTLE_REJECTED.labels(scope="hasher").inc()
+            logger.error("PasswordHasherBusyError", error="bcrypt queue is full")
+            raise PasswordHasherBusyError
+        for scope, value in (("ip", ip), ("email", email.lower())):
+            capacity, rate = self.limits[scope]
+            try:
+                allowed, tokens = await self.backend.take(
+                    f"{scope}:{value}", capacity, rate
+                )
+            except (SQLAlchemyError, OSError) as exc:
+                # лимитер не должен ронять логин: без него работает как раньше
+                logger.error("Login throttle failed", error=str(exc))
+                return
+            if not allowed:
+                LOGIN_THROTTLE_REJECTED.labels(scope=scope).inc()
+                logger.error("TooManyLoginAttemptsError", scope=scope)
+                raise TooManyLoginAttemptsError(
+                    retry_after=math.ceil((1 - tokens) / rate)
+                )
+
+
+@lru_cache(maxsize=8)
+def _trusted_networks(
+    proxies: str,
+) -> Tuple[Union[ipaddress.IPv4Network, ipaddress.IPv6Network], ...]:
+    return tuple(
+        ipaddress.ip_network(proxy.strip(), strict=False)
+        for proxy in proxies.split(",")
+        if proxy.strip()
+    )
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    networks = _trusted_networks(settings.LOGIN_THROTTLE_TRUSTED_PROXIES)
+    return any(ip in network for network in networks)
+
+
+def get_throttle_ip(request: Request) -> str:
+    """
+    IP для корзины лимитера. X-Forwarded-For задаёт клиент, и верить ему
+    можно только за доверенным прокси: берётся самый правый адрес цепочки,
+    который не принадлежит доверенному прокси - его дописал наш прокси
+    """
+    peer = request.client.host if request.client else "unknown"
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded or not _is_trusted_proxy(peer):
+        return peer
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+def create_login_throttler() -> LoginThrottler:
+    if settings.LOGIN_THROTTLE_BACKEND == "postgres":
+        backend = PostgresLoginThrottleBackend(
+            session_factory=async_session_maker,
+            purge_seconds=settings.LOGIN_THROTTLE_PURGE_SECONDS,
+        )
+    elif settings.LOGIN_THROTTLE_BACKEND == "memory":
+        backend = MemoryLoginThrottleBackend(maxsize=settings.LOGIN_THROTTLE_MAXSIZE)
+    else:
+        raise ValueError(
+            f"Unknown LOGIN_THROTTLE_BACKEND: {settings.LOGIN_THROTTLE_BACKEND}"
+        )
+    return LoginThrottler(
+        backend=backend,
+        email_burst=settings.LOGIN_THROTTLE_EMAIL_BURST,
+        email_per_minute=settings.LOGIN_THROTTLE_EMAIL_PER_MINUTE,
+        ip_burst=settings.LOGIN_THROTTLE_IP_BURST,
+        ip_per_minute=settings.LOGIN_THROTTLE_IP_PER_MINUTE,
+    )
+
+
+login_throttler = create_login_throttler()
@@ -0,0 +1,83 @@
+"""
+Кеш разрешений пользователя на бизнес-элемент в рамках одного воркера.
+Ключ: (user_id, business_element). is_active сюда не попадает: инвалидация
+локальна для воркера, а деактивация должна действовать сразу везде.
+Инвалидация - при изменении ролей, правил доступа и деактивации пользователя.
+Метрики попаданий/промахов отдаются через общий /metrics
+"""
+
+from typing import List, Optional
+from uuid import UUID
+from cachetools import TTLCache
+from prometheus_client import Counter, Gauge
+from app.core.config import settings
+
+
+permission_cache = TTLCache(
+    maxsize=settings.PERMISSION_CACHE_MAXSIZE,
+    ttl=settings.PERMISSION_CACHE_TTL_SECONDS,
+)
+
+PERMISSION_CACHE_HITS = Counter(
+    "permission_cache_hits_total", "Попадания в кеш разрешений"
+)
+PERMISSION_CACHE_MISSES = Counter(
+    "permission_cache_misses_total", "Промахи кеша разрешений"
+)
+PERMISSION_CACHE_INVALIDATIONS = Counter(
+    "permission_cache_invalidations_total", "Инвалидации кеша разрешений", ["scope"]
+)
+PERMISSION_CACHE_SIZE = Gauge("permission_cache_size", "Размер кеша разрешений")
+PERMISSION_CACHE_SIZE.set_function(lambda: len(permission_cache))
+
+# версия прав для токенов с permission claims, перечитывается из БД не чаще TTL
+permission_version_cache = TTLCache(
+    maxsize=1, ttl=settings.PERMISSION_VERSION_TTL_SECONDS
+)
+
+
+def _make_key(user_id: UUID, business_element: Optional[str]) -> tuple:
+    # BusinessDomain(str, Enum) хешируется по имени, а не по значению
+    return user_id, getattr(business_element, "value", business_element)
+
+
+def get_cached_permissions(
+    user_id: UUID, business_element: Optional[str]
+) -> Optional[List[str]]:
+    permissions = permission_cache.get(_make_key(user_id, business_element))
+    if permissions is None:
+        PERMISSION_CACHE_MISSES.inc()
+        return None
+    PERMISSION_CACHE_HITS.inc()
+    return list(permissions)
+
+
+def set_cached_permissions(
+    user_id: UUID, business_element: Optional[str], permissions: List[str]
+) -> None:
+    permission_cache[_make_key(user_id, business_element)] = tuple(permissions)
+
+
+def get_cached_permission_version() -> Optional[int]:
+    return permission_version_cache.get("version")
+
+
+def set_cached_permission_version(version: int) -> None:
+    permission_version_cache["version"] = version
+
+
+def invalidate_permission_version() -> None:
+    permission_version_cache.clear()
+
+
+def invalidate_user_permissions(user_id: UUID) -> None:
+    """Сбрасывает все записи пользователя (смена ролей, деактивация)"""
+    for key in [key for key in list(permission_cache.keys()) if key[0] == user_id]:
+        permission_cache.pop(key, None)
+    PERMISSION_CACHE_INVALIDATIONS.labels(scope="user").inc()
+
+
+def invalidate_all_permissions() -> None:
+    """Сбрасывает кеш целиком (правило доступа затрагивает всех пользователей роли)"""
+    permission_cache.clear()
+    PERMISSION_CACHE_INVALIDATIONS.labels(scope="all").inc()
@@ -1,26 +1,118 @@
 from datetime import datetime, timedelta, timezone
 import bcrypt
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
 import asyncio
+import multiprocessing
+import os
+import time
 import jwt
 import structlog
+from prometheus_client import Counter, Gauge, Histogram
 from app.core.config import settings
-from app.exceptions.base import VerifyHashError
+from app.exceptions.base import PasswordHasherBusyError, VerifyHashError
 
 
 logger = structlog.get_logger()
 
 
-# Ограничьте число потоков, чтобы не создавать 1000 потоков при 1000 логинах
-executor = ThreadPoolExecutor(max_workers=10)  # например, 2–4× ядра CPU
+PASSWORD_HASHER_QUEUE_DEPTH = Gauge(
+    "password_hasher_queue_depth", "Задачи bcrypt в очереди и в работе"
+)
+PASSWORD_HASHER_WAIT_SECONDS = Histogram(
+    "password_hasher_wait_seconds",
+    "Ожидание свободного процесса bcrypt",
+    ["operation"],
+)
+PASSWORD_HASHER_DURATION_SECONDS = Histogram(
+    "password_hasher_duration_seconds",
+    "Время выполнения bcrypt в процессе пула",
+    ["operation"],
+)
+PASSWORD_HASHER_REJECTED = Counter(
+    "password_hasher_rejected_total", "Отказы при переполненной очереди bcrypt"
+)
+
+
+def _timed(func, *args):
+    """Выполняется в процессе пула. time.monotonic общий для процессов одной машины"""
+    started_at = time.monotonic()
+    result = func(*args)
+    return started_at, time.monotonic() - started_at, result
+
+
+def _hashpw(password_bytes: bytes) -> bytes:
+    return bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+
+
+class PasswordHasher:
+    """
+    bcrypt в отдельных процессах: не блокирует event loop и не держит GIL воркера.
+    Очередь ограничена: при переполнении сразу отдаём 503, а не копим задачи
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._executor = None
+        self._semaphore = asyncio.Semaphore(self.max_workers + self.max_queue)
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # пул создаётся лениво, уже внутри воркера uvicorn
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    @property
+    def busy(self) -> bool:
+        """Все места в пуле и очереди заняты"""
+        return self._semaphore.locked()
+
+    async def run(self, operation: str, func, *args):
+        if self.busy:
+            PASSWORD_HASHER_REJECTED.inc()
+            logger.error("PasswordHasherBusyError", error="bcrypt queue is full")
+            raise PasswordHasherBusyError
+        async with self._semaphore:
+            PASSWORD_HASHER_QUEUE_DEPTH.inc()
+            try:
+                submitted_at = time.monotonic()
+                (
+                    started_at,
+                    duration,
+                    result,
+                ) = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, _timed, func, *args
+                )
+            finally:
+                PASSWORD_HASHER_QUEUE_DEPTH.dec()
+        PASSWORD_HASHER_WAIT_SECONDS.labels(operation=operation).observe(
+            max(0.0, started_at - submitted_at)
+        )
+        PASSWORD_HASHER_DURATION_SECONDS.labels(operation=operation).observe(duration)
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASHER_WORKERS,
+    max_queue=settings.PASSWORD_HASHER_MAX_QUEUE,
+)
 
 
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
         password_bytes = plain_password.encode("utf-8")
         hash_bytes = hashed_password.encode("utf-8")
-        return await asyncio.get_event_loop().run_in_executor(
-            executor, bcrypt.checkpw, password_bytes, hash_bytes
+        return await password_hasher.run(
+            "verify", bcrypt.checkpw, password_bytes, hash_bytes
         )
     except ValueError as exc:
         logger.error("ValueError", error=str(exc))
@@ -30,11 +122,10 @@ async def verify_password(plain_password: str, hashed_password: str) -> bool:
         raise VerifyHashError from exc
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     try:
         password_bytes = password.encode("utf-8")
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password_bytes, salt)
+        hashed = await password_hasher.run("hash", _hashpw, password_bytes)
         return hashed.decode("utf-8")
     except ValueError as exc:
         logger.error("ValueError", error=str(exc))
@@ -33,6 +33,8 @@ def ordered_json_processor(logger, method_name, event_dict):
         "method",
         "path",
         "duration_s",
+        "db_queries",
+        "db_time_s",
         "status",
         "timestamp",
         "level",
@@ -47,6 +49,7 @@ def ordered_json_processor(logger, method_name, event_dict):
         "pagination",
         "isolation_level",
         "commit",
+        "read_only",
         "filename",
         "func_name",
         "lineno",
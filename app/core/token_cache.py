@@ -0,0 +1,57 @@
+"""
+Кеш проверенных access-токенов в рамках одного воркера.
+Ключ - дайджест токена, значение - AccessToken после проверки подписи и exp.
+Запись живёт до exp токена, поэтому просроченный токен из кеша не вернётся.
+Проверка по чёрному списку выполняется до обращения к кешу
+"""
+
+import time
+from typing import Optional
+from cachetools import TLRUCache
+from prometheus_client import Counter, Gauge
+from app.core.blacklist import token_digest
+from app.core.config import settings
+from app.schemas.token import AccessToken
+
+
+token_cache = TLRUCache(
+    maxsize=settings.ACCESS_TOKEN_CACHE_MAXSIZE,
+    ttu=lambda _key, payload, _now: payload.exp,
+    timer=time.time,
+)
+
+TOKEN_CACHE_HITS = Counter("token_cache_hits_total", "Попадания в кеш токенов")
+TOKEN_CACHE_MISSES = Counter("token_cache_misses_total", "Промахи кеша токенов")
+TOKEN_CACHE_SIZE = Gauge("token_cache_size", "Размер кеша токенов")
+TOKEN_CACHE_SIZE.set_function(lambda: len(token_cache))
+TOKEN_CACHE_HIT_RATIO = Gauge("token_cache_hit_ratio", "Доля попаданий в кеш токенов")
+
+# счётчики для hit ratio: значения prometheus Counter наружу не отдаются
+_lookups = {"hits": 0, "misses": 0}
+
+
+def _hit_ratio() -> float:
+    total = _lookups["hits"] + _lookups["misses"]
+    return _lookups["hits"] / total if total else 0.0
+
+
+TOKEN_CACHE_HIT_RATIO.set_function(_hit_ratio)
+
+
+def get_cached_token(token: str) -> Optional[AccessToken]:
+    payload = token_cache.get(token_digest(token))
+    if payload is None:
+        TOKEN_CACHE_MISSES.inc()
+        _lookups["misses"] += 1
+        return None
+    TOKEN_CACHE_HITS.inc()
+    _lookups["hits"] += 1
+    return payload.model_copy(deep=True)
+
+
+def set_cached_token(token: str, payload: AccessToken) -> None:
+    token_cache[token_digest(token)] = payload
+
+
+def invalidate_token(token: str) -> None:
+    token_cache.pop(token_digest(token), None)
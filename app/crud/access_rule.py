@@ -1,5 +1,7 @@
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud.base import BaseDAO
-from app.models.access_rule import AccessRule
+from app.models.access_rule import AccessRule, permission_version_seq
 from app.schemas.access_rule import SchemaAccessRuleBase, SchemaAccessRuleFilter
 
 
@@ -10,3 +12,24 @@ class AccessRuleDAO(BaseDAO[AccessRule, None, SchemaAccessRuleFilter]):
     pydantic_model = SchemaAccessRuleBase
 
     _exclude_from_filter_by = {"created_at", "updated_at"}
+
+    @classmethod
+    async def get_permission_version(cls, session: AsyncSession) -> int:
+        """
+        Текущая версия прав (без изменения последовательности).
+        У свежей последовательности last_value = 1 и до, и после первого
+        nextval - меняется только is_called, поэтому до него версия 0
+        """
+        result = await session.execute(
+            text(
+                "SELECT CASE WHEN is_called THEN last_value ELSE 0 END "
+                f"FROM {permission_version_seq.name}"
+            )
+        )
+        return result.scalar_one()
+
+    @classmethod
+    async def bump_permission_version(cls, session: AsyncSession) -> int:
+        """nextval не транзакционный: новая версия видна сразу всем воркерам"""
+        result = await session.execute(select(permission_version_seq.next_value()))
+        return result.scalar_one()
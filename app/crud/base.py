@@ -1,14 +1,56 @@
-from typing import ClassVar, Dict, Generic, List, Optional, TypeVar
+import asyncio
+import base64
+import json
+import operator
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterator,
+    ClassVar,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from uuid import UUID
+import asyncpg
 import structlog
-from pydantic import BaseModel as PydanticModel
-from sqlalchemy import and_, select, update, delete
-from sqlalchemy.exc import MultipleResultsFound
+from pydantic import BaseModel as PydanticModel, TypeAdapter, ValidationError
+from sqlalchemy import (
+    Integer,
+    PrimaryKeyConstraint,
+    UniqueConstraint,
+    and_,
+    any_,
+    bindparam,
+    delete,
+    exists,
+    func,
+    insert,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.exc import IntegrityError, MultipleResultsFound
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase
+from app.core.config import settings
+from app.db.session import pool_has_spare_connection
 from app.models.base import Base
-from app.schemas.base import PaginationParams
-from app.exceptions.base import MultipleResultsError, ObjectsNotFoundByIDError
+from app.schemas.base import BulkCreateOutcome, BulkOutcome, PaginationParams
+from app.exceptions.base import (
+    BulkSelectionTooLargeError,
+    IntegrityErrorException,
+    InvalidCursorError,
+    InvalidFieldsError,
+    MultipleResultsError,
+    ObjectsNotFoundByIDError,
+    PermissionDenied,
+)
 
 
 logger = structlog.get_logger()
@@ -24,36 +66,296 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=PydanticModel)
 FilterSchemaType = TypeVar("FilterSchemaType", bound=PydanticModel)
 
 
+# операторы фильтров: поле схемы <колонка>__<оператор> -> предикат.
+# Значение приходит bindparam-ом, у isnull значение уходит в форму запроса
+FILTER_OPERATORS: Dict[str, Any] = {
+    "eq": operator.eq,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "in": lambda column, param: column == any_(param),
+    "startswith": lambda column, param: column.like(param, escape="\\"),
+    "isnull": lambda column, param: column.is_(None),
+    "notnull": lambda column, param: column.is_not(None),
+}
+
+
+def _indexed_columns(table) -> set[str]:
+    """Колонки, с которых начинается индекс: только по ним диапазон идёт index scan"""
+    indexes = [
+        constraint
+        for constraint in table.constraints
+        if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint))
+    ]
+    indexes.extend(table.indexes)
+    return {next(iter(index.columns)).name for index in indexes if len(index.columns)}
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 # pylint: disable-next=too-few-public-methods
 class FiltrMixin:
     model: type[DeclarativeBase]
     _exclude_from_filter_by: set[str] = set()
+    # ключ keyset-пагинации и сортировки страниц по умолчанию,
+    # под него заведён составной индекс (created_at, id)
+    cursor_fields: ClassVar[Tuple[str, ...]] = ("created_at", "id")
+    # операторы сверх равенства: колонка -> разрешённые (gt, gte, lt, lte,
+    # in, startswith, isnull). Только для колонок под индексом, проверяется
+    # при объявлении DAO: фильтр не должен превращаться в seq scan
+    filter_operators: ClassVar[Dict[str, Tuple[str, ...]]] = {}
+    # поле фильтра -> колонка модели и оператор, считаются при объявлении DAO
+    _filter_columns: ClassVar[Dict[str, Any]] = {}
+    _filter_ops: ClassVar[Dict[str, str]] = {}
+    # профили загрузки связей: имя -> опции loader. Связи моделей объявлены
+    # lazy="raise", без профиля не грузится ничего, случайный доступ падает
+    loader_profiles: ClassVar[Dict[str, Tuple[Any, ...]]] = {}
+    # поля, доступные для fields=: есть и в схеме ответа, и в таблице
+    _projectable_fields: ClassVar[frozenset] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        model = getattr(cls, "model", None)
+        filter_schema = getattr(cls, "filter_schema", None)
+        if model is None or filter_schema is None:
+            return
+        unindexed = set(cls.filter_operators) - _indexed_columns(model.__table__)
+        if unindexed:
+            raise ValueError(
+                f"{cls.__name__}: filter_operators для колонок без индекса: "
+                f"{', '.join(sorted(unindexed))}"
+            )
+        cls._filter_columns = {}
+        cls._filter_ops = {}
+        for field_name in filter_schema.model_fields:
+            column_name, _, op = field_name.rpartition("__")
+            # notnull - внутренняя форма isnull=false, в схемах не объявляется
+            if not column_name or op not in FILTER_OPERATORS or op == "notnull":
+                column_name, op = field_name, "eq"
+            # игнорирование полей фильтрации, которых нет в модели
+            if column_name in cls._exclude_from_filter_by or not hasattr(
+                model, column_name
+            ):
+                continue
+            if op != "eq" and op not in cls.filter_operators.get(column_name, ()):
+                raise ValueError(
+                    f"{cls.__name__}: оператор {op} для {column_name} "
+                    "не разрешён в filter_operators"
+                )
+            cls._filter_columns[field_name] = getattr(model, column_name)
+            cls._filter_ops[field_name] = op
+        pydantic_model = getattr(cls, "pydantic_model", None)
+        if pydantic_model is not None:
+            cls._projectable_fields = frozenset(pydantic_model.model_fields) & set(
+                model.__table__.columns.keys()
+            )
 
     @classmethod
-    def _apply_filters(cls, query, filters: FilterSchemaType):
-        """игнорирование полей фильтрации, которых нет в модели"""
-        allowed_fields = cls.filter_schema.model_fields.keys()
-        exclude_fields = getattr(cls, "_exclude_from_filter_by", set())
+    def _filter_values(cls, filters: Optional[FilterSchemaType]) -> Dict[str, Any]:
+        if filters is None:
+            return {}
+        values = {}
+        for field_name in cls._filter_columns:
+            value = getattr(filters, field_name, None)
+            if value is not None:
+                values[field_name] = value
+        return values
 
-        filter_dict = {
-            key: value
-            for key, value in filters.model_dump().items()
-            if key in allowed_fields and key not in exclude_fields and value is not None
-        }
+    @classmethod
+    def _filter_shape(cls, values: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+        """
+        Форма условий (поле, оператор) - ключ кеша шаблонов. Значение isnull
+        меняет сам SQL (IS NULL / IS NOT NULL), поэтому входит в форму
+        """
+        shape = []
+        for field_name, value in values.items():
+            op = cls._filter_ops[field_name]
+            if op == "isnull" and not value:
+                op = "notnull"
+            shape.append((field_name, op))
+        return tuple(shape)
+
+    @classmethod
+    def _filter_params(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        params = {}
+        for field_name, value in values.items():
+            op = cls._filter_ops[field_name]
+            if op == "isnull":
+                continue
+            if op == "startswith":
+                value = _escape_like(value) + "%"
+            params[f"filter_{field_name}"] = value
+        return params
+
+    @classmethod
+    def _filter_conditions(
+        cls,
+        shape: Tuple[Tuple[str, str], ...],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Any]:
+        """params - значения сразу в bindparam (разовые запросы, не шаблоны)"""
+        conditions = []
+        for field_name, op in shape:
+            column = cls._filter_columns[field_name]
+            param = bindparam(
+                f"filter_{field_name}",
+                (params or {}).get(f"filter_{field_name}"),
+                type_=ARRAY(column.type) if op == "in" else None,
+            )
+            conditions.append(FILTER_OPERATORS[op](column, param))
+        return conditions
+
+    @classmethod
+    def _projection(cls, fields: Tuple[str, ...]) -> Tuple[str, ...]:
+        unknown = [name for name in fields if name not in cls._projectable_fields]
+        if unknown:
+            logger.error("InvalidFieldsError", data=unknown)
+            raise InvalidFieldsError(
+                custom_detail=f"Недопустимые поля в fields: {', '.join(unknown)}"
+            )
+        return fields
+
+    @classmethod
+    def _base_select(cls, load: Optional[str], columns: Optional[Tuple[str, ...]]):
+        """Только колонки (строки без ORM-объектов) или сущность с профилем"""
+        if columns:
+            table = cls.model.__table__
+            return select(*(table.c[name] for name in columns))
+        return select(cls.model).options(*cls._loader_options(load))
+
+    @classmethod
+    def _loader_options(cls, load: Optional[str]) -> Tuple[Any, ...]:
+        if load is None:
+            return ()
+        try:
+            return cls.loader_profiles[load]
+        except KeyError as exc:
+            raise ValueError(f"{cls.__name__}: нет профиля загрузки {load!r}") from exc
 
-        filters_result = []
-        for key, value in filter_dict.items():
-            if hasattr(cls.model, key):
-                filters_result.append(getattr(cls.model, key) == value)
-        if filters_result:
-            query = query.filter(and_(*filters_result))
+    @classmethod
+    @lru_cache(maxsize=512)
+    def _select_template(
+        cls,
+        filter_shape: Tuple[Tuple[str, str], ...],
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        paginated: bool = False,
+        load: Optional[str] = None,
+        columns: Optional[Tuple[str, ...]] = None,
+    ):
+        """
+        SELECT с bindparam вместо значений. Форма запроса (набор фильтров,
+        сортировка, пагинация) строится один раз; одинаковый SQL попадает
+        и в кеш компиляции SQLAlchemy, и в кеш prepared statements asyncpg
+        """
+        query = cls._base_select(load, columns)
+        conditions = cls._filter_conditions(filter_shape)
+        if conditions:
+            query = query.where(and_(*conditions))
+        if order_by:
+            column = getattr(cls.model, order_by)
+            query = query.order_by(column.desc() if descending else column)
+        elif paginated:
+            # без явной сортировки страницы OFFSET нестабильны
+            query = query.order_by(*cls._cursor_columns())
+        if paginated:
+            query = query.limit(bindparam("limit", type_=Integer)).offset(
+                bindparam("offset", type_=Integer)
+            )
         return query
 
     @classmethod
-    def _apply_pagination(cls, query, pagination: PaginationParams):
-        return query.limit(pagination.per_page).offset(
-            pagination.per_page * (pagination.page - 1)
+    def _select_with_params(
+        cls,
+        filters: Optional[FilterSchemaType] = None,
+        pagination: Optional[PaginationParams] = None,
+        order_by: Optional[str] = None,
+        order: str = "asc",
+        load: Optional[str] = None,
+        columns: Optional[Tuple[str, ...]] = None,
+    ):
+        values = cls._filter_values(filters)
+        query = cls._select_template(
+            cls._filter_shape(values),
+            order_by,
+            order.lower() == "desc",
+            pagination is not None,
+            load,
+            columns,
+        )
+        params = cls._filter_params(values)
+        if pagination is not None:
+            params["limit"] = pagination.per_page
+            params["offset"] = pagination.per_page * (pagination.page - 1)
+        return query, params
+
+    @classmethod
+    def _cursor_columns(cls) -> List[Any]:
+        return [getattr(cls.model, field_name) for field_name in cls.cursor_fields]
+
+    @classmethod
+    @lru_cache(maxsize=512)
+    def _keyset_template(
+        cls,
+        filter_shape: Tuple[Tuple[str, str], ...],
+        has_cursor: bool,
+        backward: bool,
+        load: Optional[str] = None,
+        columns: Optional[Tuple[str, ...]] = None,
+    ):
+        """
+        SELECT страницы после (или до) курсора: сравнение кортежей
+        (created_at, id) идёт по составному индексу без сканирования OFFSET
+        """
+        query = cls._base_select(load, columns)
+        conditions = cls._filter_conditions(filter_shape)
+        columns = cls._cursor_columns()
+        if has_cursor:
+            key = tuple_(*columns)
+            bound = tuple_(
+                *(
+                    bindparam(f"cursor_{field_name}", type_=column.type)
+                    for field_name, column in zip(cls.cursor_fields, columns)
+                )
+            )
+            conditions.append(key < bound if backward else key > bound)
+        if conditions:
+            query = query.where(and_(*conditions))
+        query = query.order_by(
+            *(column.desc() if backward else column for column in columns)
         )
+        return query.limit(bindparam("limit", type_=Integer))
+
+    @classmethod
+    def _encode_cursor(cls, direction: str, obj: Any) -> str:
+        key = [str(getattr(obj, field_name)) for field_name in cls.cursor_fields]
+        raw = json.dumps([direction, key], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def _decode_cursor(cls, cursor: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Пустой курсор - первая страница вперёд"""
+        if not cursor:
+            return "next", None
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            direction, key = json.loads(raw)
+            if direction not in ("next", "prev") or len(key) != len(cls.cursor_fields):
+                raise ValueError(direction)
+            return direction, {
+                f"cursor_{field_name}": TypeAdapter(
+                    column.type.python_type
+                ).validate_python(value)
+                for field_name, column, value in zip(
+                    cls.cursor_fields, cls._cursor_columns(), key
+                )
+            }
+        except (ValueError, TypeError, ValidationError) as exc:
+            logger.error("InvalidCursorError", data=cursor, error=exc)
+            raise InvalidCursorError from exc
 
 
 class BaseDAO(FiltrMixin, Generic[ModelType, CreateSchemaType, FilterSchemaType]):
@@ -61,6 +363,8 @@ class BaseDAO(FiltrMixin, Generic[ModelType, CreateSchemaType, FilterSchemaType]
     create_schema: ClassVar[type[CreateSchemaType]]
     filter_schema: ClassVar[type[FilterSchemaType]]
     pydantic_model: ClassVar[type[PydanticModel]]
+    # уникальный ключ для upsert_many (ON CONFLICT), пусто - upsert недоступен
+    upsert_conflict_fields: ClassVar[Tuple[str, ...]] = ()
 
     @classmethod
     async def find_many(
@@ -70,21 +374,58 @@ class BaseDAO(FiltrMixin, Generic[ModelType, CreateSchemaType, FilterSchemaType]
         pagination: Optional[PaginationParams] = None,
         order_by: Optional[str] = None,
         order: str = "asc",
-    ) -> List[PydanticModel]:
-        query = select(cls.model)
-        if filters is not None:
-            query = cls._apply_filters(query, filters)
-
-        if order_by:
-            column = getattr(cls.model, order_by)
-            if order.lower() == "desc":
-                column = column.desc()
-            query = query.order_by(column)
-
-        if pagination:
-            query = cls._apply_pagination(query, pagination)
+        load: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> List[PydanticModel] | List[Dict[str, Any]]:
+        """
+        fields - выборка только этих колонок: строки возвращаются словарями,
+        без ORM-сущностей и валидации pydantic_model
+        """
+        if fields:
+            fields = cls._projection(fields)
+        page = cls._find_page(
+            session=session,
+            filters=filters,
+            pagination=pagination,
+            order_by=order_by,
+            order=order,
+            load=load,
+            fields=fields,
+        )
+        if pagination is None or not pagination.total:
+            return await page
+        return await cls._page_with_total(session, filters, pagination, page)
 
-        result = await session.execute(query)
+    @classmethod
+    async def _find_page(
+        cls,
+        session: AsyncSession,
+        filters: Optional[FilterSchemaType],
+        pagination: Optional[PaginationParams],
+        order_by: Optional[str],
+        order: str,
+        load: Optional[str],
+        fields: Optional[Tuple[str, ...]],
+    ) -> List[PydanticModel] | List[Dict[str, Any]]:
+        if pagination is not None and pagination.cursor is not None:
+            return await cls._find_keyset_page(
+                session=session,
+                filters=filters,
+                pagination=pagination,
+                load=load,
+                fields=fields,
+            )
+        query, params = cls._select_with_params(
+            filters=filters,
+            pagination=pagination,
+            order_by=order_by,
+            order=order,
+            load=load,
+            columns=fields,
+        )
+        result = await session.execute(query, params)
+        if fields:
+            return [dict(row) for row in result.mappings().all()]
         results = result.unique().scalars().all()
         return [
             cls.pydantic_model.model_validate(obj, from_attributes=True)
@@ -92,14 +433,183 @@ class BaseDAO(FiltrMixin, Generic[ModelType, CreateSchemaType, FilterSchemaType]
         ]
 
     @classmethod
-    async def find_one(
+    async def _page_with_total(
+        cls,
+        session: AsyncSession,
+        filters: Optional[FilterSchemaType],
+        pagination: PaginationParams,
+        page,
+    ) -> List[PydanticModel] | List[Dict[str, Any]]:
+        """
+        Страница и total. Если в пуле есть свободное соединение, count идёт
+        параллельно во второй сессии на том же движке (те же опции
+        read only / реплика), иначе - следом в той же сессии
+        """
+        # своё соединение сессия берёт до проверки пула, иначе при последнем
+        # свободном обе сессии встанут в очередь за ним
+        await session.connection()
+        if session.bind is not None and pool_has_spare_connection(session.bind):
+            async with AsyncSession(bind=session.bind) as count_session:
+                rows, (total, exact) = await asyncio.gather(
+                    page, cls.count(session=count_session, filters=filters)
+                )
+        else:
+            rows = await page
+            total, exact = await cls.count(session=session, filters=filters)
+        pagination._total = total
+        pagination._total_exact = exact
+        return rows
+
+    @classmethod
+    async def count(
         cls, session: AsyncSession, filters: Optional[FilterSchemaType] = None
-    ) -> Optional[PydanticModel]:
-        query = select(cls.model)
-        if filters is not None:
-            query = cls._apply_filters(query, filters)
+    ) -> Tuple[int, bool]:
+        """
+        Число строк под фильтрами и признак точности. Без фильтров на
+        большой таблице - оценка планировщика из pg_class.reltuples
+        вместо полного прохода count(*)
+        """
+        values = cls._filter_values(filters)
+        if not values and session.get_bind().dialect.name == "postgresql":
+            estimate = await session.scalar(
+                cls._estimate_statement(), {"table_name": cls.model.__tablename__}
+            )
+            # -1 / 0 - таблица ещё не анализировалась, оценке верить нельзя
+            if estimate is not None and estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+                return int(estimate), False
+        params = cls._filter_params(values)
+        total = await session.scalar(
+            cls._count_template(cls._filter_shape(values)), params
+        )
+        return total, True
 
-        result = await session.execute(query)
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _count_template(cls, filter_shape: Tuple[Tuple[str, str], ...]):
+        conditions = cls._filter_conditions(filter_shape)
+        query = select(func.count()).select_from(cls.model.__table__)
+        if conditions:
+            query = query.where(and_(*conditions))
+        return query
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _estimate_statement():
+        # quote_ident: order и user - зарезервированные слова
+        return text(
+            "SELECT reltuples::bigint FROM pg_class "
+            "WHERE oid = to_regclass(quote_ident(:table_name))"
+        )
+
+    @classmethod
+    async def _find_keyset_page(
+        cls,
+        session: AsyncSession,
+        filters: Optional[FilterSchemaType],
+        pagination: PaginationParams,
+        load: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> List[PydanticModel] | List[Dict[str, Any]]:
+        """
+        Страница по курсору. Сортировка всегда по cursor_fields, order_by
+        не применяется. Курсоры соседних страниц кладутся в pagination
+        """
+        direction, key = cls._decode_cursor(pagination.cursor)
+        backward = direction == "prev"
+        values = cls._filter_values(filters)
+        # для курсора нужны его колонки, даже если их не просили в fields
+        columns = (
+            fields + tuple(name for name in cls.cursor_fields if name not in fields)
+            if fields
+            else None
+        )
+        query = cls._keyset_template(
+            cls._filter_shape(values), key is not None, backward, load, columns
+        )
+        params = cls._filter_params(values)
+        params.update(key or {})
+        # лишняя строка показывает, есть ли страница дальше
+        params["limit"] = pagination.per_page + 1
+
+        result = await session.execute(query, params)
+        rows = list(result.all() if fields else result.unique().scalars().all())
+        has_more = len(rows) > pagination.per_page
+        rows = rows[: pagination.per_page]
+        if backward:
+            rows.reverse()
+
+        if rows:
+            if has_more or backward:
+                pagination._next_cursor = cls._encode_cursor("next", rows[-1])
+            if has_more if backward else key is not None:
+                pagination._prev_cursor = cls._encode_cursor("prev", rows[0])
+        if fields:
+            return [{name: row._mapping[name] for name in fields} for row in rows]
+        return [
+            cls.pydantic_model.model_validate(obj, from_attributes=True) for obj in rows
+        ]
+
+    @classmethod
+    async def stream_many(
+        cls,
+        session: AsyncSession,
+        filters: Optional[FilterSchemaType] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Выгрузка всей выборки серверным курсором (session.stream): строки
+        приходят пачками по batch_size, в памяти одна пачка. Колонки - fields
+        или все поля pydantic_model, ORM-сущности не создаются
+        """
+        columns = (
+            cls._projection(fields)
+            if fields
+            else tuple(
+                name
+                for name in cls.pydantic_model.model_fields
+                if name in cls._projectable_fields
+            )
+        )
+        values = cls._filter_values(filters)
+        result = await session.stream(
+            cls._stream_template(cls._filter_shape(values), columns),
+            cls._filter_params(values),
+            execution_options={
+                "yield_per": batch_size or settings.EXPORT_BATCH_SIZE,
+            },
+        )
+        try:
+            async for partition in result.mappings().partitions():
+                yield [dict(row) for row in partition]
+        finally:
+            # при отмене (клиент отключился) курсор закрывается сразу
+            await result.close()
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _stream_template(
+        cls, filter_shape: Tuple[Tuple[str, str], ...], columns: Tuple[str, ...]
+    ):
+        """
+        Порядок по ключу курсора идёт по индексу (created_at, id): первые
+        строки уходят клиенту сразу, без сортировки всей таблицы
+        """
+        query = cls._base_select(None, columns)
+        conditions = cls._filter_conditions(filter_shape)
+        if conditions:
+            query = query.where(and_(*conditions))
+        return query.order_by(*cls._cursor_columns())
+
+    @classmethod
+    async def find_one(
+        cls,
+        session: AsyncSession,
+        filters: Optional[FilterSchemaType] = None,
+        load: Optional[str] = None,
+    ) -> Optional[PydanticModel]:
+        query, params = cls._select_with_params(filters=filters, load=load)
+        result = await session.execute(query, params)
         try:
             obj = result.unique().scalars().one_or_none()
         except MultipleResultsFound as exc:
@@ -111,46 +621,292 @@ class BaseDAO(FiltrMixin, Generic[ModelType, CreateSchemaType, FilterSchemaType]
 
     @classmethod
     async def find_one_by_id(
-        cls, session: AsyncSession, model_id: UUID
+        cls,
+        session: AsyncSession,
+        model_id: UUID,
+        owner_field: Optional[str] = None,
+        owner_id: Optional[UUID] = None,
     ) -> Optional[PydanticModel]:
-        obj = await session.get(cls.model, model_id)
+        """
+        SELECT колонок по id (и владельцу, если задан owner_field) -
+        без ORM-объекта и загрузки его relationship
+        """
+        table = cls.model.__table__
+        query = select(*table.columns).where(
+            *cls._by_id_conditions(model_id, owner_field, owner_id)
+        )
+        row = (await session.execute(query)).mappings().one_or_none()
 
-        if obj is None:
+        if row is None:
+            await cls._raise_missing(session, model_id, owner_field, "find_one_by_id")
+
+        return cls.pydantic_model.model_validate(dict(row))
+
+    @classmethod
+    async def exists_by_id(cls, session: AsyncSession, model_id: UUID) -> bool:
+        table = cls.model.__table__
+        result = await session.execute(select(exists().where(table.c.id == model_id)))
+        return bool(result.scalar())
+
+    @classmethod
+    def _by_id_conditions(
+        cls, model_id: UUID, owner_field: Optional[str], owner_id: Optional[UUID]
+    ) -> List[Any]:
+        table = cls.model.__table__
+        conditions = [table.c.id == model_id]
+        if owner_field is not None:
+            conditions.append(table.c[owner_field] == owner_id)
+        return conditions
+
+    @classmethod
+    async def _raise_missing(
+        cls,
+        session: AsyncSession,
+        model_id: UUID,
+        owner_field: Optional[str],
+        action: str,
+    ) -> None:
+        """
+        Запрос с условием владельца ничего не нашёл. Отдельная проверка
+        существования нужна только чтобы отличить 403 от 404
+        """
+        if owner_field is not None and await cls.exists_by_id(session, model_id):
             logger.error(
-                "ObjectsNotFoundByIDError on find_one_by_id",
+                f"PermissionDenied on {action}",
                 model_id=model_id,
-                error="Запрашиваемый объект не найден",
+                error="Объект принадлежит другому пользователю",
             )
-            raise ObjectsNotFoundByIDError
+            raise PermissionDenied
+        logger.error(
+            f"ObjectsNotFoundByIDError on {action}",
+            model_id=model_id,
+            error="Запрашиваемый объект не найден",
+        )
+        raise ObjectsNotFoundByIDError
 
-        return cls.pydantic_model.model_validate(obj, from_attributes=True)
+    @classmethod
+    async def add_one(cls, session: AsyncSession, values: Dict) -> PydanticModel:
+        """
+        добавляет 1 запись одним INSERT ... RETURNING: серверные default
+        (created_at) приходят сразу, ORM-объект и refresh не нужны
+        """
+        result = await session.execute(cls._insert_template(), values)
+        return cls.pydantic_model.model_validate(dict(result.mappings().one()))
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def _insert_template(cls):
+        # Python-default (id = uuid4) Core проставляет сам
+        table = cls.model.__table__
+        return insert(table).returning(*table.columns)
+
+    @classmethod
+    async def add_many(
+        cls, session: AsyncSession, values: List[Dict]
+    ) -> List[ModelType]:
+        """
+        Добавляет пачку записей многострочным INSERT ... RETURNING.
+        Большие однородные пачки на asyncpg идут через COPY
+        """
+        if not values:
+            return []
+        if cls._can_copy(session, values):
+            return await cls._copy_many(session, values)
+        result = await session.scalars(
+            insert(cls.model).returning(cls.model, sort_by_parameter_order=True),
+            values,
+        )
+        return list(result.all())
+
+    @classmethod
+    async def upsert_many(
+        cls,
+        session: AsyncSession,
+        values: List[Dict],
+        conflict_fields: Optional[Tuple[str, ...]] = None,
+    ) -> List[ModelType]:
+        """
+        INSERT ... ON CONFLICT DO UPDATE пачкой: существующие по ключу
+        записи обновляются, новые добавляются
+        """
+        conflict_fields = tuple(conflict_fields or cls.upsert_conflict_fields)
+        if not conflict_fields:
+            raise ValueError(f"{cls.__name__}: не задан ключ upsert")
+        if not values:
+            return []
+        # ON CONFLICT не может обновить одну строку дважды за выражение -
+        # из повторов по ключу остаётся последний
+        unique = {
+            tuple(item[field_name] for field_name in conflict_fields): item
+            for item in values
+        }
+        values = list(unique.values())
+        query = cls._upsert_template(conflict_fields, tuple(sorted(values[0])))
+        result = await session.scalars(query, values)
+        return list(result.all())
 
     @classmethod
-    async def add_one(cls, session: AsyncSession, values: Dict) -> ModelType:
-        """добавляет 1 запись"""
-        new_instance = cls.model(**values)
-        session.add(new_instance)
+    @lru_cache(maxsize=64)
+    def _upsert_template(
+        cls, conflict_fields: Tuple[str, ...], value_fields: Tuple[str, ...]
+    ):
+        query = pg_insert(cls.model)
+        set_ = {
+            field_name: query.excluded[field_name]
+            for field_name in value_fields
+            if field_name not in conflict_fields and field_name != "id"
+        }
+        # onupdate при ON CONFLICT не срабатывает
+        set_["updated_at"] = func.now()
+        return query.on_conflict_do_update(
+            index_elements=list(conflict_fields), set_=set_
+        ).returning(cls.model, sort_by_parameter_order=True)
+
+    @classmethod
+    def _can_copy(cls, session: AsyncSession, values: List[Dict]) -> bool:
+        if len(values) < settings.BULK_COPY_THRESHOLD:
+            return False
+        if session.get_bind().dialect.driver != "asyncpg":
+            return False
+        fields = values[0].keys()
+        return all(item.keys() == fields for item in values)
+
+    @classmethod
+    async def _copy_many(
+        cls, session: AsyncSession, values: List[Dict]
+    ) -> List[ModelType]:
+        """
+        COPY в таблицу через asyncpg. COPY не возвращает строк и не знает
+        о Python-умолчаниях модели: id и прочие default считаются здесь,
+        серверные default (created_at) проставляет Postgres
+        """
+        table = cls.model.__table__
+        python_defaults = {
+            column.name: column.default
+            for column in table.columns
+            if column.default is not None and column.name not in values[0]
+        }
+        columns = list(values[0]) + list(python_defaults)
+        records = []
+        ids = []
+        for item in values:
+            row = dict(item)
+            for name, default in python_defaults.items():
+                row[name] = default.arg(None) if default.is_callable else default.arg
+            ids.append(row["id"])
+            records.append(tuple(row[name] for name in columns))
+
         await session.flush()
-        await session.refresh(new_instance)
-        return new_instance
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        try:
+            await raw_connection.driver_connection.copy_records_to_table(
+                table.name, records=records, columns=columns
+            )
+        except asyncpg.IntegrityConstraintViolationError as exc:
+            logger.error("IntegrityError on copy", error=str(exc))
+            raise IntegrityErrorException from exc
+
+        result = await session.scalars(select(cls.model).where(cls.model.id.in_(ids)))
+        by_id = {obj.id: obj for obj in result.all()}
+        return [by_id[model_id] for model_id in ids]
 
     @classmethod
-    async def delete_one_by_id(
-        cls, session: AsyncSession, model_id: UUID
-    ) -> Optional[ModelType]:
-        """Удаляет запись по id. Возвращает удалённый объект"""
-        obj = await session.get(cls.model, model_id)
+    async def add_many_with_outcomes(
+        cls, session: AsyncSession, values: List[Dict], upsert: bool = False
+    ) -> List[BulkCreateOutcome]:
+        """
+        add_many/upsert_many с итогом по каждому элементу. Пачка идёт одним
+        выражением в SAVEPOINT; если оно упало на ограничении, элементы
+        повторяются по одному, каждый в своём SAVEPOINT, и ошибка одного
+        не откатывает остальные
+        """
+        try:
+            async with session.begin_nested():
+                return await cls._add_many_outcomes(session, values, upsert)
+        except (IntegrityError, IntegrityErrorException) as exc:
+            logger.warning(
+                "IntegrityError on bulk, retrying per item",
+                data=len(values),
+                error=str(exc),
+            )
 
-        if obj is None:
-            logger.error(
-                "ObjectsNotFoundByIDError on delete",
-                model_id=model_id,
-                error="Запрашиваемый объект не найден",
+        outcomes = []
+        for index, item in enumerate(values):
+            try:
+                async with session.begin_nested():
+                    (outcome,) = await cls._add_many_outcomes(session, [item], upsert)
+            except (IntegrityError, IntegrityErrorException) as exc:
+                logger.error("IntegrityError on bulk item", index=index, error=str(exc))
+                outcome = BulkCreateOutcome(
+                    index=0, status="failed", error=cls._integrity_detail(exc)
+                )
+            outcomes.append(outcome.model_copy(update={"index": index}))
+        return outcomes
+
+    @classmethod
+    async def _add_many_outcomes(
+        cls, session: AsyncSession, values: List[Dict], upsert: bool
+    ) -> List[BulkCreateOutcome]:
+        if not upsert:
+            saved = await cls.add_many(session=session, values=values)
+            return [
+                BulkCreateOutcome(
+                    index=index,
+                    status="created",
+                    data=cls.pydantic_model.model_validate(obj, from_attributes=True),
+                )
+                for index, obj in enumerate(saved)
+            ]
+        # upsert_many схлопывает повторы по ключу - сопоставляем по ключу
+        saved = await cls.upsert_many(session=session, values=values)
+        conflict_fields = cls.upsert_conflict_fields
+        by_key = {
+            tuple(getattr(obj, name) for name in conflict_fields): obj for obj in saved
+        }
+        return [
+            BulkCreateOutcome(
+                index=index,
+                status="upserted",
+                data=cls.pydantic_model.model_validate(
+                    by_key[tuple(item[name] for name in conflict_fields)],
+                    from_attributes=True,
+                ),
             )
-            raise ObjectsNotFoundByIDError
+            for index, item in enumerate(values)
+        ]
+
+    @staticmethod
+    def _integrity_detail(exc: Exception) -> str:
+        # имя нарушенного ограничения отдаёт только asyncpg
+        cause = exc.__cause__
+        if isinstance(exc, IntegrityError):
+            cause = getattr(exc.orig, "__cause__", None)
+        constraint_name = getattr(cause, "constraint_name", None)
+        if constraint_name:
+            return f"{IntegrityErrorException.detail}: {constraint_name}"
+        return IntegrityErrorException.detail
+
+    @classmethod
+    async def delete_one_by_id(
+        cls,
+        session: AsyncSession,
+        model_id: UUID,
+        owner_field: Optional[str] = None,
+        owner_id: Optional[UUID] = None,
+    ) -> bool:
+        """Удаляет запись по id одним DELETE ... RETURNING id"""
+        table = cls.model.__table__
+        stmt = (
+            delete(table)
+            .where(*cls._by_id_conditions(model_id, owner_field, owner_id))
+            .returning(table.c.id)
+        )
+        result = await session.execute(stmt)
+
+        if result.scalar_one_or_none() is None:
+            await cls._raise_missing(session, model_id, owner_field, "delete")
 
-        await session.delete(obj)
-        # await session.commit()
         return True
 
     @classmethod
@@ -162,14 +918,141 @@ class BaseDAO(FiltrMixin, Generic[ModelType, CreateSchemaType, FilterSchemaType]
 
         stmt = delete(cls.model).where(cls.model.id.in_(ids))
         result = await session.execute(stmt)
-        await session.commit()
+        # коммит - на стороне вызывающего (auth_db_context / run_in_transaction)
         return result.rowcount
 
     @classmethod
-    async def update_one(cls, model_id: UUID, values: Dict, session: AsyncSession):
+    async def update_many(
+        cls,
+        session: AsyncSession,
+        values: Dict,
+        ids: Optional[List[UUID]] = None,
+        filters: Optional[FilterSchemaType] = None,
+        owner_field: Optional[str] = None,
+        owner_id: Optional[UUID] = None,
+    ) -> List[BulkOutcome]:
+        """Обновляет выбранные записи одним UPDATE ... RETURNING id"""
+        if not values:
+            raise ValueError(f"{cls.__name__}: нет полей для bulk-обновления")
+        table = cls.model.__table__
+        return await cls._run_bulk(
+            session=session,
+            statement=update(table).values(**values),
+            done_status="updated",
+            ids=ids,
+            filters=filters,
+            owner_field=owner_field,
+            owner_id=owner_id,
+        )
+
+    @classmethod
+    async def delete_many(
+        cls,
+        session: AsyncSession,
+        ids: Optional[List[UUID]] = None,
+        filters: Optional[FilterSchemaType] = None,
+        owner_field: Optional[str] = None,
+        owner_id: Optional[UUID] = None,
+    ) -> List[BulkOutcome]:
+        """Удаляет выбранные записи одним DELETE ... RETURNING id"""
+        return await cls._run_bulk(
+            session=session,
+            statement=delete(cls.model.__table__),
+            done_status="deleted",
+            ids=ids,
+            filters=filters,
+            owner_field=owner_field,
+            owner_id=owner_id,
+        )
+
+    @classmethod
+    async def _run_bulk(
+        cls,
+        session: AsyncSession,
+        statement,
+        done_status: str,
+        ids: Optional[List[UUID]],
+        filters: Optional[FilterSchemaType],
+        owner_field: Optional[str],
+        owner_id: Optional[UUID],
+    ) -> List[BulkOutcome]:
+        """
+        Один запрос с data-modifying CTE:
+            WITH target AS (SELECT id ... WHERE id = ANY(:ids) AND <filters>),
+                 changed AS (UPDATE/DELETE ... WHERE id IN target
+                             AND <owner> = :me RETURNING id)
+            SELECT target.id, changed.id IS NOT NULL ...
+        target без условия владельца, чтобы отличить чужие id от
+        несуществующих. Выбор только по фильтрам сразу ограничен своими
+        записями - чужие не попадают даже в forbidden
+        """
+        table = cls.model.__table__
+        values = cls._filter_values(filters)
+        conditions = cls._filter_conditions(
+            cls._filter_shape(values), cls._filter_params(values)
+        )
+        if ids is not None:
+            conditions.append(
+                table.c.id == any_(bindparam("ids", ids, type_=ARRAY(table.c.id.type)))
+            )
+        owner_condition = (
+            table.c[owner_field] == owner_id if owner_field is not None else None
+        )
+        if ids is None and owner_condition is not None:
+            conditions.append(owner_condition)
+        if not conditions:
+            # защита от UPDATE / DELETE всей таблицы
+            raise ValueError(f"{cls.__name__}: пустой выбор для bulk-операции")
+
+        target = select(table.c.id).where(*conditions)
+        if ids is None:
+            # выбор по фильтрам не ограничен списком ids: берём на строку
+            # больше лимита, чтобы увидеть превышение
+            target = target.limit(settings.BULK_MAX_ITEMS + 1)
+        target = target.cte("target")
+        statement = statement.where(table.c.id.in_(select(target.c.id)))
+        if ids is None:
+            # при превышении лимита UPDATE / DELETE не меняет ни одной строки
+            statement = statement.where(
+                select(func.count()).select_from(target).scalar_subquery()
+                <= settings.BULK_MAX_ITEMS
+            )
+        if owner_condition is not None:
+            statement = statement.where(owner_condition)
+        changed = statement.returning(table.c.id).cte("changed")
+        query = select(target.c.id, changed.c.id.is_not(None)).select_from(
+            target.outerjoin(changed, changed.c.id == target.c.id)
+        )
+        rows = (await session.execute(query)).all()
+        if len(rows) > settings.BULK_MAX_ITEMS:
+            logger.error("BulkSelectionTooLargeError", data=len(rows))
+            raise BulkSelectionTooLargeError(
+                custom_detail=f"Под фильтры попало больше {settings.BULK_MAX_ITEMS} "
+                "записей, сузьте выбор"
+            )
+
+        outcomes = {
+            model_id: done_status if is_changed else "forbidden"
+            for model_id, is_changed in rows
+        }
+        requested = ids if ids is not None else list(outcomes)
+        return [
+            BulkOutcome(id=model_id, status=outcomes.get(model_id, "not_found"))
+            for model_id in dict.fromkeys(requested)
+        ]
+
+    @classmethod
+    async def update_one(
+        cls,
+        model_id: UUID,
+        values: Dict,
+        session: AsyncSession,
+        owner_field: Optional[str] = None,
+        owner_id: Optional[UUID] = None,
+    ):
         stmt = (
             update(cls.model)
-            .where(cls.model.id == model_id)
+            .where(*cls._by_id_conditions(model_id, owner_field, owner_id))
             .values(**values)
             .returning(cls.model)
         )
@@ -177,11 +1060,6 @@ class BaseDAO(FiltrMixin, Generic[ModelType, CreateSchemaType, FilterSchemaType]
         obj = result.scalar_one_or_none()
 
         if obj is None:
-            logger.error(
-                "ObjectsNotFoundByIDError on update",
-                model_id=model_id,
-                error="Запрашиваемый объект не найден",
-            )
-            raise ObjectsNotFoundByIDError
+            await cls._raise_missing(session, model_id, owner_field, "update")
 
         return obj
@@ -12,3 +12,4 @@ class CategoryDAO(BaseDAO[Category, SchemaCategoryCreate, SchemaCategoryFilter])
     create_schema = SchemaCategoryCreate
     filter_schema = SchemaCategoryFilter
     pydantic_model = SchemaCategoryBase
+    upsert_conflict_fields = ("name",)
@@ -8,3 +8,8 @@ class OrderDAO(BaseDAO[Order, SchemaOrderCreate, SchemaOrderFilter]):
     create_schema = SchemaOrderCreate
     filter_schema = SchemaOrderFilter
     pydantic_model = SchemaOrderBase
+    filter_operators = {
+        "id": ("in",),
+        "product_id": ("in",),
+        "created_at": ("gt", "gte", "lt", "lte"),
+    }
@@ -12,3 +12,11 @@ class ProductDAO(BaseDAO[Product, SchemaProductCreate, SchemaProductFilter]):
     create_schema = SchemaProductCreate
     filter_schema = SchemaProductFilter
     pydantic_model = SchemaProductBase
+    upsert_conflict_fields = ("name",)
+    filter_operators = {
+        "id": ("in",),
+        "category_id": ("in",),
+        "name": ("startswith",),
+        "price": ("gt", "gte", "lt", "lte"),
+        "created_at": ("gt", "gte", "lt", "lte"),
+    }
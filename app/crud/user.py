@@ -1,9 +1,10 @@
 # pylint: disable=not-callable
-from typing import Optional, List
+from functools import lru_cache
+from typing import Dict, Optional, List
 from uuid import UUID
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, insert
+from sqlalchemy import bindparam, select, delete, insert, func, false
 from sqlalchemy.orm import selectinload
 from app.models import Role, AccessRule, BusinessElement
 from app.models.user import User, user_role_association
@@ -12,9 +13,15 @@ from app.schemas.user import (
     SchemaUserBase,
     SchemaUserFilter,
     UserHashPassword,
+    UserLoginContext,
+)
+from app.schemas.permission import (
+    SchemaPermissionBase,
+    SchemaUserAuth,
+    SchemaUserRolesBase,
 )
-from app.schemas.permission import SchemaPermissionBase, SchemaUserRolesBase
 from app.crud.base import BaseDAO
+from app.crud.role import RoleDAO
 from app.exceptions.base import ObjectsNotFoundByIDError, IntegrityErrorException
 
 
@@ -23,6 +30,7 @@ class UserDAO(BaseDAO[User, SchemaUserPatch, SchemaUserFilter]):
     create_schema = SchemaUserPatch
     filter_schema = SchemaUserFilter
     pydantic_model = SchemaUserBase
+    loader_profiles = {"roles": (selectinload(User.roles),)}
 
     # _exclude_from_filter_by = {"id"}
 
@@ -33,26 +41,65 @@ class UserDAO(BaseDAO[User, SchemaUserPatch, SchemaUserFilter]):
         query = (
             select(cls.model)
             .where(cls.model.id == user_id)
-            .options(selectinload(cls.model.roles))
+            .options(*cls._loader_options("roles"))
         )
         result = await session.execute(query)
         return result.scalar_one_or_none()
 
     @classmethod
-    async def get_with_permissions(
-        cls, user_id: UUID, business_element_name: str, session: AsyncSession
-    ) -> List[str]:
+    async def get_login_context(
+        cls, email: str, session: AsyncSession
+    ) -> Optional[UserLoginContext]:
+        """id, is_active, хеш пароля и имена ролей одним запросом"""
+        role_names = func.array_remove(func.array_agg(Role.name), None)
         query = (
+            select(
+                cls.model.id,
+                cls.model.is_active,
+                cls.model.password,
+                role_names.label("roles"),
+            )
+            .outerjoin(
+                user_role_association,
+                user_role_association.c.user_id == cls.model.id,
+            )
+            .outerjoin(Role, Role.id == user_role_association.c.role_id)
+            .where(cls.model.email == email)
+            .group_by(cls.model.id)
+        )
+        result = await session.execute(query)
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return UserLoginContext(
+            id=row.id,
+            is_active=row.is_active,
+            password=row.password,
+            roles=row.roles,
+        )
+
+    @classmethod
+    @lru_cache(maxsize=1)
+    def _permissions_statement(cls):
+        return (
             select(AccessRule)
             .join(AccessRule.element)
             .join(Role, AccessRule.role_id == Role.id)
             .join(user_role_association, Role.id == user_role_association.c.role_id)
             .where(
-                user_role_association.c.user_id == user_id,
-                BusinessElement.name == business_element_name,
+                user_role_association.c.user_id == bindparam("user_id"),
+                BusinessElement.name == bindparam("business_element_name"),
             )
         )
-        result = await session.execute(query)
+
+    @classmethod
+    async def get_with_permissions(
+        cls, user_id: UUID, business_element_name: str, session: AsyncSession
+    ) -> List[str]:
+        result = await session.execute(
+            cls._permissions_statement(),
+            {"user_id": user_id, "business_element_name": business_element_name},
+        )
         access_rules = result.scalars().all()
 
         aggregated: SchemaPermissionBase = SchemaPermissionBase()
@@ -63,15 +110,126 @@ class UserDAO(BaseDAO[User, SchemaUserPatch, SchemaUserFilter]):
 
         return aggregated.to_permission_list()
 
+    @classmethod
+    @lru_cache(maxsize=1)
+    def _auth_context_statement(cls):
+        """Запрос строится один раз: меняются только параметры"""
+        permission_fields = list(SchemaPermissionBase.model_fields)
+        permissions_cte = (
+            select(
+                user_role_association.c.user_id,
+                *[
+                    func.bool_or(getattr(AccessRule, field_name)).label(field_name)
+                    for field_name in permission_fields
+                ],
+            )
+            .select_from(user_role_association)
+            .join(AccessRule, AccessRule.role_id == user_role_association.c.role_id)
+            .join(BusinessElement, BusinessElement.id == AccessRule.businesselement_id)
+            .where(
+                user_role_association.c.user_id == bindparam("user_id"),
+                BusinessElement.name == bindparam("business_element_name"),
+            )
+            .group_by(user_role_association.c.user_id)
+            .cte("permissions")
+        )
+        return (
+            select(
+                cls.model.id,
+                cls.model.is_active,
+                *[
+                    func.coalesce(permissions_cte.c[field_name], false()).label(
+                        field_name
+                    )
+                    for field_name in permission_fields
+                ],
+            )
+            .outerjoin(permissions_cte, permissions_cte.c.user_id == cls.model.id)
+            .where(cls.model.id == bindparam("user_id"))
+        )
+
+    @classmethod
+    async def get_auth_context(
+        cls, user_id: UUID, business_element_name: str, session: AsyncSession
+    ) -> Optional[SchemaUserAuth]:
+        """
+        is_active и агрегированные разрешения на бизнес-элемент одним запросом.
+        Выбираются только колонки, поэтому selectin-связи User не подгружаются
+        """
+        result = await session.execute(
+            cls._auth_context_statement(),
+            {
+                "user_id": user_id,
+                "business_element_name": getattr(
+                    business_element_name, "value", business_element_name
+                ),
+            },
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        permission_fields = list(SchemaPermissionBase.model_fields)
+        aggregated = SchemaPermissionBase(
+            **{field_name: getattr(row, field_name) for field_name in permission_fields}
+        )
+        return SchemaUserAuth(
+            user_id=row.id,
+            is_active=row.is_active,
+            permissions=aggregated.to_permission_list(),
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _is_active_statement():
+        return select(User.is_active).where(User.id == bindparam("user_id"))
+
+    @classmethod
+    async def get_is_active(
+        cls, user_id: UUID, session: AsyncSession
+    ) -> Optional[bool]:
+        """Активность без кеша: деактивация действует сразу во всех воркерах"""
+        return await session.scalar(cls._is_active_statement(), {"user_id": user_id})
+
+    @classmethod
+    async def get_permission_bitmaps(
+        cls, user_id: UUID, session: AsyncSession
+    ) -> Dict[str, int]:
+        """Битовые маски разрешений пользователя по всем бизнес-элементам"""
+        permission_fields = list(SchemaPermissionBase.model_fields)
+        query = (
+            select(
+                BusinessElement.name,
+                *[
+                    func.bool_or(getattr(AccessRule, field_name)).label(field_name)
+                    for field_name in permission_fields
+                ],
+            )
+            .select_from(user_role_association)
+            .join(AccessRule, AccessRule.role_id == user_role_association.c.role_id)
+            .join(BusinessElement, BusinessElement.id == AccessRule.businesselement_id)
+            .where(user_role_association.c.user_id == user_id)
+            .group_by(BusinessElement.name)
+        )
+        result = await session.execute(query)
+        return {
+            row.name: SchemaPermissionBase(
+                **{
+                    field_name: getattr(row, field_name)
+                    for field_name in permission_fields
+                }
+            ).to_bitmap()
+            for row in result
+        }
+
     @classmethod
     async def add_role_to_user(
         cls, session: AsyncSession, user_id: UUID, role_id: UUID
     ) -> SchemaUserRolesBase:
-        user = await session.get(User, user_id)
-        role = await session.get(Role, role_id)
-        if not user:
+        # проверка существования без загрузки объектов и их связей
+        if not await cls.exists_by_id(session, user_id):
             raise ObjectsNotFoundByIDError("Пользователь не найден")
-        if not role:
+        if not await RoleDAO.exists_by_id(session, role_id):
             raise ObjectsNotFoundByIDError("Роль не найдена")
 
         try:
@@ -101,11 +259,10 @@ class UserDAO(BaseDAO[User, SchemaUserPatch, SchemaUserFilter]):
         user_id: UUID,
         role_id: UUID,
     ) -> dict:
-        user = await session.get(User, user_id)
-        role = await session.get(Role, role_id)
-        if not user:
+        # проверка существования без загрузки объектов и их связей
+        if not await cls.exists_by_id(session, user_id):
             raise ObjectsNotFoundByIDError("Пользователь не найден")
-        if not role:
+        if not await RoleDAO.exists_by_id(session, role_id):
             raise ObjectsNotFoundByIDError("Роль не найдена")
 
         stmt = delete(user_role_association).where(
@@ -0,0 +1,71 @@
+"""
+Метрики пула соединений SQLAlchemy для /metrics.
+Метка pool - имя движка (primary, ...). Пул каждого воркера uvicorn свой,
+поэтому значения приходят по воркерам
+"""
+
+import time
+from functools import lru_cache
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+DB_POOL_SIZE = Gauge("db_pool_size", "Размер пула соединений", ["pool"])
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Соединения, выданные из пула", ["pool"]
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Соединения сверх pool_size (отрицательное - свободные)",
+    ["pool"],
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Ожидание соединения из пула",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total", "Не дождались соединения за pool_timeout", ["pool"]
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Пул, который замеряет ожидание свободного соединения"""
+
+    metrics_label = "default"
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.labels(pool=self.metrics_label).inc()
+            raise
+        finally:
+            DB_POOL_WAIT_SECONDS.labels(pool=self.metrics_label).observe(
+                time.perf_counter() - started_at
+            )
+
+
+@lru_cache(maxsize=None)
+def instrumented_pool_class(label: str) -> type:
+    # метка в атрибуте класса: pool.recreate() создаёт пул через self.__class__
+    return type(
+        f"InstrumentedQueuePool_{label}",
+        (InstrumentedQueuePool,),
+        {"metrics_label": label},
+    )
+
+
+def register_pool_metrics(engine: AsyncEngine, label: str) -> None:
+    # пул берётся при каждом сборе метрик: после dispose() он новый
+    DB_POOL_SIZE.labels(pool=label).set_function(lambda: engine.sync_engine.pool.size())
+    DB_POOL_CHECKED_OUT.labels(pool=label).set_function(
+        lambda: engine.sync_engine.pool.checkedout()
+    )
+    DB_POOL_OVERFLOW.labels(pool=label).set_function(
+        lambda: engine.sync_engine.pool.overflow()
+    )
@@ -0,0 +1,85 @@
+"""
+Статистика SQL на один HTTP-запрос: число выражений, время в БД
+и повторы одной формы запроса (признак N+1).
+Слушатели висят на всех Engine (primary и реплики); накопитель запроса
+лежит в ContextVar, его выставляет auth_logging_middleware
+"""
+
+import time
+from collections import Counter as ShapeCounter
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import Counter, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+SQL_QUERIES_PER_REQUEST = Histogram(
+    "sql_queries_per_request",
+    "Количество SQL-выражений на запрос",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+SQL_SECONDS_PER_REQUEST = Histogram(
+    "sql_seconds_per_request",
+    "Суммарное время SQL на запрос",
+    ["route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+SQL_N_PLUS_ONE = Counter(
+    "sql_n_plus_one_total", "Запросы с повтором одной формы SQL", ["route"]
+)
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = ShapeCounter()
+
+    def add(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement] += 1
+
+    def repeated_shapes(self, threshold: int) -> list:
+        """Формы SQL, выполненные больше threshold раз"""
+        return [
+            (statement, count)
+            for statement, count in self.shapes.most_common()
+            if count > threshold
+        ]
+
+
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def start_request_stats() -> QueryStats:
+    # объект изменяемый: задача эндпоинта получает копию контекста
+    # с тем же объектом, поэтому итоги видны middleware
+    stats = QueryStats()
+    _request_stats.set(stats)
+    return stats
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info["query_started_at"].pop()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.add(statement, time.perf_counter() - started_at)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # after_cursor_execute при ошибке не вызывается - снимаем отметку времени
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started_at"):
+        connection.info["query_started_at"].pop()
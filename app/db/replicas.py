@@ -0,0 +1,147 @@
+"""
+Маршрутизация читающих запросов на реплики (DB_REPLICA_URLS).
+Реплика выбирается по DB_REPLICA_STRATEGY:
+    round_robin       - по кругу
+    least_connections - с наименьшим числом выданных соединений пула
+Отставание реплик проверяется не чаще DB_REPLICA_LAG_CHECK_SECONDS:
+реплика с отставанием больше DB_REPLICA_MAX_LAG_SECONDS или недоступная
+исключается до следующей проверки. Нет здоровых реплик - запрос идёт на primary
+"""
+
+import asyncio
+import itertools
+import time
+from typing import List, Optional
+import structlog
+from prometheus_client import Counter, Gauge
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.config import settings
+from app.db.session import async_session_maker, create_session_factory
+
+
+logger = structlog.get_logger()
+
+DB_REPLICA_ROUTED = Counter(
+    "db_replica_routed_total", "Куда направлены читающие сессии", ["target"]
+)
+DB_REPLICA_LAG_SECONDS = Gauge(
+    "db_replica_lag_seconds", "Отставание реплики от primary", ["replica"]
+)
+
+# отставание 0, если реплика применила всё полученное: при простое primary
+# pg_last_xact_replay_timestamp() стареет, хотя данные актуальны
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+class Replica:
+    def __init__(self, label: str, session_factory):
+        self.label = label
+        self.session_factory = session_factory
+        self.healthy = True
+        self.lag: Optional[float] = None
+
+    @property
+    def checked_out(self) -> int:
+        return self.session_factory.kw["bind"].sync_engine.pool.checkedout()
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary,
+        replicas: List[Replica],
+        strategy: str,
+        max_lag_seconds: float,
+        lag_check_seconds: float,
+    ):
+        if strategy not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown DB_REPLICA_STRATEGY: {strategy}")
+        self.primary = primary
+        self.replicas = replicas
+        self.strategy = strategy
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_seconds = lag_check_seconds
+        self._counter = itertools.count()
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def session_factory(self):
+        """Фабрика сессий для читающего запроса: здоровая реплика или primary"""
+        if not self.replicas:
+            return self.primary
+        await self._maybe_check_lag()
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            DB_REPLICA_ROUTED.labels(target="primary").inc()
+            return self.primary
+        if self.strategy == "least_connections":
+            replica = min(healthy, key=lambda replica: replica.checked_out)
+        else:
+            replica = healthy[next(self._counter) % len(healthy)]
+        DB_REPLICA_ROUTED.labels(target=replica.label).inc()
+        return replica.session_factory
+
+    async def _maybe_check_lag(self) -> None:
+        if self._checked_at is not None:
+            if time.monotonic() - self._checked_at < self.lag_check_seconds:
+                return
+            # проверку уже выполняет другой запрос - идём по прошлым результатам
+            if self._lock.locked():
+                return
+        async with self._lock:
+            now = time.monotonic()
+            if (
+                self._checked_at is not None
+                and now - self._checked_at < self.lag_check_seconds
+            ):
+                return
+            await asyncio.gather(
+                *(self._check_replica(replica) for replica in self.replicas)
+            )
+            self._checked_at = now
+
+    async def _check_replica(self, replica: Replica) -> None:
+        try:
+            async with replica.session_factory() as session:
+                replica.lag = float(await session.scalar(REPLICA_LAG_QUERY))
+        except (SQLAlchemyError, OSError, asyncio.TimeoutError) as exc:
+            logger.error("Replica lag check failed", error=str(exc), data=replica.label)
+            replica.healthy = False
+            return
+        DB_REPLICA_LAG_SECONDS.labels(replica=replica.label).set(replica.lag)
+        healthy = replica.lag <= self.max_lag_seconds
+        if replica.healthy and not healthy:
+            logger.warning("Replica lag too high", data=replica.label, lag=replica.lag)
+        replica.healthy = healthy
+
+
+def create_replica_router() -> ReplicaRouter:
+    urls = [url.strip() for url in settings.DB_REPLICA_URLS.split(",") if url.strip()]
+    replicas = [
+        Replica(
+            label=f"replica{number}",
+            session_factory=create_session_factory(url, pool_label=f"replica{number}"),
+        )
+        for number, url in enumerate(urls, start=1)
+    ]
+    return ReplicaRouter(
+        primary=async_session_maker,
+        replicas=replicas,
+        strategy=settings.DB_REPLICA_STRATEGY,
+        max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+        lag_check_seconds=settings.DB_REPLICA_LAG_CHECK_SECONDS,
+    )
+
+
+replica_router = create_replica_router()
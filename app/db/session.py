@@ -6,26 +6,82 @@
 from typing import Optional
 import asyncio
 from contextlib import asynccontextmanager
+from functools import lru_cache
 import structlog
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import QueuePool
+from app.core.config import settings
+from app.db.pool_metrics import instrumented_pool_class, register_pool_metrics
 
 
 logger = structlog.get_logger()
 
 
-def create_session_factory(database_url: str):
+def create_session_factory(database_url: str, pool_label: str = "primary"):
     """Создает фабрику сессий для заданного URL базы данных"""
-    engine = create_async_engine(database_url)
+    engine = create_async_engine(
+        database_url,
+        poolclass=instrumented_pool_class(pool_label),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+        },
+    )
+    register_pool_metrics(engine, pool_label)
     return async_sessionmaker(engine, expire_on_commit=False)
 
 
+async_session_maker = create_session_factory(settings.DATABASE_URL)
+
+
+def pool_has_spare_connection(engine) -> bool:
+    """Можно ли взять ещё одно соединение из пула, не вставая в очередь"""
+    pool = getattr(engine, "sync_engine", engine).pool
+    if not isinstance(pool, QueuePool):
+        return False
+    # pylint: disable-next=protected-access
+    max_overflow = pool._max_overflow
+    if max_overflow < 0:
+        return True
+    return pool.checkedout() < pool.size() + max_overflow
+
+
+@lru_cache(maxsize=32)
+def _bind_with_options(engine, isolation_level: Optional[str], read_only: bool):
+    """
+    Копия движка с execution options на общем пуле соединений.
+    Опции применяются к каждому соединению, которое сессия берёт из пула,
+    в том числе после commit посреди запроса
+    """
+    options = {}
+    if isolation_level is not None:
+        options["isolation_level"] = isolation_level
+    if read_only:
+        # READ ONLY: Postgres не ведёт учёт записи для транзакции;
+        # DEFERRABLE: для SERIALIZABLE READ ONLY снимок без риска 40001
+        options["postgresql_readonly"] = True
+        options["postgresql_deferrable"] = True
+    return engine.execution_options(**options)
+
+
 @asynccontextmanager
 async def get_session_with_isolation(
-    session_factory, isolation_level: Optional[str] = None
+    session_factory, isolation_level: Optional[str] = None, read_only: bool = False
 ):
+    isolation_level = getattr(isolation_level, "value", isolation_level)
     try:
-        async with session_factory() as session:
-            # logger.info("Текущий уровень изоляции", isolation_level=isolation_level)
+        if isolation_level is None and not read_only:
+            session_context = session_factory()
+        else:
+            engine = session_factory.kw["bind"]
+            session_context = session_factory(
+                bind=_bind_with_options(engine, isolation_level, read_only)
+            )
+        async with session_context as session:
             yield session
     except (ConnectionRefusedError, OSError, asyncio.TimeoutError) as exc:
         logger.error(
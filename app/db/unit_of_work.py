@@ -0,0 +1,115 @@
+"""
+Транзакция как единица работы с повтором при конфликте.
+SERIALIZABLE и REPEATABLE READ отменяют транзакцию при конкурентном изменении
+(SQLSTATE 40001) или взаимной блокировке (40P01). Повторить можно только всю
+транзакцию целиком, поэтому run_in_transaction сам открывает сессию, вызывает
+функцию сервиса и коммитит. При конфликте - откат, пауза с экспоненциальным
+ростом и случайным разбросом (full jitter), новая сессия и повтор
+"""
+
+import asyncio
+import random
+from typing import Any, Awaitable, Callable, Optional
+import structlog
+from prometheus_client import Counter
+from sqlalchemy.exc import DBAPIError, IntegrityError, OperationalError, SQLAlchemyError
+from app.core.config import settings
+from app.db.session import async_session_maker, get_session_with_isolation
+from app.exceptions.base import (
+    DatabaseConnectionException,
+    IntegrityErrorException,
+    SerializationFailureException,
+    SqlalchemyErrorException,
+)
+
+
+logger = structlog.get_logger()
+
+RETRYABLE_SQLSTATES = {
+    "40001": "serialization_failure",
+    "40P01": "deadlock_detected",
+}
+
+DB_TRANSACTION_RETRIES = Counter(
+    "db_transaction_retries_total", "Повторы транзакций после конфликта", ["reason"]
+)
+DB_TRANSACTION_RETRIES_EXHAUSTED = Counter(
+    "db_transaction_retries_exhausted_total",
+    "Транзакции, не завершённые за DB_RETRY_ATTEMPTS попыток",
+)
+
+
+def get_sqlstate(exc: DBAPIError) -> Optional[str]:
+    return getattr(exc.orig, "pgcode", None) or getattr(exc.orig, "sqlstate", None)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full jitter: случайная пауза от 0 до base * 2^attempt, но не больше max"""
+    ceiling = min(
+        settings.DB_RETRY_MAX_DELAY_SECONDS,
+        settings.DB_RETRY_BASE_DELAY_SECONDS * 2**attempt,
+    )
+    return random.uniform(0, ceiling)
+
+
+async def run_in_transaction(
+    func: Callable[..., Awaitable[Any]],
+    isolation_level: Optional[str] = None,
+    session_factory=None,
+    attempts: Optional[int] = None,
+    **kwargs,
+) -> Any:
+    """
+    Вызывает func(session=..., **kwargs) в отдельной транзакции и коммитит.
+    func может выполниться несколько раз: побочные эффекты вне БД в ней недопустимы
+    """
+    session_factory = session_factory or async_session_maker
+    attempts = attempts or settings.DB_RETRY_ATTEMPTS
+    for attempt in range(attempts):
+        async with get_session_with_isolation(
+            session_factory, isolation_level
+        ) as session:
+            try:
+                result = await func(session=session, **kwargs)
+                if session.in_transaction():
+                    await session.commit()
+                return result
+            except DBAPIError as exc:
+                if session.in_transaction():
+                    await session.rollback()
+                reason = RETRYABLE_SQLSTATES.get(get_sqlstate(exc))
+                if reason is None:
+                    raise _translate(exc) from exc
+                if attempt + 1 == attempts:
+                    DB_TRANSACTION_RETRIES_EXHAUSTED.inc()
+                    logger.error(
+                        "SerializationFailureException",
+                        error=reason,
+                        data=attempts,
+                    )
+                    raise SerializationFailureException from exc
+                DB_TRANSACTION_RETRIES.labels(reason=reason).inc()
+                delay = backoff_delay(attempt)
+                logger.warning(
+                    "Retry transaction", error=reason, data=attempt + 1, delay=delay
+                )
+            except SQLAlchemyError as exc:
+                if session.in_transaction():
+                    await session.rollback()
+                raise _translate(exc) from exc
+            except Exception:
+                if session.in_transaction():
+                    await session.rollback()
+                raise
+        await asyncio.sleep(delay)
+
+
+def _translate(exc: SQLAlchemyError) -> Exception:
+    if isinstance(exc, IntegrityError):
+        logger.error("IntegrityError", error=str(exc))
+        return IntegrityErrorException()
+    if isinstance(exc, OperationalError):
+        logger.error("OperationalError", error=str(exc))
+        return DatabaseConnectionException()
+    logger.error(" SQLAlchemyError", error=str(exc))
+    return SqlalchemyErrorException()
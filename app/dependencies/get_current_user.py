@@ -25,7 +25,7 @@ async def get_current_user(
     session: AsyncSession = Depends(connection()),
 ) -> User:
     try:
-        if token in token_blacklist:
+        if await token_blacklist.is_revoked(token):
             raise BlacklistedError
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
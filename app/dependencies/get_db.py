@@ -1,13 +1,14 @@
 from typing import Optional, AsyncGenerator
+from contextlib import asynccontextmanager
 import structlog
 from structlog.contextvars import bind_contextvars
 from fastapi import Depends, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.config import settings
 from app.core.enums import BusinessDomain, IsolationLevel
-from app.db.session import create_session_factory, get_session_with_isolation
+from app.db.replicas import replica_router
+from app.db.session import async_session_maker, get_session_with_isolation
 from app.exceptions.base import (
     IntegrityErrorException,
     CustomInternalServerException,
@@ -16,14 +17,13 @@ from app.exceptions.base import (
     SerializationFailureException,
     BadCredentialsError,
 )
-from app.schemas.permission import RequestContext
+from app.schemas.permission import AccessContext, RequestContext
 from app.dependencies.get_payload_from_jwt import get_payload_from_jwt
 
 
 logger = structlog.get_logger()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/swaggerlogin")
-async_session_maker = create_session_factory(settings.DATABASE_URL)
 
 
 async def get_token_from_either(request: Request) -> str:
@@ -42,22 +42,58 @@ async def get_token_from_either(request: Request) -> str:
     raise BadCredentialsError
 
 
+@asynccontextmanager
+async def request_session(
+    request: Request,
+    isolation_level: Optional[str],
+    read_only: bool,
+    replica: bool,
+):
+    """
+    Реестр сессий в рамках запроса: первая зависимость открывает сессию
+    (и отвечает за commit), остальные в цепочке получают ту же сессию.
+    Так на запрос берётся одно соединение из пула и одна транзакция.
+    Параметры сессии задаёт та зависимость, что объявлена в эндпоинте первой
+    """
+    session = getattr(request.state, "db_session", None)
+    if session is not None:
+        yield session, False
+        return
+    session_factory = (
+        await replica_router.session_factory() if replica else async_session_maker
+    )
+    async with get_session_with_isolation(
+        session_factory, isolation_level, read_only
+    ) as session:
+        request.state.db_session = session
+        try:
+            yield session, True
+        finally:
+            request.state.db_session = None
+
+
 def auth_db_context(
     business_element: Optional[BusinessDomain] = None,
     isolation_level: Optional[str] = IsolationLevel.READ_COMMITTED,
     commit: bool = True,
+    read_only: bool = False,
+    replica: bool = False,
 ):
     """
     Фабрика зависимости для FastAPI, создающая асинхронную сессию с заданным уровнем изоляции.
     Сессия и пользователь в одном контексте.
+    read_only=True открывает транзакцию READ ONLY DEFERRABLE (для GET)
+    replica=True отправляет запрос на реплику, если она настроена и не отстаёт
     """
 
     async def dependency(
+        request: Request,
         token: str = Depends(get_token_from_either),
     ) -> AsyncGenerator[RequestContext, None]:
-        async with get_session_with_isolation(
-            async_session_maker, isolation_level
-        ) as session:
+        async with request_session(request, isolation_level, read_only, replica) as (
+            session,
+            owner,
+        ):
             try:
                 access = await get_payload_from_jwt(
                     token=token, business_element=business_element, session=session
@@ -70,6 +106,7 @@ def auth_db_context(
                     else None,
                     isolation_level=isolation_level,
                     commit=commit,
+                    read_only=read_only,
                 )
 
                 logger.info(
@@ -77,7 +114,7 @@ def auth_db_context(
                     user_id=access.user_id,
                 )
                 yield RequestContext(session=session, access=access)
-                if commit and session.in_transaction():
+                if owner and commit and session.in_transaction():
                     await session.commit()
             except IntegrityError as exc:
                 logger.error("IntegrityError", error=str(exc))
@@ -92,7 +129,8 @@ def auth_db_context(
                     )
                     if session.in_transaction():
                         await session.rollback()
-                    # Но здесь нельзя просто "повторить" — нужно перезапустить ВСЮ транзакцию
+                    # Здесь нельзя просто "повторить" — нужно перезапустить ВСЮ транзакцию.
+                    # Для этого эндпоинт берёт auth_context и run_in_transaction
                     raise SerializationFailureException from exc
                 logger.error("OperationalError (non-serialization)", error=str(exc))
                 raise DatabaseConnectionException from exc
@@ -113,18 +151,57 @@ def auth_db_context(
     return dependency
 
 
-def connection(isolation_level: Optional[str] = "READ COMMITTED", commit: bool = True):
+def auth_context(business_element: Optional[BusinessDomain] = None):
+    """
+    Фабрика зависимости только для авторизации: сессия закрывается до вызова
+    эндпоинта. Для эндпоинтов, которые открывают транзакцию сами
+    через run_in_transaction (с повтором при 40001)
+    """
+
+    async def dependency(
+        token: str = Depends(get_token_from_either),
+    ) -> AccessContext:
+        try:
+            async with get_session_with_isolation(
+                async_session_maker, IsolationLevel.READ_COMMITTED, read_only=True
+            ) as session:
+                access = await get_payload_from_jwt(
+                    token=token, business_element=business_element, session=session
+                )
+        except OperationalError as exc:
+            logger.error("OperationalError", error=str(exc))
+            raise DatabaseConnectionException from exc
+        except SQLAlchemyError as exc:
+            logger.error(" SQLAlchemyError", error=str(exc))
+            raise SqlalchemyErrorException from exc
+
+        bind_contextvars(
+            user_id=access.user_id,
+            business_element=business_element.value if business_element else None,
+        )
+        return access
+
+    return dependency
+
+
+def connection(
+    isolation_level: Optional[str] = "READ COMMITTED",
+    commit: bool = True,
+    read_only: bool = False,
+    replica: bool = False,
+):
     """
     Фабрика зависимости для FastAPI, создающая асинхронную сессию с заданным уровнем изоляции.
     """
 
-    async def dependency() -> AsyncGenerator[AsyncSession, None]:
-        async with get_session_with_isolation(
-            async_session_maker, isolation_level
-        ) as session:
+    async def dependency(request: Request) -> AsyncGenerator[AsyncSession, None]:
+        async with request_session(request, isolation_level, read_only, replica) as (
+            session,
+            owner,
+        ):
             try:
                 yield session
-                if commit and session.in_transaction():
+                if owner and commit and session.in_transaction():
                     await session.commit()
             except IntegrityError as exc:
                 logger.error("IntegrityError", error=str(exc))
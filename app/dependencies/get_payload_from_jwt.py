@@ -3,9 +3,13 @@ from uuid import UUID
 import structlog
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.crud.user import UserDAO
+from app.core.config import settings
 from app.services.auth_service import AuthService
-from app.services.user import ensure_user_is_active
+from app.services.user import (
+    ensure_user_is_active,
+    get_access_from_claims,
+    resolve_user_access,
+)
 from app.schemas.permission import AccessContext
 
 
@@ -18,27 +22,28 @@ async def get_user_id_from_jwt(
     token: str,
     session: AsyncSession,
 ) -> UUID:
-    payload = AuthService.decode_access_token(token=token)
+    payload = await AuthService.decode_access_token(token=token)
     user_id = payload.sub
     await ensure_user_is_active(user_id=user_id, session=session)
     return user_id
 
 
-def get_roles_from_jwt(
+async def get_roles_from_jwt(
     token: str,
 ) -> List[str]:
-    payload = AuthService.decode_access_token(token=token)
+    payload = await AuthService.decode_access_token(token=token)
     list_permissions = payload.role
     return list_permissions
 
 
 async def get_payload_from_jwt(
     token: str, business_element: str, session: AsyncSession
-):
-    user_id = await get_user_id_from_jwt(token=token, session=session)
-    list_permissions = await UserDAO.get_with_permissions(
-        user_id=user_id,
-        business_element_name=business_element,
-        session=session,
+) -> AccessContext:
+    payload = await AuthService.decode_access_token(token=token)
+    if settings.AUTH_PERMISSIONS_IN_TOKEN and payload.perm is not None:
+        return await get_access_from_claims(
+            payload=payload, business_element=business_element, session=session
+        )
+    return await resolve_user_access(
+        user_id=payload.sub, business_element=business_element, session=session
     )
-    return AccessContext(user_id=user_id, permissions=list_permissions)
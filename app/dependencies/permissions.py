@@ -1,10 +1,10 @@
+from typing import Annotated
 import structlog
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.dependencies.get_current_user import get_current_user
+from app.dependencies.get_current_user import oauth2_scheme
 from app.dependencies.get_db import connection
-from app.models.user import User
-from app.crud.user import UserDAO
+from app.dependencies.get_payload_from_jwt import get_payload_from_jwt
 from app.schemas.permission import AccessContext
 
 
@@ -13,20 +13,18 @@ logger = structlog.get_logger()
 
 def require_permission(business_element: str):
     async def dependency(
-        current_user: User = Depends(get_current_user),
+        token: Annotated[str, Depends(oauth2_scheme)],
         session: AsyncSession = Depends(connection()),
     ) -> AccessContext:
-        list_permissions = await UserDAO.get_with_permissions(
-            user_id=current_user.id,
-            business_element_name=business_element,
-            session=session,
+        access = await get_payload_from_jwt(
+            token=token, business_element=business_element, session=session
         )
         logger.info(
             "get user with list permissions",
-            user_id=current_user.id,
-            list_permissions=list_permissions,
+            user_id=access.user_id,
+            list_permissions=access.permissions,
         )
 
-        return AccessContext(user_id=current_user.id, permissions=list_permissions)
+        return access
 
     return dependency
@@ -65,6 +65,21 @@ class MultipleResultsError(CustomHTTPException):
     detail = "Multiple rows were found when one or none was required"
 
 
+class InvalidCursorError(CustomHTTPException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = "Некорректный курсор пагинации"
+
+
+class InvalidFieldsError(CustomHTTPException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = "Недопустимые поля в fields"
+
+
+class BulkSelectionTooLargeError(CustomHTTPException):
+    status_code = status.HTTP_413_CONTENT_TOO_LARGE
+    detail = "Слишком много записей для bulk-операции"
+
+
 class PasswordMismatchError(CustomHTTPException):
     status_code = status.HTTP_400_BAD_REQUEST
     detail = "Password and confirmation do not match"
@@ -96,6 +111,23 @@ class DatabaseConnectionException(CustomHTTPException):
     detail = "Сервис базы данных временно недоступен"
 
 
+class PasswordHasherBusyError(CustomHTTPException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail = "Сервис временно перегружен, повторите попытку позже"
+
+
+class TooManyLoginAttemptsError(CustomHTTPException):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    detail = "Слишком много попыток входа, повторите попытку позже"
+
+    def __init__(
+        self, retry_after: Optional[int] = None, custom_detail: Optional[str] = None
+    ) -> None:
+        super().__init__(custom_detail=custom_detail)
+        if retry_after is not None:
+            self.headers = {"Retry-After": str(retry_after)}
+
+
 class SerializationFailureException(CustomHTTPException):
     status_code = status.HTTP_409_CONFLICT
     detail = "Serialization failure (40001), should retry transaction"
@@ -1,5 +1,6 @@
 import os
 import logging
+from contextlib import asynccontextmanager
 import structlog
 from prometheus_fastapi_instrumentator import Instrumentator
 from starlette.middleware.sessions import SessionMiddleware
@@ -10,6 +11,7 @@ from app.middleware.auth_logging_middleware import auth_logging_middleware
 from app.api.v1.base_router import v1_router
 from app.api.swagger_auth.auth import swagger_router
 from app.core.config import settings
+from app.core.security import password_hasher
 from app.core.structlog_configure import configure_logging
 
 
@@ -23,7 +25,14 @@ configure_logging()
 logger = structlog.get_logger()
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    yield
+    password_hasher.shutdown()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     debug=settings.DEBUG,
     title="API",
     version="0.1.0",
@@ -60,6 +69,12 @@ app.add_middleware(
         "Content-Type",
         "Authorization",
     ],
+    expose_headers=[
+        "X-Next-Cursor",
+        "X-Prev-Cursor",
+        "X-Total-Count",
+        "X-Total-Count-Exact",
+    ],
 )
 
 # Включить метрики
@@ -1,7 +1,16 @@
 import time
+from typing import AsyncIterator
 import structlog
 from structlog.contextvars import bind_contextvars, clear_contextvars
 from fastapi import Request
+from app.core.config import settings
+from app.db.query_stats import (
+    SQL_N_PLUS_ONE,
+    SQL_QUERIES_PER_REQUEST,
+    SQL_SECONDS_PER_REQUEST,
+    QueryStats,
+    start_request_stats,
+)
 
 
 logger = structlog.get_logger()
@@ -24,6 +33,55 @@ async def auth_logging_middleware(request: Request, call_next):
     bind_contextvars(path=request.url.path)
     bind_contextvars(user_agent=request.headers.get("user-agent"))
 
+    started_at = time.perf_counter()
+    stats = start_request_stats()
     response = await call_next(request)
-
+    # тело StreamingResponse (NDJSON-экспорт) читает БД уже после возврата
+    # call_next - итоги снимаем, когда тело отдано целиком
+    response.body_iterator = _record_stats_after_body(
+        request, response.status_code, started_at, stats, response.body_iterator
+    )
     return response
+
+
+async def _record_stats_after_body(
+    request: Request,
+    status_code: int,
+    started_at: float,
+    stats: QueryStats,
+    body_iterator: AsyncIterator[bytes],
+) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        _record_request_stats(request, status_code, started_at, stats)
+
+
+def _record_request_stats(
+    request: Request, status_code: int, started_at: float, stats: QueryStats
+) -> None:
+    # шаблон пути, а не сам путь: иначе метки плодятся по id
+    route = request.scope.get("route")
+    route_path = route.path if route is not None else "unmatched"
+    SQL_QUERIES_PER_REQUEST.labels(route=route_path).observe(stats.count)
+    SQL_SECONDS_PER_REQUEST.labels(route=route_path).observe(stats.duration)
+    bind_contextvars(db_queries=stats.count, db_time_s=round(stats.duration, 4))
+
+    repeated = stats.repeated_shapes(settings.SQL_N_PLUS_ONE_THRESHOLD)
+    if repeated:
+        SQL_N_PLUS_ONE.labels(route=route_path).inc()
+        statement, count = repeated[0]
+        logger.warning(
+            "Possible N+1 queries",
+            data=count,
+            statement=" ".join(statement.split())[:200],
+        )
+
+    logger.info(
+        "Request completed",
+        status=status_code,
+        db_queries=stats.count,
+        db_time_s=round(stats.duration, 4),
+        duration_s=round(time.perf_counter() - started_at, 4),
+    )
@@ -7,6 +7,8 @@ from .business_element import BusinessElement
 from .category import Category
 from .product import Product
 from .file_upload import FileUpload
+from .revoked_token import RevokedToken
+from .login_throttle import LoginThrottle
 
 
 # Теперь при импорте Base автоматически загружаются все модели
@@ -20,4 +22,6 @@ __all__ = [
     "Category",
     "Product",
     "FileUpload",
+    "RevokedToken",
+    "LoginThrottle",
 ]
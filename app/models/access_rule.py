@@ -1,9 +1,14 @@
 from uuid import UUID
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Sequence
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 from .base import Base, BoolDefFalse
 
 
+# версия прав: увеличивается при любом изменении ролей и правил доступа,
+# токены с permission claims от старой версии отклоняются
+permission_version_seq = Sequence("permission_version_seq", metadata=Base.metadata)
+
+
 class AccessRule(Base):
     role_id: Mapped[UUID] = mapped_column(ForeignKey("role.id"), primary_key=True)
     businesselement_id: Mapped[UUID] = mapped_column(
@@ -18,8 +23,10 @@ class AccessRule(Base):
     delete_permission: Mapped[BoolDefFalse]
     delete_all_permission: Mapped[BoolDefFalse]
 
-    role: Mapped["Role"] = relationship("Role", back_populates="access_rules")
-    element: Mapped["BusinessElement"] = relationship("BusinessElement")
+    role: Mapped["Role"] = relationship(
+        "Role", back_populates="access_rules", lazy="raise"
+    )
+    element: Mapped["BusinessElement"] = relationship("BusinessElement", lazy="raise")
 
     def __repr__(self):
         return f"<{self.__class__.__name__} (id={self.role_id}, element={self.businesselement_id})>"
@@ -10,7 +10,9 @@ class FileUpload(Base):
     extension: Mapped[StrNullFalse]
     size_bytes: Mapped[int] = mapped_column(default=0)
 
-    users: Mapped["User"] = relationship("User", back_populates="file_uploads")
+    users: Mapped["User"] = relationship(
+        "User", back_populates="file_uploads", lazy="raise"
+    )
 
     def __repr__(self):
         return f"<{self.__class__.__name__} (id={self.id}, user_id={self.user_id}, name={self.name})>"
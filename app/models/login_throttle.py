@@ -0,0 +1,16 @@
+from datetime import datetime
+from sqlalchemy import DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base, StrUniq
+
+
+class LoginThrottle(Base):
+    """Корзина токенов для ограничения попыток входа (по email или IP)"""
+
+    key: Mapped[StrUniq]
+    tokens: Mapped[float]
+    refilled_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    last_allowed: Mapped[bool]
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} (key={self.key}, tokens={self.tokens})>"
@@ -1,17 +1,24 @@
 from uuid import UUID
-from sqlalchemy import ForeignKey, Integer
+from sqlalchemy import Index, ForeignKey, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base, BoolDefFalse
 
 
 class Order(Base):
+    __table_args__ = (
+        Index("ix_order_created_at_id", "created_at", "id"),
+        Index("ix_order_product_id", "product_id"),
+    )
+
     user_id: Mapped[UUID] = mapped_column(ForeignKey("user.id"))
     product_id: Mapped[UUID] = mapped_column(ForeignKey("product.id"))
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
     is_paid: Mapped[BoolDefFalse]
 
-    users: Mapped["User"] = relationship("User", back_populates="orders")
-    products: Mapped["Product"] = relationship("Product", back_populates="orders")
+    users: Mapped["User"] = relationship("User", back_populates="orders", lazy="raise")
+    products: Mapped["Product"] = relationship(
+        "Product", back_populates="orders", lazy="raise"
+    )
 
     def __repr__(self):
         return f"<{self.__class__.__name__} (id={self.id}, user_id={self.user_id}, product_id={self.product_id})>"
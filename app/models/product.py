@@ -1,11 +1,23 @@
 from uuid import UUID
 from typing import List
-from sqlalchemy import ForeignKey
+from sqlalchemy import Index, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base, StrUniq
 
 
 class Product(Base):
+    __table_args__ = (
+        Index("ix_product_created_at_id", "created_at", "id"),
+        Index("ix_product_category_id", "category_id"),
+        Index("ix_product_price", "price"),
+        # LIKE 'prefix%' (name__startswith) по индексу при любой collation
+        Index(
+            "ix_product_name_pattern",
+            "name",
+            postgresql_ops={"name": "text_pattern_ops"},
+        ),
+    )
+
     category_id: Mapped[UUID] = mapped_column(ForeignKey("category.id"))
     name: Mapped[StrUniq]
     price: Mapped[int] = mapped_column(info={"verbose_name": "цена в копейках"})
@@ -13,7 +25,7 @@ class Product(Base):
     orders: Mapped[List["Order"]] = relationship(
         "Order",
         back_populates="products",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self):
@@ -0,0 +1,16 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base, StrUniq
+
+
+class RevokedToken(Base):
+    """Отозванный токен. Хранится дайджест, а не сам JWT"""
+
+    __table_args__ = (Index("ix_revokedtoken_created_at", "created_at"),)
+
+    digest: Mapped[StrUniq]
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} (digest={self.digest}, expires_at={self.expires_at})>"
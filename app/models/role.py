@@ -8,13 +8,13 @@ class Role(Base):
     description: Mapped[StrNullFalse]
 
     users: Mapped[List["User"]] = relationship(
-        "User", secondary="user_roles", back_populates="roles"
+        "User", secondary="user_roles", back_populates="roles", lazy="raise"
     )
 
     access_rules: Mapped[List["AccessRule"]] = relationship(
         "AccessRule",
         back_populates="role",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self):
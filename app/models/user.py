@@ -1,5 +1,5 @@
 from typing import List
-from sqlalchemy import Table, Column, ForeignKey, DateTime, func
+from sqlalchemy import Index, Table, Column, ForeignKey, DateTime, func
 from sqlalchemy.orm import Mapped, relationship
 from app.models.base import Base, StrUniq, StrNullFalse, StrNullTrue, BoolDefTrue
 from app.models.role import Role
@@ -17,6 +17,8 @@ user_role_association = Table(
 
 
 class User(Base):
+    __table_args__ = (Index("ix_user_created_at_id", "created_at", "id"),)
+
     email: Mapped[StrUniq]
     password: Mapped[StrNullFalse]
     first_name: Mapped[StrNullTrue]
@@ -27,19 +29,19 @@ class User(Base):
         "Role",
         secondary=user_role_association,
         back_populates="users",
-        lazy="selectin",  # Для асинхронной загрузки ролей вместе с пользователем
+        lazy="raise",
     )
 
     orders: Mapped[List["Order"]] = relationship(
         "Order",
         back_populates="users",
-        lazy="selectin",
+        lazy="raise",
     )
 
     file_uploads: Mapped[List["FileUpload"]] = relationship(
         "FileUpload",
         back_populates="users",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __str__(self):
@@ -1,6 +1,20 @@
-from typing import Annotated
-from pydantic import BaseModel, ConfigDict
+import inspect
+from typing import (
+    Annotated,
+    Dict,
+    Generic,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+    get_args,
+    get_origin,
+)
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 from fastapi import Query
+from app.core.config import settings
 
 
 class BaseConfigModel(BaseModel):
@@ -23,6 +37,118 @@ class BaseFilter(BaseModel):
     )
 
 
+def list_query_params(model: type[BaseModel]) -> type[BaseModel]:
+    """
+    Фильтр через Depends(): FastAPI берёт параметры из сигнатуры модели,
+    и поля-списки (__in) без явного Query() ушли бы в тело запроса
+    """
+    params = []
+    for param in inspect.signature(model).parameters.values():
+        annotation = param.annotation
+        if list in (get_origin(annotation), *map(get_origin, get_args(annotation))):
+            param = param.replace(default=Query(default=param.default))
+        params.append(param)
+    model.__signature__ = inspect.Signature(params)
+    return model
+
+
 class PaginationParams(BaseModel):
     page: Annotated[int, Query(default=1, ge=1)]
     per_page: Annotated[int, Query(default=10, ge=1, lt=100)]
+    # курсорный режим: пустая строка - первая страница, дальше значения
+    # из заголовков X-Next-Cursor / X-Prev-Cursor; page при этом не учитывается
+    cursor: Annotated[
+        Optional[str],
+        Query(default=None, description="Курсор страницы (keyset-пагинация)"),
+    ] = None
+
+    total: Annotated[
+        bool,
+        Query(
+            default=False,
+            description="Вернуть общее число строк в X-Total-Count "
+            "(X-Total-Count-Exact: false - оценка по статистике)",
+        ),
+    ] = False
+
+    # заполняет BaseDAO.find_many: курсоры соседних страниц и total
+    _next_cursor: Optional[str] = PrivateAttr(default=None)
+    _prev_cursor: Optional[str] = PrivateAttr(default=None)
+    _total: Optional[int] = PrivateAttr(default=None)
+    _total_exact: bool = PrivateAttr(default=True)
+
+    def page_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self._next_cursor is not None:
+            headers["X-Next-Cursor"] = self._next_cursor
+        if self._prev_cursor is not None:
+            headers["X-Prev-Cursor"] = self._prev_cursor
+        if self._total is not None:
+            headers["X-Total-Count"] = str(self._total)
+            headers["X-Total-Count-Exact"] = str(self._total_exact).lower()
+        return headers
+
+
+class FieldsParams(BaseModel):
+    fields: Annotated[
+        Optional[str],
+        Query(
+            default=None,
+            description="Вернуть только эти поля, через запятую: fields=id,name",
+        ),
+    ] = None
+
+    @property
+    def columns(self) -> Optional[Tuple[str, ...]]:
+        if not self.fields:
+            return None
+        names = (name.strip() for name in self.fields.split(","))
+        return tuple(dict.fromkeys(name for name in names if name)) or None
+
+
+class BulkSelector(BaseModel):
+    """
+    Выбор записей для bulk PATCH / DELETE: список id и/или фильтры.
+    Поле filters объявляют наследники со схемой фильтра своей модели
+    """
+
+    ids: Annotated[
+        Optional[List[UUID]],
+        Field(default=None, min_length=1, max_length=settings.BULK_MAX_ITEMS),
+    ] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        filters = getattr(self, "filters", None)
+        has_filters = filters is not None and filters.model_dump(exclude_none=True)
+        if not self.ids and not has_filters:
+            raise ValueError("Нужен список ids или хотя бы один фильтр")
+        return self
+
+
+class BulkOutcome(BaseModel):
+    id: UUID
+    status: Literal["updated", "deleted", "not_found", "forbidden"]
+
+
+class BulkResult(BaseModel):
+    affected: int
+    results: List[BulkOutcome]
+
+
+# pylint: disable-next=invalid-name
+ItemType = TypeVar("ItemType")
+
+
+class BulkCreateOutcome(BaseModel, Generic[ItemType]):
+    """Итог по элементу bulk-создания; index - позиция в теле запроса"""
+
+    index: int
+    status: Literal["created", "upserted", "failed"]
+    data: Optional[ItemType] = None
+    error: Optional[str] = None
+
+
+class BulkCreateResult(BaseModel, Generic[ItemType]):
+    affected: int
+    results: List[BulkCreateOutcome[ItemType]]
@@ -1,7 +1,8 @@
-from typing import Optional, Annotated
+from typing import List, Optional, Annotated
 from datetime import datetime
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+from app.schemas.base import BulkSelector, list_query_params
 
 
 class SchemaOrderBase(BaseModel):
@@ -20,6 +21,7 @@ class SchemaOrderCreate(BaseModel):
     is_paid: bool = False
 
 
+@list_query_params
 class SchemaOrderFilter(BaseModel):
     id: Optional[UUID] = None
     user_id: Optional[UUID] = None
@@ -28,8 +30,29 @@ class SchemaOrderFilter(BaseModel):
     is_paid: Optional[bool] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    # операторы, разрешены в OrderDAO.filter_operators
+    id__in: Optional[List[UUID]] = None
+    product_id__in: Optional[List[UUID]] = None
+    created_at__gte: Optional[datetime] = None
+    created_at__lt: Optional[datetime] = None
 
 
 class SchemaOrderPatch(BaseModel):
     quantity: Optional[int] = None
     is_paid: Optional[bool] = None
+
+
+class SchemaOrderBulkDelete(BulkSelector):
+    filters: Optional[SchemaOrderFilter] = None
+
+
+class SchemaOrderBulkPatch(SchemaOrderBulkDelete):
+    data: SchemaOrderPatch
+
+    @field_validator("data")
+    @classmethod
+    def check_data_not_empty(cls, data: SchemaOrderPatch) -> SchemaOrderPatch:
+        # пустой data дал бы UPDATE ... SET без колонок
+        if not data.model_dump(exclude_unset=True):
+            raise ValueError("Нужно хотя бы одно поле для обновления")
+        return data
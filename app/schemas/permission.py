@@ -22,6 +22,31 @@ class SchemaPermissionBase(BaseModel):
                 permissions.append(field_name)
         return permissions
 
+    def to_bitmap(self) -> int:
+        """Упаковывает разрешения в битовую маску (бит = порядковый номер поля)"""
+        bitmap = 0
+        for bit, (field_name, value) in enumerate(self.model_dump().items()):
+            if value is True:
+                bitmap |= 1 << bit
+        return bitmap
+
+    @classmethod
+    def from_bitmap(cls, bitmap: int) -> "SchemaPermissionBase":
+        return cls(
+            **{
+                field_name: bool(bitmap & (1 << bit))
+                for bit, field_name in enumerate(cls.model_fields)
+            }
+        )
+
+
+class SchemaUserAuth(BaseModel):
+    """Результат проверки пользователя для авторизации запроса"""
+
+    user_id: UUID
+    is_active: bool
+    permissions: List[str]
+
 
 class AccessContext(BaseModel):
     user_id: UUID
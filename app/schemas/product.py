@@ -1,7 +1,8 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 from pydantic import BaseModel
+from app.schemas.base import list_query_params
 
 
 class SchemaProductBase(BaseModel):
@@ -19,12 +20,21 @@ class SchemaProductCreate(BaseModel):
     price: int
 
 
+@list_query_params
 class SchemaProductFilter(BaseModel):
     category_id: Optional[UUID] = None
     name: Optional[str] = None
     price: Optional[int] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    # операторы, разрешены в ProductDAO.filter_operators
+    id__in: Optional[List[UUID]] = None
+    category_id__in: Optional[List[UUID]] = None
+    name__startswith: Optional[str] = None
+    price__gte: Optional[int] = None
+    price__lte: Optional[int] = None
+    created_at__gte: Optional[datetime] = None
+    created_at__lt: Optional[datetime] = None
 
 
 class SchemaProductPatch(BaseModel):
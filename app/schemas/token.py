@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List, Optional
 from uuid import UUID
 from pydantic import BaseModel
 
@@ -18,6 +18,10 @@ class AccessToken(BaseModel):
     role: List[str]
     exp: int
     iat: int
+    perm: Optional[Dict[str, int]] = (
+        None  # битовые маски разрешений по бизнес-элементам
+    )
+    pv: Optional[int] = None  # версия прав на момент выпуска токена
 
 
 class RefreshToken(BaseModel):
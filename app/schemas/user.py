@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Annotated, Optional
+from typing import Annotated, List, Optional
 from uuid import UUID
 import structlog
 from pydantic import (
@@ -116,3 +116,12 @@ class UserInDB(BaseModel):
 
 class UserHashPassword(BaseModel):
     password: str
+
+
+class UserLoginContext(BaseModel):
+    """Всё, что нужно для логина: выбирается одним запросом по email"""
+
+    id: UUID
+    is_active: bool
+    password: str
+    roles: List[str]
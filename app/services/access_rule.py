@@ -1,6 +1,15 @@
+from typing import Optional
 from uuid import UUID
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.permission_cache import (
+    get_cached_permission_version,
+    set_cached_permission_version,
+    invalidate_all_permissions,
+    invalidate_user_permissions,
+    invalidate_permission_version,
+)
 from app.crud.access_rule import AccessRuleDAO
 from app.schemas.base import PaginationParams
 from app.schemas.access_rule import SchemaAccessRuleFilter, SchemaAccessRulePatch
@@ -11,6 +20,39 @@ from app.exceptions.base import PermissionDenied
 logger = structlog.get_logger()
 
 
+async def get_permission_version(session: AsyncSession) -> int:
+    version = get_cached_permission_version()
+    if version is None:
+        version = await AccessRuleDAO.get_permission_version(session=session)
+        set_cached_permission_version(version)
+    return version
+
+
+async def invalidate_permissions(
+    session: AsyncSession, user_id: Optional[UUID] = None
+) -> None:
+    """
+    Сбрасывает кеш авторизации (пользователя или целиком) и,
+    если права вшиваются в токен, поднимает версию прав.
+    Сначала фиксируем изменения: иначе параллельный запрос между сбросом
+    и коммитом прочитает старые права и снова положит их в кеш на весь TTL,
+    а токен, выпущенный между поднятием версии и коммитом, получит новую
+    версию со старыми правами
+    """
+    if session.in_transaction():
+        await session.commit()
+
+    if user_id is None:
+        invalidate_all_permissions()
+    else:
+        invalidate_user_permissions(user_id=user_id)
+
+    if settings.AUTH_PERMISSIONS_IN_TOKEN:
+        version = await AccessRuleDAO.bump_permission_version(session=session)
+        invalidate_permission_version()
+        logger.info("Permission version bumped", data=version)
+
+
 async def find_many_access_rule(
     access: AccessContext,
     filters: SchemaAccessRuleFilter,
@@ -39,13 +81,17 @@ async def update_one_access_rule(
 ):
     filters_dict = data.model_dump(exclude_unset=True)
     if "update_all_permission" in access.permissions:
-        return await AccessRuleDAO.update_one(
+        access_rule = await AccessRuleDAO.update_one(
             model_id=access_rule_id, session=session, values=filters_dict
         )
+        await invalidate_permissions(session=session)
+        return access_rule
     if "update_permission" in access.permissions:
-        return await AccessRuleDAO.update_one(
+        access_rule = await AccessRuleDAO.update_one(
             model_id=access_rule_id, session=session, values=filters_dict
         )
+        await invalidate_permissions(session=session)
+        return access_rule
     logger.error("PermissionDenied")
     raise PermissionDenied(
         custom_detail="Missing update or update_all permission on access_rule"
@@ -6,7 +6,8 @@ from pydantic import ValidationError
 from app.core.config import settings
 from app.core.security import verify_password, get_password_hash
 from app.exceptions.base import BlacklistedError, TokenExpiredError, BadCredentialsError
-from app.core.blacklist import token_blacklist
+from app.core.blacklist import token_blacklist, token_expires_at
+from app.core.token_cache import get_cached_token, invalidate_token, set_cached_token
 from app.schemas.token import AccessToken, RefreshToken
 
 
@@ -19,8 +20,8 @@ class AuthService:
         return await verify_password(plain_password, hashed_password)
 
     @staticmethod
-    def get_password_hash(password: str) -> str:
-        return get_password_hash(password)
+    async def get_password_hash(password: str) -> str:
+        return await get_password_hash(password)
 
     @staticmethod
     def create_access_token(data: dict) -> str:
@@ -35,19 +36,25 @@ class AuthService:
         return encoded_jwt
 
     @staticmethod
-    def decode_access_token(token: str) -> AccessToken:
+    async def decode_access_token(token: str) -> AccessToken:
         if not token:
             logger.error("Not authenticated", error="Has no token")
             raise BadCredentialsError
         try:
-            if token in token_blacklist:
+            if await token_blacklist.is_revoked(token):
                 logger.error("BlacklistedError")
                 raise BlacklistedError
+            # токен уже проверялся в этом воркере - подпись и модель не пересчитываем
+            cached = get_cached_token(token)
+            if cached is not None:
+                return cached
             payload = jwt.decode(
                 token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
             )
             user_id = UUID(payload.get("sub"))
-            return AccessToken(**payload)
+            access_token = AccessToken(**payload)
+            set_cached_token(token, access_token)
+            return access_token
         except jwt.PyJWTError as exc:
             logger.error("jwt.PyJWTError", error=str(exc), data=token)
             raise TokenExpiredError from exc
@@ -58,9 +65,21 @@ class AuthService:
             raise BadCredentialsError from e
 
     @staticmethod
-    def ban_token(token: str):
-        """Добавить токен в чёрный список"""
-        token_blacklist[token] = True
+    async def ban_token(token: str):
+        """Добавить токен в чёрный список до истечения его срока"""
+        try:
+            payload = jwt.decode(
+                token,
+                settings.SECRET_KEY,
+                algorithms=[settings.ALGORITHM],
+                options={"verify_exp": False},
+            )
+        except jwt.PyJWTError as exc:
+            # токен с чужой подписью и так не пройдёт проверку, хранить его незачем
+            logger.error("jwt.PyJWTError on ban", error=str(exc))
+            return
+        await token_blacklist.ban(token, expires_at=token_expires_at(payload))
+        invalidate_token(token)
 
     @staticmethod
     def create_refresh_token(data: dict) -> str:
@@ -75,9 +94,9 @@ class AuthService:
         return encoded_jwt
 
     @staticmethod
-    def decode_refresh_token(token: str) -> RefreshToken:
+    async def decode_refresh_token(token: str) -> RefreshToken:
         try:
-            if token in token_blacklist:
+            if await token_blacklist.is_revoked(token):
                 logger.error("BlacklistedError")
                 raise BlacklistedError
             payload = jwt.decode(
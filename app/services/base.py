@@ -1,4 +1,13 @@
-from typing import Any, Awaitable, Callable
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 from uuid import UUID
 import structlog
 from pydantic import BaseModel
@@ -19,17 +28,18 @@ async def find_many_business_element(
     filters: BaseModel,
     session: AsyncSession,
     pagination: PaginationParams,
+    fields: Optional[Tuple[str, ...]] = None,
 ):
     if "read_all_permission" in access.permissions:
         logger.info("read_all_permission", filters=filters, pagination=pagination)
         return await methodDAO.find_many(
-            filters=filters, session=session, pagination=pagination
+            filters=filters, session=session, pagination=pagination, fields=fields
         )
 
     if "read_permission" in access.permissions:
         logger.info("read_permission", filters=filters, pagination=pagination)
         return await methodDAO.find_many(
-            filters=filters, session=session, pagination=pagination
+            filters=filters, session=session, pagination=pagination, fields=fields
         )
 
     custom_detail = f"Missing read or read_all permission on {business_element.value}"
@@ -37,6 +47,27 @@ async def find_many_business_element(
     raise PermissionDenied(custom_detail=custom_detail)
 
 
+async def stream_many_business_element(
+    business_element: BusinessDomain,
+    methodDAO: Callable[..., Awaitable[Any]],
+    access: AccessContext,
+    filters: BaseModel,
+    session: AsyncSession,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    if "read_all_permission" in access.permissions:
+        logger.info("read_all_permission", filters=filters)
+        return methodDAO.stream_many(session=session, filters=filters, fields=fields)
+
+    if "read_permission" in access.permissions:
+        logger.info("read_permission", filters=filters)
+        return methodDAO.stream_many(session=session, filters=filters, fields=fields)
+
+    custom_detail = f"Missing read or read_all permission on {business_element.value}"
+    logger.error("PermissionDenied", error=custom_detail)
+    raise PermissionDenied(custom_detail=custom_detail)
+
+
 async def add_one_business_element(
     business_element: BusinessDomain,
     methodDAO: Callable[..., Awaitable[Any]],
@@ -53,6 +84,45 @@ async def add_one_business_element(
     raise PermissionDenied(custom_detail=custom_detail)
 
 
+async def add_many_business_element(
+    business_element: BusinessDomain,
+    methodDAO: Callable[..., Awaitable[Any]],
+    access: AccessContext,
+    data: List[BaseModel],
+    session: AsyncSession,
+):
+    if "create_permission" in access.permissions:
+        values = [item.model_dump() for item in data]
+        return await methodDAO.add_many_with_outcomes(session=session, values=values)
+
+    custom_detail = f"Missing create permission on {business_element.value}"
+    logger.error("PermissionDenied", error=custom_detail)
+    raise PermissionDenied(custom_detail=custom_detail)
+
+
+async def upsert_many_business_element(
+    business_element: BusinessDomain,
+    methodDAO: Callable[..., Awaitable[Any]],
+    access: AccessContext,
+    data: List[BaseModel],
+    session: AsyncSession,
+):
+    # upsert и создаёт, и перезаписывает существующие объекты
+    can_update = (
+        "update_permission" in access.permissions
+        or "update_all_permission" in access.permissions
+    )
+    if "create_permission" in access.permissions and can_update:
+        values = [item.model_dump() for item in data]
+        return await methodDAO.add_many_with_outcomes(
+            session=session, values=values, upsert=True
+        )
+
+    custom_detail = f"Missing create and update permissions on {business_element.value}"
+    logger.error("PermissionDenied", error=custom_detail)
+    raise PermissionDenied(custom_detail=custom_detail)
+
+
 async def update_one_business_element(
     business_element: BusinessDomain,
     methodDAO: Callable[..., Awaitable[Any]],
@@ -1,4 +1,13 @@
-from typing import Any, Awaitable, Callable
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 from uuid import UUID
 import structlog
 from pydantic import BaseModel
@@ -18,6 +27,7 @@ async def find_one_scoped_by_id(
     access: AccessContext,
     session: AsyncSession,
     business_element_id: UUID,
+    owner_field: str = "user_id",
 ):
     custom_detail = f"Missing read or read_all permission on {business_element.value}"
 
@@ -28,16 +38,15 @@ async def find_one_scoped_by_id(
         )
 
     if "read_permission" in access.permissions:
+        # владелец проверяется в WHERE: один SELECT вместо выборки и сравнения
         logger.info("read_permission", model_id=business_element_id)
-        obj = await methodDAO.find_one_by_id(
-            model_id=business_element_id, session=session
+        return await methodDAO.find_one_by_id(
+            model_id=business_element_id,
+            session=session,
+            owner_field=owner_field,
+            owner_id=access.user_id,
         )
 
-        if obj.user_id != access.user_id:
-            logger.error("PermissionDenied on read_permission", error=custom_detail)
-            raise PermissionDenied(custom_detail=custom_detail)
-        return obj
-
     logger.error("PermissionDenied", error=custom_detail)
     raise PermissionDenied(custom_detail=custom_detail)
 
@@ -50,36 +59,70 @@ async def find_many_scoped(
     session: AsyncSession,
     pagination: PaginationParams,
     owner_field: str,
+    fields: Optional[Tuple[str, ...]] = None,
 ):
     custom_detail = f"Missing read or read_all permission on {business_element.value}"
 
     if "read_all_permission" in access.permissions:
         logger.info("read_all_permission", filters=filters, pagination=pagination)
         return await methodDAO.find_many(
-            filters=filters, session=session, pagination=pagination
+            filters=filters, session=session, pagination=pagination, fields=fields
         )
 
     if "read_permission" in access.permissions:
         logger.info("read_permission", filters=filters, pagination=pagination)
-        # Получаем текущее значение поля владельца из фильтров
-        current_owner_value = getattr(filters, owner_field, None)
+        _scope_filters_to_owner(filters, owner_field, access, custom_detail)
+        return await methodDAO.find_many(
+            filters=filters, session=session, pagination=pagination, fields=fields
+        )
 
-        # Если в фильтре указан владелец, и он не совпадает с текущим пользователем - ошибка
-        if current_owner_value is not None and current_owner_value != access.user_id:
-            logger.error("PermissionDenied on read_permission", error=custom_detail)
-            raise PermissionDenied(custom_detail=custom_detail)
+    logger.error("PermissionDenied", error=custom_detail)
+    raise PermissionDenied(custom_detail=custom_detail)
 
-        # Устанавливаем фильтр на текущего пользователя
-        setattr(filters, owner_field, access.user_id)
 
-        return await methodDAO.find_many(
-            filters=filters, session=session, pagination=pagination
-        )
+async def stream_many_scoped(
+    business_element: BusinessDomain,
+    methodDAO: Callable[..., Awaitable[Any]],
+    access: AccessContext,
+    filters: BaseModel,
+    session: AsyncSession,
+    owner_field: str,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Права проверяются здесь, до начала ответа: отказ уходит обычным 403,
+    а не обрывом уже начатого потока
+    """
+    custom_detail = f"Missing read or read_all permission on {business_element.value}"
+
+    if "read_all_permission" in access.permissions:
+        logger.info("read_all_permission", filters=filters)
+        return methodDAO.stream_many(session=session, filters=filters, fields=fields)
+
+    if "read_permission" in access.permissions:
+        logger.info("read_permission", filters=filters)
+        _scope_filters_to_owner(filters, owner_field, access, custom_detail)
+        return methodDAO.stream_many(session=session, filters=filters, fields=fields)
 
     logger.error("PermissionDenied", error=custom_detail)
     raise PermissionDenied(custom_detail=custom_detail)
 
 
+def _scope_filters_to_owner(
+    filters: BaseModel, owner_field: str, access: AccessContext, custom_detail: str
+):
+    # Получаем текущее значение поля владельца из фильтров
+    current_owner_value = getattr(filters, owner_field, None)
+
+    # Если в фильтре указан владелец, и он не совпадает с текущим пользователем - ошибка
+    if current_owner_value is not None and current_owner_value != access.user_id:
+        logger.error("PermissionDenied on read_permission", error=custom_detail)
+        raise PermissionDenied(custom_detail=custom_detail)
+
+    # Устанавливаем фильтр на текущего пользователя
+    setattr(filters, owner_field, access.user_id)
+
+
 async def add_one_scoped(
     business_element: BusinessDomain,
     methodDAO: Callable[..., Awaitable[Any]],
@@ -98,6 +141,23 @@ async def add_one_scoped(
     raise PermissionDenied(custom_detail=custom_detail)
 
 
+async def add_many_scoped(
+    business_element: BusinessDomain,
+    methodDAO: Callable[..., Awaitable[Any]],
+    access: AccessContext,
+    data: List[BaseModel],
+    session: AsyncSession,
+):
+    if "create_permission" in access.permissions:
+        logger.info("create_permission", data=len(data))
+        values = [{**item.model_dump(), "user_id": access.user_id} for item in data]
+        return await methodDAO.add_many_with_outcomes(session=session, values=values)
+
+    custom_detail = f"Missing create permission on {business_element.value}"
+    logger.error("PermissionDenied", error=custom_detail)
+    raise PermissionDenied(custom_detail=custom_detail)
+
+
 async def update_one_scoped(
     business_element: BusinessDomain,
     methodDAO: Callable[..., Awaitable[Any]],
@@ -105,6 +165,7 @@ async def update_one_scoped(
     data: BaseModel,
     session: AsyncSession,
     business_element_id: UUID,
+    owner_field: str = "user_id",
 ):
     custom_detail = (
         f"Missing update or update_all permission on {business_element.value}"
@@ -118,18 +179,15 @@ async def update_one_scoped(
         )
 
     if "update_permission" in access.permissions:
-        obj = await methodDAO.find_one_by_id(
-            session=session, model_id=business_element_id
+        logger.info("update_permission")
+        return await methodDAO.update_one(
+            model_id=business_element_id,
+            session=session,
+            values=filters_dict,
+            owner_field=owner_field,
+            owner_id=access.user_id,
         )
 
-        if access.user_id == obj.user_id:
-            logger.info("update_permission")
-            return await methodDAO.update_one(
-                model_id=business_element_id, session=session, values=filters_dict
-            )
-        logger.error("PermissionDenied", error=custom_detail)
-        raise PermissionDenied(custom_detail=custom_detail)
-
     logger.error("PermissionDenied", error=custom_detail)
     raise PermissionDenied(custom_detail=custom_detail)
 
@@ -140,6 +198,7 @@ async def delete_one_scoped(
     access: AccessContext,
     session: AsyncSession,
     business_element_id: UUID,
+    owner_field: str = "user_id",
 ):
     custom_detail = (
         f"Missing delete or delete_all permission on {business_element.value}"
@@ -151,17 +210,80 @@ async def delete_one_scoped(
         )
 
     if "delete_permission" in access.permissions:
-        obj = await methodDAO.find_one_by_id(
-            session=session, model_id=business_element_id
+        logger.info("delete_permission")
+        return await methodDAO.delete_one_by_id(
+            model_id=business_element_id,
+            session=session,
+            owner_field=owner_field,
+            owner_id=access.user_id,
         )
 
-        if access.user_id == obj.user_id:
-            logger.info("delete_permission")
-            return await methodDAO.delete_one_by_id(
-                model_id=business_element_id, session=session
-            )
-        logger.error("PermissionDenied", error=custom_detail)
-        raise PermissionDenied(custom_detail=custom_detail)
+    logger.error("PermissionDenied", error=custom_detail)
+    raise PermissionDenied(custom_detail=custom_detail)
+
+
+async def update_many_scoped(
+    business_element: BusinessDomain,
+    methodDAO: Callable[..., Awaitable[Any]],
+    access: AccessContext,
+    data: BaseModel,
+    session: AsyncSession,
+    ids: Optional[List[UUID]],
+    filters: Optional[BaseModel],
+    owner_field: str,
+):
+    custom_detail = (
+        f"Missing update or update_all permission on {business_element.value}"
+    )
+    values = data.model_dump(exclude_unset=True)
+
+    if "update_all_permission" in access.permissions:
+        logger.info("update_all_permission", filters=filters, data=len(ids or []))
+        return await methodDAO.update_many(
+            session=session, values=values, ids=ids, filters=filters
+        )
+
+    if "update_permission" in access.permissions:
+        # владелец проверяется в WHERE того же UPDATE
+        logger.info("update_permission", filters=filters, data=len(ids or []))
+        return await methodDAO.update_many(
+            session=session,
+            values=values,
+            ids=ids,
+            filters=filters,
+            owner_field=owner_field,
+            owner_id=access.user_id,
+        )
+
+    logger.error("PermissionDenied", error=custom_detail)
+    raise PermissionDenied(custom_detail=custom_detail)
+
+
+async def delete_many_scoped(
+    business_element: BusinessDomain,
+    methodDAO: Callable[..., Awaitable[Any]],
+    access: AccessContext,
+    session: AsyncSession,
+    ids: Optional[List[UUID]],
+    filters: Optional[BaseModel],
+    owner_field: str,
+):
+    custom_detail = (
+        f"Missing delete or delete_all permission on {business_element.value}"
+    )
+    if "delete_all_permission" in access.permissions:
+        logger.info("delete_all_permission", filters=filters, data=len(ids or []))
+        return await methodDAO.delete_many(session=session, ids=ids, filters=filters)
+
+    if "delete_permission" in access.permissions:
+        logger.info("delete_permission", filters=filters, data=len(ids or []))
+        return await methodDAO.delete_many(
+            session=session,
+            ids=ids,
+            filters=filters,
+            owner_field=owner_field,
+            owner_id=access.user_id,
+        )
 
     logger.error("PermissionDenied", error=custom_detail)
     raise PermissionDenied(custom_detail=custom_detail)
@@ -1,3 +1,4 @@
+from typing import List, Optional, Tuple
 from uuid import UUID
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,6 +14,8 @@ from app.schemas.permission import AccessContext
 from app.services.base import (
     find_many_business_element,
     add_one_business_element,
+    add_many_business_element,
+    upsert_many_business_element,
     update_one_business_element,
     delete_one_business_element,
 )
@@ -27,6 +30,7 @@ async def find_many_category(
     filters: SchemaCategoryFilter,
     session: AsyncSession,
     pagination: PaginationParams,
+    fields: Optional[Tuple[str, ...]] = None,
 ):
     return await find_many_business_element(
         business_element=business_element,
@@ -35,6 +39,7 @@ async def find_many_category(
         filters=filters,
         session=session,
         pagination=pagination,
+        fields=fields,
     )
 
 
@@ -53,6 +58,36 @@ async def add_one_category(
     )
 
 
+async def add_many_category(
+    business_element: BusinessDomain,
+    access: AccessContext,
+    data: List[SchemaCategoryCreate],
+    session: AsyncSession,
+):
+    return await add_many_business_element(
+        business_element=business_element,
+        methodDAO=CategoryDAO,
+        access=access,
+        data=data,
+        session=session,
+    )
+
+
+async def upsert_many_category(
+    business_element: BusinessDomain,
+    access: AccessContext,
+    data: List[SchemaCategoryCreate],
+    session: AsyncSession,
+):
+    return await upsert_many_business_element(
+        business_element=business_element,
+        methodDAO=CategoryDAO,
+        access=access,
+        data=data,
+        session=session,
+    )
+
+
 async def update_one_category(
     business_element: BusinessDomain,
     access: AccessContext,
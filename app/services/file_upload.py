@@ -1,5 +1,6 @@
 import os
 import shutil
+from typing import Optional, Tuple
 from uuid import UUID
 import structlog
 from fastapi import UploadFile
@@ -17,7 +18,6 @@ from app.schemas.permission import AccessContext
 from app.services.base import (
     find_many_business_element,
     add_one_business_element,
-    delete_one_business_element,
 )
 from app.services.base_scoped_operations import (
     find_one_scoped_by_id,
@@ -61,6 +61,7 @@ async def find_many_file_upload(
     filters: SchemaFileUploadFilter,
     session: AsyncSession,
     pagination: PaginationParams,
+    fields: Optional[Tuple[str, ...]] = None,
 ):
     return await find_many_business_element(
         business_element=business_element,
@@ -69,6 +70,7 @@ async def find_many_file_upload(
         filters=filters,
         session=session,
         pagination=pagination,
+        fields=fields,
     )
 
 
@@ -104,7 +106,7 @@ async def delete_one_file_upload(
     session: AsyncSession,
     file_upload_id: UUID,
 ):
-    return await delete_one_business_element(
+    return await delete_one_scoped(
         business_element=business_element,
         methodDAO=FileUploadDAO,
         access=access,
@@ -1,16 +1,27 @@
+from typing import List, Optional, Tuple
 from uuid import UUID
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.enums import BusinessDomain
 from app.crud.order import OrderDAO
 from app.schemas.base import PaginationParams
-from app.schemas.order import SchemaOrderCreate, SchemaOrderFilter, SchemaOrderPatch
+from app.schemas.order import (
+    SchemaOrderBulkDelete,
+    SchemaOrderBulkPatch,
+    SchemaOrderCreate,
+    SchemaOrderFilter,
+    SchemaOrderPatch,
+)
 from app.schemas.permission import AccessContext
 from app.services.base_scoped_operations import (
     find_many_scoped,
+    stream_many_scoped,
     add_one_scoped,
+    add_many_scoped,
     update_one_scoped,
     delete_one_scoped,
+    update_many_scoped,
+    delete_many_scoped,
 )
 
 
@@ -23,6 +34,7 @@ async def find_many_order(
     filters: SchemaOrderFilter,
     session: AsyncSession,
     pagination: PaginationParams,
+    fields: Optional[Tuple[str, ...]] = None,
 ):
     return await find_many_scoped(
         business_element=business_element,
@@ -31,6 +43,25 @@ async def find_many_order(
         filters=filters,
         session=session,
         pagination=pagination,
+        fields=fields,
+        owner_field="user_id",
+    )
+
+
+async def stream_many_order(
+    business_element: BusinessDomain,
+    access: AccessContext,
+    filters: SchemaOrderFilter,
+    session: AsyncSession,
+    fields: Optional[Tuple[str, ...]] = None,
+):
+    return await stream_many_scoped(
+        business_element=business_element,
+        methodDAO=OrderDAO,
+        access=access,
+        filters=filters,
+        session=session,
+        fields=fields,
         owner_field="user_id",
     )
 
@@ -50,6 +81,21 @@ async def add_one_order(
     )
 
 
+async def add_many_order(
+    business_element: BusinessDomain,
+    access: AccessContext,
+    data: List[SchemaOrderCreate],
+    session: AsyncSession,
+):
+    return await add_many_scoped(
+        business_element=business_element,
+        methodDAO=OrderDAO,
+        access=access,
+        data=data,
+        session=session,
+    )
+
+
 async def update_one_order(
     business_element: BusinessDomain,
     access: AccessContext,
@@ -80,3 +126,38 @@ async def delete_one_order(
         session=session,
         business_element_id=order_id,
     )
+
+
+async def update_many_order(
+    business_element: BusinessDomain,
+    access: AccessContext,
+    data: SchemaOrderBulkPatch,
+    session: AsyncSession,
+):
+    return await update_many_scoped(
+        business_element=business_element,
+        methodDAO=OrderDAO,
+        access=access,
+        data=data.data,
+        session=session,
+        ids=data.ids,
+        filters=data.filters,
+        owner_field="user_id",
+    )
+
+
+async def delete_many_order(
+    business_element: BusinessDomain,
+    access: AccessContext,
+    data: SchemaOrderBulkDelete,
+    session: AsyncSession,
+):
+    return await delete_many_scoped(
+        business_element=business_element,
+        methodDAO=OrderDAO,
+        access=access,
+        session=session,
+        ids=data.ids,
+        filters=data.filters,
+        owner_field="user_id",
+    )
@@ -1,3 +1,4 @@
+from typing import List, Optional, Tuple
 from uuid import UUID
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,7 +13,10 @@ from app.schemas.product import (
 from app.schemas.permission import AccessContext
 from app.services.base import (
     find_many_business_element,
+    stream_many_business_element,
     add_one_business_element,
+    add_many_business_element,
+    upsert_many_business_element,
     update_one_business_element,
     delete_one_business_element,
 )
@@ -27,6 +31,7 @@ async def find_many_product(
     filters: SchemaProductFilter,
     session: AsyncSession,
     pagination: PaginationParams,
+    fields: Optional[Tuple[str, ...]] = None,
 ):
     return await find_many_business_element(
         business_element=business_element,
@@ -35,6 +40,24 @@ async def find_many_product(
         filters=filters,
         session=session,
         pagination=pagination,
+        fields=fields,
+    )
+
+
+async def stream_many_product(
+    business_element: BusinessDomain,
+    access: AccessContext,
+    filters: SchemaProductFilter,
+    session: AsyncSession,
+    fields: Optional[Tuple[str, ...]] = None,
+):
+    return await stream_many_business_element(
+        business_element=business_element,
+        methodDAO=ProductDAO,
+        access=access,
+        filters=filters,
+        session=session,
+        fields=fields,
     )
 
 
@@ -53,6 +76,36 @@ async def add_one_product(
     )
 
 
+async def add_many_product(
+    business_element: BusinessDomain,
+    access: AccessContext,
+    data: List[SchemaProductCreate],
+    session: AsyncSession,
+):
+    return await add_many_business_element(
+        business_element=business_element,
+        methodDAO=ProductDAO,
+        access=access,
+        data=data,
+        session=session,
+    )
+
+
+async def upsert_many_product(
+    business_element: BusinessDomain,
+    access: AccessContext,
+    data: List[SchemaProductCreate],
+    session: AsyncSession,
+):
+    return await upsert_many_business_element(
+        business_element=business_element,
+        methodDAO=ProductDAO,
+        access=access,
+        data=data,
+        session=session,
+    )
+
+
 async def update_one_product(
     business_element: BusinessDomain,
     access: AccessContext,
@@ -1,11 +1,13 @@
-from typing import Optional, List
+from typing import List, Optional, Tuple
 from uuid import UUID, uuid4
 import structlog
 from fastapi import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.core.enums import BusinessDomain
+from app.core.permission_cache import get_cached_permissions, set_cached_permissions
 from app.core.security import get_password_hash
+from app.crud.access_rule import AccessRuleDAO
 from app.crud.role import RoleDAO
 from app.models import User
 from app.crud.user import UserDAO, UserPasswordDAO
@@ -13,11 +15,12 @@ from app.schemas.base import PaginationParams
 from app.schemas.role import SchemaRoleFilter
 from app.schemas.permission import (
     AccessContext,
+    SchemaPermissionBase,
     SchemaUserRolesBase,
     SchemaUserRolesCreate,
     SchemaUserRolesFilter,
 )
-from app.schemas.token import Token
+from app.schemas.token import AccessToken, Token
 from app.schemas.user import (
     SchemaUserCreate,
     SchemaUserPatch,
@@ -27,14 +30,16 @@ from app.schemas.user import (
     SchemaUserLoginMain,
     UserHashPassword,
 )
+from app.services.access_rule import get_permission_version, invalidate_permissions
 from app.services.auth_service import AuthService
-from app.services.base_scoped_operations import find_many_scoped
+from app.services.base_scoped_operations import find_many_scoped, stream_many_scoped
 from app.exceptions.base import (
     BadCredentialsError,
     EmailAlreadyRegisteredError,
     UserInactiveError,
     PasswordMismatchError,
     PermissionDenied,
+    TokenExpiredError,
 )
 
 
@@ -47,6 +52,7 @@ async def find_many_user(
     filters: SchemaUserFilter,
     session: AsyncSession,
     pagination: PaginationParams,
+    fields: Optional[Tuple[str, ...]] = None,
 ) -> Optional[User]:
     return await find_many_scoped(
         business_element=business_element,
@@ -55,6 +61,25 @@ async def find_many_user(
         filters=filters,
         session=session,
         pagination=pagination,
+        fields=fields,
+        owner_field="id",
+    )
+
+
+async def stream_many_user(
+    business_element: BusinessDomain,
+    access: AccessContext,
+    filters: SchemaUserFilter,
+    session: AsyncSession,
+    fields: Optional[Tuple[str, ...]] = None,
+):
+    return await stream_many_scoped(
+        business_element=business_element,
+        methodDAO=UserDAO,
+        access=access,
+        filters=filters,
+        session=session,
+        fields=fields,
         owner_field="id",
     )
 
@@ -94,7 +119,7 @@ async def update_user(
     filters_dict = filters.model_dump(exclude_unset=True)
     password = filters_dict.get("password")
     if password is not None:
-        password_hash = get_password_hash(password)
+        password_hash = await get_password_hash(password)
         filters_dict["password"] = password_hash
 
     if "update_all_permission" in access.permissions:
@@ -115,9 +140,11 @@ async def soft_delete_user(user_id: UUID, access: AccessContext, session: AsyncS
     filters_dict = {"id": user_id, "is_active": False}
     if "delete_all_permission" in access.permissions:
         await UserDAO.update_one(model_id=user_id, session=session, values=filters_dict)
+        await invalidate_permissions(session=session, user_id=user_id)
         return
     if "delete_permission" in access.permissions and user_id == access.user_id:
         await UserDAO.update_one(model_id=user_id, session=session, values=filters_dict)
+        await invalidate_permissions(session=session, user_id=user_id)
         return
     logger.error("PermissionDenied")
     raise PermissionDenied(
@@ -138,7 +165,7 @@ async def create_user(user_in: SchemaUserCreate, session: AsyncSession):
         raise EmailAlreadyRegisteredError
     if user_in.password == user_in.password_confirm:
         values_dict = user_in.model_dump(exclude_unset=True)
-        password_hash = get_password_hash(user_in.password)
+        password_hash = await get_password_hash(user_in.password)
         values_dict["password"] = password_hash
         values_dict.pop("password_confirm")
     else:
@@ -150,8 +177,11 @@ async def create_user(user_in: SchemaUserCreate, session: AsyncSession):
     role_user = await RoleDAO.find_one(
         session=session, filters=SchemaRoleFilter(name="user")
     )
-    data = SchemaUserRolesCreate(user_id=user.id, role_id=role_user.id)
-    await add_role_to_user(data=data, access=access, session=session)
+    # напрямую через DAO: у нового пользователя ещё нет токенов и записей в кеше,
+    # поднимать версию прав (и отзывать чужие токены) незачем
+    await UserDAO.add_role_to_user(
+        session=session, user_id=user.id, role_id=role_user.id
+    )
 
     return user
 
@@ -171,6 +201,74 @@ async def get_user_roles(user_id: UUID, session: AsyncSession) -> List[str]:
     return [role.name for role in user.roles]
 
 
+async def resolve_user_access(
+    user_id: UUID, business_element: Optional[str], session: AsyncSession
+) -> AccessContext:
+    """
+    Активность и разрешения одним запросом. Из кеша берутся только
+    разрешения, is_active при попадании перечитывается отдельным запросом
+    """
+    permissions = get_cached_permissions(
+        user_id=user_id, business_element=business_element
+    )
+    if permissions is not None:
+        is_active = await UserDAO.get_is_active(user_id=user_id, session=session)
+    else:
+        user_auth = await UserDAO.get_auth_context(
+            user_id=user_id,
+            business_element_name=business_element,
+            session=session,
+        )
+        is_active = user_auth.is_active if user_auth is not None else None
+        if is_active:
+            permissions = user_auth.permissions
+            set_cached_permissions(
+                user_id=user_id,
+                business_element=business_element,
+                permissions=permissions,
+            )
+    if is_active is None:
+        logger.error("BadCredentialsError", error="в БД отсутствует user_id")
+        raise BadCredentialsError
+    if not is_active:
+        logger.error("UserInactiveError", error="пользователь отключён")
+        raise UserInactiveError
+    return AccessContext(user_id=user_id, permissions=permissions)
+
+
+async def get_access_from_claims(
+    payload: AccessToken, business_element: Optional[str], session: AsyncSession
+) -> AccessContext:
+    """Разрешения из permission claims токена, без похода в БД за правами"""
+    version = await get_permission_version(session=session)
+    if payload.pv != version:
+        logger.error(
+            "TokenExpiredError",
+            error="Permission version changed",
+            user_id=payload.sub,
+        )
+        raise TokenExpiredError(custom_detail="Permissions have changed")
+    element_name = getattr(business_element, "value", business_element)
+    bitmap = payload.perm.get(element_name, 0)
+    permissions = SchemaPermissionBase.from_bitmap(bitmap).to_permission_list()
+    return AccessContext(user_id=payload.sub, permissions=permissions)
+
+
+async def get_access_token_claims(
+    user_id: UUID, session: AsyncSession, role_names: Optional[List[str]] = None
+) -> dict:
+    if role_names is None:
+        role_names = await get_user_roles(user_id=user_id, session=session)
+    claims = {"sub": str(user_id), "role": role_names}
+    if settings.AUTH_PERMISSIONS_IN_TOKEN:
+        # версия читается до прав: при гонке токен окажется устаревшим, а не наоборот
+        claims["pv"] = await AccessRuleDAO.get_permission_version(session=session)
+        claims["perm"] = await UserDAO.get_permission_bitmaps(
+            user_id=user_id, session=session
+        )
+    return claims
+
+
 async def set_token_in_cookie(response: Response, tokens: Token):
     response.set_cookie(
         key="access_token",
@@ -204,25 +302,25 @@ async def authenticate_user(
     user_in: SchemaUserLoginMain, session: AsyncSession
 ) -> Token:
     login = user_in.email if user_in.username is None else user_in.username
-    fake_uuid = uuid4()
-    access = AccessContext(user_id=fake_uuid, permissions=["read_all_permission"])
-    user = await get_user_by_email(access=access, email=login, session=session)
+    # один запрос вместо поиска по email, отдельного чтения хеша и ролей
+    user = await UserDAO.get_login_context(email=login, session=session)
 
     if not user:
-        logger.error("в БД отсутствует user_id", user_id=user.id)
+        logger.error("BadCredentialsError", error="в БД отсутствует email")
         raise BadCredentialsError
     if not user.is_active:
-        logger.error("пользователь отключён", user_id=user.id)
+        logger.error("UserInactiveError", user_id=user.id)
         raise UserInactiveError
-    hash_password = await get_hash_password(user_id=user.id, session=session)
-    if not await AuthService.verify_password(user_in.password, hash_password):
+    if not await AuthService.verify_password(user_in.password, user.password):
+        logger.error("BadCredentialsError", user_id=user.id)
         raise BadCredentialsError
 
-    role_names = await get_user_roles(user_id=user.id, session=session)
-    access_token = AuthService.create_access_token(
-        data={"sub": str(user.id), "role": role_names}
+    claims = await get_access_token_claims(
+        user_id=user.id, session=session, role_names=user.roles
     )
+    access_token = AuthService.create_access_token(data=claims)
     refresh_token = AuthService.create_refresh_token({"sub": str(user.id)})
+    logger.info("Logined user", user_id=user.id)
 
     return Token(access_token=access_token, refresh_token=refresh_token)
 
@@ -242,7 +340,7 @@ async def authenticate_user_swagger(
 
 
 async def refresh_user_tokens(refresh_token: str, session: AsyncSession) -> Token:
-    payload = AuthService.decode_refresh_token(refresh_token)
+    payload = await AuthService.decode_refresh_token(refresh_token)
     user_id = payload.sub
     if not user_id:
         logger.error("BadCredentialsError")
@@ -259,13 +357,11 @@ async def refresh_user_tokens(refresh_token: str, session: AsyncSession) -> Toke
         logger.error("UserInactiveError")
         raise UserInactiveError
 
-    role_names = await get_user_roles(user_id=user.id, session=session)
-    new_access = AuthService.create_access_token(
-        data={"sub": str(user.id), "role": role_names}
-    )
+    claims = await get_access_token_claims(user_id=user.id, session=session)
+    new_access = AuthService.create_access_token(data=claims)
     new_refresh = AuthService.create_refresh_token({"sub": str(user.id)})
 
-    AuthService.ban_token(refresh_token)
+    await AuthService.ban_token(refresh_token)
 
     return Token(access_token=new_access, refresh_token=new_refresh)
 
@@ -274,9 +370,11 @@ async def add_role_to_user(
     data: SchemaUserRolesCreate, access: AccessContext, session: AsyncSession
 ) -> SchemaUserRolesBase:
     if "create_permission" in access.permissions:
-        return await UserDAO.add_role_to_user(
+        user_role = await UserDAO.add_role_to_user(
             session=session, user_id=data.user_id, role_id=data.role_id
         )
+        await invalidate_permissions(session=session, user_id=data.user_id)
+        return user_role
     logger.error("PermissionDenied")
     raise PermissionDenied(custom_detail="Missing create_permission on user_roles")
 
@@ -285,15 +383,19 @@ async def remove_role_from_user(
     data: SchemaUserRolesCreate, access: AccessContext, session: AsyncSession
 ) -> dict:
     if "delete_all_permission" in access.permissions:
-        return await UserDAO.remove_role_from_user(
+        removed = await UserDAO.remove_role_from_user(
             session=session, user_id=data.user_id, role_id=data.role_id
         )
+        await invalidate_permissions(session=session, user_id=data.user_id)
+        return removed
 
     if "delete_permission" in access.permissions:
         if access.user_id == data.user_id:
-            return await UserDAO.remove_role_from_user(
+            removed = await UserDAO.remove_role_from_user(
                 session=session, user_id=data.user_id, role_id=data.role_id
             )
+            await invalidate_permissions(session=session, user_id=data.user_id)
+            return removed
         logger.error("PermissionDenied")
         raise PermissionDenied(
             custom_detail="Missing delete or delete_all permission on user_roles"
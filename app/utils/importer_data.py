@@ -1,6 +1,7 @@
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from app.models import Role, BusinessElement, AccessRule, User, Category, Product, Order
 from app.utils.sample_data import (
     BUSINESS_ELEMENTS_DATA,
@@ -12,14 +13,11 @@ from app.utils.sample_data import (
     ORDER_DATA,
 )
 from app.core.security import get_password_hash
-from app.core.config import settings
-from app.db.session import create_session_factory
+from app.db.session import async_session_maker
 
 
 logger = structlog.get_logger()
 
-async_session_maker = create_session_factory(settings.DATABASE_URL)
-
 
 async def seed_roles(session: AsyncSession):
     existing_names = {
@@ -88,7 +86,9 @@ async def seed_users(session: AsyncSession):
     for user_data in USERS_DATA:
         if user_data["email"] in existing_emails:
             result = await session.execute(
-                select(User).where(User.email == user_data["email"])
+                select(User)
+                .where(User.email == user_data["email"])
+                .options(selectinload(User.roles))
             )
             user = result.scalar_one_or_none()
             if not user.roles:
@@ -98,7 +98,7 @@ async def seed_users(session: AsyncSession):
 
         user = User(
             email=user_data["email"],
-            password=get_password_hash(user_data["password"]),
+            password=await get_password_hash(user_data["password"]),
             first_name=user_data["first_name"],
             last_name=user_data["last_name"],
             is_active=user_data.get("is_active", True),
@@ -0,0 +1,61 @@
+"""
+NDJSON-выгрузка: одна JSON-строка на запись, поток пачками из BaseDAO.stream_many.
+Тело читает курсор сессии из зависимости с yield уже после выхода из эндпоинта:
+такая зависимость закрывается после отправки ответа только с FastAPI 0.118
+"""
+
+from typing import Any, AsyncIterator, Dict, List
+import anyio
+import structlog
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from starlette.types import Send
+
+
+logger = structlog.get_logger()
+
+
+class NDJSONResponse(StreamingResponse):
+    media_type = "application/x-ndjson"
+
+    async def stream_response(self, send: Send) -> None:
+        """
+        Пачка уходит в send, и следующая читается из курсора только после
+        отправки предыдущей - медленный клиент тормозит выборку (backpressure).
+        Starlette при обрыве соединения итератор не закрывает: закрываем
+        сами, до выхода зависимости с сессией
+        """
+        try:
+            await super().stream_response(send)
+        finally:
+            # отмена по http.disconnect прервала бы и само закрытие
+            with anyio.CancelScope(shield=True):
+                await self.body_iterator.aclose()
+
+
+async def ndjson_chunks(
+    batches: AsyncIterator[List[Dict[str, Any]]],
+) -> AsyncIterator[bytes]:
+    rows = 0
+    finished = False
+    try:
+        async for batch in batches:
+            rows += len(batch)
+            yield b"".join(to_json(row) + b"\n" for row in batch)
+        finished = True
+    finally:
+        # закрывает серверный курсор, если клиент ушёл посреди выгрузки
+        await batches.aclose()
+        if finished:
+            logger.info("Export finished", data=rows)
+        else:
+            logger.warning("Export cancelled", data=rows)
+
+
+def ndjson_response(
+    batches: AsyncIterator[List[Dict[str, Any]]], filename: str
+) -> NDJSONResponse:
+    return NDJSONResponse(
+        ndjson_chunks(batches),
+        headers={"Content-Disposition": f'attachment; filename="{filename}.ndjson"'},
+    )
@@ -0,0 +1,126 @@
+"""
+Создание заказа:
+    DAO      - до: session.add + flush + refresh (INSERT и SELECT),
+               после: BaseDAO.add_one, один INSERT ... RETURNING
+    POST     - пропускная способность POST /v1/orders целиком через ASGI
+               (авторизация, run_in_transaction, сериализация ответа)
+Созданные заказы в конце удаляются
+"""
+
+import asyncio
+import time
+import httpx
+from sqlalchemy import delete, func, select
+from app.core.enums import BusinessDomain
+from app.crud.order import OrderDAO
+from app.dependencies.get_db import async_session_maker
+from app.main import app
+from app.models import Order, Product, User
+from app.services.auth_service import AuthService
+from app.services.user import get_access_token_claims, resolve_user_access
+from benchmarks.common import measure
+
+
+CONCURRENCY = 20
+DURATION_SECONDS = 10
+
+
+async def old_add_one(session, values):
+    new_instance = Order(**values)
+    session.add(new_instance)
+    await session.flush()
+    await session.refresh(new_instance)
+    return new_instance
+
+
+async def find_user_with_create_permission(session):
+    user_ids = await session.scalars(select(User.id).where(User.is_active.is_(True)))
+    for user_id in user_ids.all():
+        access = await resolve_user_access(
+            user_id=user_id,
+            business_element=BusinessDomain.ORDER.value,
+            session=session,
+        )
+        if "create_permission" in access.permissions:
+            return user_id
+    raise SystemExit(
+        "Нет пользователя с create_permission на order, запустите seed_all"
+    )
+
+
+async def post_throughput(token, product_id):
+    payload = {"product_id": str(product_id), "quantity": 1}
+    headers = {"Authorization": f"Bearer {token}"}
+    done = 0
+    deadline = time.perf_counter() + DURATION_SECONDS
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers=headers
+    ) as client:
+
+        async def worker():
+            nonlocal done
+            while time.perf_counter() < deadline:
+                response = await client.post("/v1/orders", json=payload)
+                response.raise_for_status()
+                done += 1
+
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    print(
+        f"POST /v1/orders x{CONCURRENCY}: {done / DURATION_SECONDS:.0f} req/s "
+        f"({done} за {DURATION_SECONDS}s)"
+    )
+
+
+async def main():
+    async with async_session_maker() as session:
+        user_id = await find_user_with_create_permission(session)
+        product_id = await session.scalar(select(Product.id).limit(1))
+        if product_id is None:
+            raise SystemExit("В БД нет товаров, запустите seed_all")
+        claims = await get_access_token_claims(user_id=user_id, session=session)
+        started_at = await session.scalar(select(func.now()))
+        await session.commit()
+
+    try:
+        await compare_dao(user_id, product_id)
+        await post_throughput(AuthService.create_access_token(claims), product_id)
+    finally:
+        # POST коммитит заказы - убираем их, даже если замер упал
+        async with async_session_maker() as session:
+            await session.execute(
+                delete(Order).where(
+                    Order.user_id == user_id, Order.created_at >= started_at
+                )
+            )
+            await session.commit()
+
+
+async def compare_dao(user_id, product_id):
+    """Обе версии в одной транзакции, которая откатывается в любом случае"""
+    values = {"user_id": user_id, "product_id": product_id, "quantity": 1}
+    async with async_session_maker() as session:
+        engine = session.bind
+
+        async def old_path():
+            await old_add_one(session, dict(values))
+            session.expunge_all()
+
+        async def new_path():
+            await OrderDAO.add_one(session=session, values=dict(values))
+
+        try:
+            before = await measure("add + flush + refresh", engine, old_path)
+            after = await measure("insert ... returning", engine, new_path)
+        finally:
+            await session.rollback()
+
+    print(
+        f"saved per insert: "
+        f"{before['queries_per_call'] - after['queries_per_call']:.1f} queries, "
+        f"{before['mean_ms'] - after['mean_ms']:.3f} ms mean"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+"""
+Сравнение авторизации запроса:
+    до   - ensure_user_is_active (User + 3 selectin-связи) + get_with_permissions
+    после - UserDAO.get_auth_context, один запрос с CTE и bool_or
+Кеш авторизации не используется, меряется чистая стоимость похода в БД
+"""
+
+import asyncio
+from sqlalchemy import select
+from app.core.enums import BusinessDomain
+from app.crud.user import UserDAO
+from app.dependencies.get_db import async_session_maker
+from app.models import User
+from app.services.user import ensure_user_is_active
+from benchmarks.common import measure
+
+
+BUSINESS_ELEMENT = BusinessDomain.PRODUCT.value
+
+
+async def main():
+    async with async_session_maker() as session:
+        user_id = await session.scalar(
+            select(User.id).where(User.is_active.is_(True)).limit(1)
+        )
+        if user_id is None:
+            raise SystemExit("В БД нет активных пользователей, запустите seed_all")
+        engine = session.bind
+
+        async def old_path():
+            await ensure_user_is_active(user_id=user_id, session=session)
+            await UserDAO.get_with_permissions(
+                user_id=user_id,
+                business_element_name=BUSINESS_ELEMENT,
+                session=session,
+            )
+            session.expunge_all()
+
+        async def new_path():
+            await UserDAO.get_auth_context(
+                user_id=user_id,
+                business_element_name=BUSINESS_ELEMENT,
+                session=session,
+            )
+
+        before = await measure(
+            "ensure_user_is_active + get_with_permissions", engine, old_path
+        )
+        after = await measure("get_auth_context", engine, new_path)
+
+    print(
+        f"saved per request: "
+        f"{before['queries_per_call'] - after['queries_per_call']:.1f} queries, "
+        f"{before['mean_ms'] - after['mean_ms']:.3f} ms mean"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+"""
+Транзакция списочного GET-запроса (авторизация + страница списка):
+    default         - как было: уровень изоляции игнорировался, READ WRITE
+    repeatable read - то, что запрашивали маршруты, READ WRITE
+    read only       - READ COMMITTED READ ONLY DEFERRABLE (сейчас для GET)
+Каждый вызов открывает и закрывает свою сессию, как зависимость auth_db_context
+"""
+
+import asyncio
+from sqlalchemy import select
+from app.core.enums import BusinessDomain, IsolationLevel
+from app.crud.order import OrderDAO
+from app.crud.product import ProductDAO
+from app.crud.user import UserDAO
+from app.db.session import async_session_maker, get_session_with_isolation
+from app.models import User
+from app.schemas.base import PaginationParams
+from benchmarks.common import measure
+
+
+MODES = [
+    ("default", None, False),
+    ("repeatable read", IsolationLevel.REPEATABLE_READ, False),
+    ("read committed read only", IsolationLevel.READ_COMMITTED, True),
+]
+ENDPOINTS = [
+    (BusinessDomain.PRODUCT, ProductDAO),
+    (BusinessDomain.ORDER, OrderDAO),
+]
+
+
+async def main():
+    async with async_session_maker() as session:
+        user_id = await session.scalar(
+            select(User.id).where(User.is_active.is_(True)).limit(1)
+        )
+        if user_id is None:
+            raise SystemExit("В БД нет активных пользователей, запустите seed_all")
+        engine = session.bind
+    pagination = PaginationParams(page=1, per_page=50)
+
+    for business_element, methodDAO in ENDPOINTS:
+        for mode, isolation_level, read_only in MODES:
+
+            async def list_request():
+                async with get_session_with_isolation(
+                    async_session_maker, isolation_level, read_only
+                ) as session:
+                    await UserDAO.get_auth_context(
+                        user_id=user_id,
+                        business_element_name=business_element.value,
+                        session=session,
+                    )
+                    await methodDAO.find_many(session=session, pagination=pagination)
+
+            await measure(f"{business_element.value}: {mode}", engine, list_request)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
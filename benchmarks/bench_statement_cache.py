@@ -0,0 +1,75 @@
+"""
+Стоимость построения SELECT для find_many на один вызов (без БД):
+    до   - select() + model_dump() фильтра + сборка условий на каждый вызов
+    после - шаблон запроса из кеша + словарь параметров
+Отдельно меряется с генерацией cache key: её SQLAlchemy делает при каждом execute
+"""
+
+import statistics
+import time
+from sqlalchemy import and_, select
+from app.crud.product import ProductDAO
+from app.schemas.base import PaginationParams
+from app.schemas.product import SchemaProductFilter
+
+
+REPEAT = 20000
+FILTERS = SchemaProductFilter(name="Phone", price=100)
+PAGINATION = PaginationParams(page=3, per_page=20)
+
+
+def old_statement(dao, filters, pagination):
+    query = select(dao.model)
+    allowed_fields = dao.filter_schema.model_fields.keys()
+    exclude_fields = getattr(dao, "_exclude_from_filter_by", set())
+    filter_dict = {
+        key: value
+        for key, value in filters.model_dump().items()
+        if key in allowed_fields and key not in exclude_fields and value is not None
+    }
+    conditions = [
+        getattr(dao.model, key) == value
+        for key, value in filter_dict.items()
+        if hasattr(dao.model, key)
+    ]
+    if conditions:
+        query = query.filter(and_(*conditions))
+    return query.limit(pagination.per_page).offset(
+        pagination.per_page * (pagination.page - 1)
+    )
+
+
+def new_statement(dao, filters, pagination):
+    query, _params = dao._select_with_params(filters=filters, pagination=pagination)
+    return query
+
+
+def measure(name, func):
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    timings.sort()
+    print(
+        f"{name:<35} mean={statistics.mean(timings):.1f}us "
+        f"p50={timings[len(timings) // 2]:.1f}us "
+        f"p95={timings[int(len(timings) * 0.95) - 1]:.1f}us"
+    )
+
+
+def main():
+    measure("build: before", lambda: old_statement(ProductDAO, FILTERS, PAGINATION))
+    measure("build: after", lambda: new_statement(ProductDAO, FILTERS, PAGINATION))
+    measure(
+        "build + cache key: before",
+        lambda: old_statement(ProductDAO, FILTERS, PAGINATION)._generate_cache_key(),
+    )
+    measure(
+        "build + cache key: after",
+        lambda: new_statement(ProductDAO, FILTERS, PAGINATION)._generate_cache_key(),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Общие утилиты бенчмарков.
+Запуск из корня проекта при поднятой БД из .env: python -m benchmarks.<имя_модуля>
+"""
+
+import statistics
+import time
+from typing import Awaitable, Callable
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryCounter:
+    """Считает SQL-выражения, отправленные движком в БД"""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine.sync_engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+async def measure(
+    name: str,
+    engine: AsyncEngine,
+    func: Callable[[], Awaitable],
+    repeat: int = 200,
+    warmup: int = 10,
+) -> dict:
+    for _ in range(warmup):
+        await func()
+
+    timings = []
+    with QueryCounter(engine) as counter:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await func()
+            timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    result = {
+        "name": name,
+        "queries_per_call": counter.count / repeat,
+        "mean_ms": statistics.mean(timings),
+        "p50_ms": timings[len(timings) // 2],
+        "p95_ms": timings[int(len(timings) * 0.95) - 1],
+    }
+    print(
+        f"{name:<45} queries/call={result['queries_per_call']:.1f} "
+        f"mean={result['mean_ms']:.3f}ms p50={result['p50_ms']:.3f}ms "
+        f"p95={result['p95_ms']:.3f}ms"
+    )
+    return result
@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.crud.category import CategoryDAO
+from app.models import Category, Order, Product, Role, User
+from app.models.user import user_role_association
+
+
+@pytest.fixture
+async def category_session(request, tmp_path):
+    """
+    Сессия над таблицей category с тремя записями. Косвенный параметр -
+    pool_size: база тогда в файле на QueuePool, по умолчанию - в памяти
+    """
+    pool_size = getattr(request, "param", None)
+    if pool_size is None:
+        engine = create_async_engine("sqlite+aiosqlite://")
+    else:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'categories.db'}",
+            pool_size=pool_size,
+            max_overflow=0,
+        )
+    async with engine.begin() as conn:
+        await conn.run_sync(Category.metadata.create_all, [Category.__table__])
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        await CategoryDAO.add_many(
+            session=session,
+            values=[{"name": "books"}, {"name": "games"}, {"name": "music"}],
+        )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+async def user_session():
+    """
+    Свежая сессия (пустая identity map) над пользователем с ролью user,
+    таблицы связей пользователя созданы
+    """
+    engine = create_async_engine("sqlite+aiosqlite://")
+    tables = [
+        User.__table__,
+        Role.__table__,
+        user_role_association,
+        Product.__table__,
+        Order.__table__,
+    ]
+    async with engine.begin() as conn:
+        await conn.run_sync(User.metadata.create_all, tables)
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with maker() as session:
+        user = User(
+            email="user@example.com",
+            password="hash",
+            first_name="Ivan",
+            last_name="Ivanov",
+        )
+        user.roles = [Role(name="user", description="Пользователь")]
+        session.add(user)
+        await session.commit()
+    async with maker() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def sql_statements():
+    """record(session) - список SQL, выполненных движком сессии с этого момента"""
+
+    def record(session):
+        statements = []
+        event.listen(
+            session.bind.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        return statements
+
+    return record
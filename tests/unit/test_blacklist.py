@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.core.blacklist import (
+    MemoryBlacklistBackend,
+    TokenBlacklist,
+    token_digest,
+)
+from app.core.bloom_filter import BloomFilter
+
+
+class FakeSharedBackend(MemoryBlacklistBackend):
+    """Общий бэкенд: записи, добавленные "другим воркером", видны только через fetch"""
+
+    shared = True
+
+    async def fetch_since(self, since):
+        return list(self.cache.keys()), datetime.now(timezone.utc)
+
+
+def make_blacklist(backend, sync_seconds=0):
+    return TokenBlacklist(
+        backend=backend,
+        bloom_capacity=1000,
+        bloom_error_rate=0.001,
+        sync_seconds=sync_seconds,
+        rebuild_seconds=3600,
+    )
+
+
+def in_one_hour():
+    return datetime.now(timezone.utc) + timedelta(hours=1)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.001)
+    items = [f"token-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 50
+
+
+def test_digest_is_compact():
+    assert len(token_digest("header.payload.signature" * 20)) == 32
+
+
+@pytest.mark.asyncio
+async def test_ban_and_check_memory_backend():
+    blacklist = make_blacklist(MemoryBlacklistBackend(maxsize=100))
+    await blacklist.ban("revoked.jwt.token", expires_at=in_one_hour())
+
+    assert await blacklist.is_revoked("revoked.jwt.token") is True
+    assert await blacklist.is_revoked("valid.jwt.token") is False
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_not_revoked():
+    blacklist = make_blacklist(MemoryBlacklistBackend(maxsize=100))
+    expired = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await blacklist.ban("old.jwt.token", expires_at=expired)
+
+    assert await blacklist.is_revoked("old.jwt.token") is False
+
+
+@pytest.mark.asyncio
+async def test_ban_from_other_worker_is_picked_up_by_sync():
+    backend = FakeSharedBackend(maxsize=100)
+    blacklist = make_blacklist(backend)
+    assert await blacklist.is_revoked("foreign.jwt.token") is False
+
+    # запись добавил другой воркер: в локальный фильтр Блума она не попала
+    await backend.add(token_digest("foreign.jwt.token"), in_one_hour())
+
+    assert await blacklist.is_revoked("foreign.jwt.token") is True
@@ -0,0 +1,148 @@
+from uuid import UUID, uuid4
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from app.crud.category import CategoryDAO
+from app.crud.order import OrderDAO
+from app.models import Category
+from app.schemas.category import SchemaCategoryBase
+
+
+@pytest.mark.asyncio
+async def test_add_many_returns_rows_in_order(category_session):
+    rows = await CategoryDAO.add_many(
+        session=category_session, values=[{"name": "toys"}, {"name": "films"}]
+    )
+    assert [row.name for row in rows] == ["toys", "films"]
+    assert all(isinstance(row.id, UUID) for row in rows)
+
+
+def test_upsert_template_updates_on_conflict():
+    query = CategoryDAO._upsert_template(("name",), ("name",))
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (name) DO UPDATE SET updated_at = now()" in sql
+    assert CategoryDAO._upsert_template(("name",), ("name",)) is query
+
+
+class CapturingSession:
+    def __init__(self):
+        self.params = None
+
+    async def scalars(self, query, params):
+        self.params = params
+        return self
+
+    def all(self):
+        return self.params
+
+
+@pytest.mark.asyncio
+async def test_upsert_keeps_last_duplicate_key():
+    session = CapturingSession()
+    await CategoryDAO.upsert_many(
+        session=session,
+        values=[{"name": "a"}, {"name": "b"}, {"name": "a"}],
+    )
+    assert session.params == [{"name": "a"}, {"name": "b"}]
+
+
+class FakeCopySession:
+    def __init__(self):
+        self.copied = None
+
+    async def flush(self):
+        pass
+
+    async def connection(self):
+        return self
+
+    async def get_raw_connection(self):
+        return self
+
+    @property
+    def driver_connection(self):
+        return self
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copied = (table, records, columns)
+
+    async def scalars(self, query):
+        return self
+
+    def all(self):
+        _, records, columns = self.copied
+        return [type("Row", (), dict(zip(columns, record))) for record in records]
+
+
+@pytest.mark.asyncio
+async def test_copy_fills_python_defaults():
+    session = FakeCopySession()
+    user_id, product_id = uuid4(), uuid4()
+    rows = await OrderDAO._copy_many(
+        session=session,
+        values=[{"user_id": user_id, "product_id": product_id, "quantity": 2}],
+    )
+    table, records, columns = session.copied
+    assert table == "order"
+    assert {"id", "is_paid"} <= set(columns)
+    assert "created_at" not in columns
+    (record,) = records
+    copied = dict(zip(columns, record))
+    assert copied["user_id"] == user_id
+    assert copied["product_id"] == product_id
+    assert copied["quantity"] == 2
+    assert isinstance(copied["id"], UUID)
+    assert rows[0].id == copied["id"]
+
+
+@pytest.mark.asyncio
+async def test_add_one_is_single_insert_returning_schema(
+    category_session, sql_statements
+):
+    statements = sql_statements(category_session)
+    category = await CategoryDAO.add_one(
+        session=category_session, values={"name": "toys"}
+    )
+    assert isinstance(category, SchemaCategoryBase)
+    assert category.name == "toys"
+    assert category.created_at is not None
+    assert len(statements) == 1
+    assert "RETURNING" in statements[0]
+
+
+def test_insert_template_cached_per_dao():
+    order_insert = OrderDAO._insert_template()
+    category_insert = CategoryDAO._insert_template()
+    assert OrderDAO._insert_template() is order_insert
+    assert CategoryDAO._insert_template() is category_insert
+    assert order_insert is not category_insert
+
+
+async def add_with_outcomes(session, values):
+    outcomes = await CategoryDAO.add_many_with_outcomes(session=session, values=values)
+    await session.commit()
+    names = (await session.scalars(select(Category.name))).all()
+    return outcomes, sorted(names)
+
+
+@pytest.mark.asyncio
+async def test_add_many_with_outcomes_reports_created_rows(category_session):
+    outcomes, names = await add_with_outcomes(
+        category_session, [{"name": "films"}, {"name": "toys"}]
+    )
+    assert [outcome.status for outcome in outcomes] == ["created", "created"]
+    assert [outcome.data.name for outcome in outcomes] == ["films", "toys"]
+    assert names == ["books", "films", "games", "music", "toys"]
+
+
+@pytest.mark.asyncio
+async def test_add_many_with_outcomes_isolates_failing_item(category_session):
+    outcomes, names = await add_with_outcomes(
+        category_session, [{"name": "films"}, {"name": "books"}, {"name": "toys"}]
+    )
+    assert [outcome.index for outcome in outcomes] == [0, 1, 2]
+    assert [outcome.status for outcome in outcomes] == ["created", "failed", "created"]
+    assert outcomes[1].data is None
+    assert outcomes[1].error
+    # уже существующая запись и соседние элементы пачки не откатились
+    assert names == ["books", "films", "games", "music", "toys"]
@@ -0,0 +1,100 @@
+from uuid import uuid4
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+from app.crud.order import OrderDAO
+from app.exceptions.base import BulkSelectionTooLargeError
+from app.schemas.order import (
+    SchemaOrderBulkDelete,
+    SchemaOrderBulkPatch,
+    SchemaOrderFilter,
+)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.sql = None
+
+    async def execute(self, query):
+        self.sql = str(query.compile(dialect=postgresql.dialect()))
+        return FakeResult(self.rows)
+
+
+@pytest.mark.asyncio
+async def test_scoped_update_is_one_statement_with_outcomes():
+    mine, foreign, missing = uuid4(), uuid4(), uuid4()
+    session = FakeSession([(mine, True), (foreign, False)])
+    results = await OrderDAO.update_many(
+        session=session,
+        values={"is_paid": True},
+        ids=[mine, foreign, missing],
+        owner_field="user_id",
+        owner_id=uuid4(),
+    )
+
+    assert "WITH target AS" in session.sql
+    assert '"order".id = ANY (%(ids)s' in session.sql
+    assert 'UPDATE "order" SET' in session.sql
+    assert '"order".user_id = %(user_id_1)s::UUID RETURNING' in session.sql
+    assert [(r.id, r.status) for r in results] == [
+        (mine, "updated"),
+        (foreign, "forbidden"),
+        (missing, "not_found"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_filter_delete_limits_target_to_owner():
+    deleted = uuid4()
+    session = FakeSession([(deleted, True)])
+    results = await OrderDAO.delete_many(
+        session=session,
+        filters=SchemaOrderFilter(is_paid=False),
+        owner_field="user_id",
+        owner_id=uuid4(),
+    )
+
+    target = session.sql.split("changed AS")[0]
+    assert '"order".is_paid = ' in target
+    assert '"order".user_id = ' in target
+    assert 'DELETE FROM "order"' in session.sql
+    assert [(r.id, r.status) for r in results] == [(deleted, "deleted")]
+
+
+@pytest.mark.asyncio
+async def test_empty_selection_rejected():
+    with pytest.raises(ValidationError):
+        SchemaOrderBulkDelete(filters=SchemaOrderFilter())
+    with pytest.raises(ValueError):
+        await OrderDAO.delete_many(session=FakeSession([]))
+
+
+@pytest.mark.asyncio
+async def test_filter_selection_capped_at_bulk_limit(monkeypatch):
+    monkeypatch.setattr("app.crud.base.settings.BULK_MAX_ITEMS", 2)
+    session = FakeSession([(uuid4(), False) for _ in range(3)])
+    with pytest.raises(BulkSelectionTooLargeError):
+        await OrderDAO.update_many(
+            session=session,
+            values={"is_paid": True},
+            filters=SchemaOrderFilter(is_paid=False),
+        )
+
+    target, changed = session.sql.split("changed AS")
+    assert "LIMIT" in target
+    assert "count(*)" in changed
+
+
+def test_bulk_patch_requires_data():
+    with pytest.raises(ValidationError):
+        SchemaOrderBulkPatch(ids=[uuid4()], data={})
+    assert SchemaOrderBulkPatch(ids=[uuid4()], data={"is_paid": True}).data.is_paid
@@ -0,0 +1,74 @@
+from uuid import uuid4
+import pytest
+from fastapi import Response
+from app.api.v1.category import get_categorys
+from app.crud.category import CategoryDAO
+from app.crud.file_upload import FileUploadDAO
+from app.crud.user import UserDAO
+from app.exceptions.base import InvalidFieldsError
+from app.schemas.base import FieldsParams, PaginationParams
+from app.schemas.category import SchemaCategoryFilter
+from app.schemas.permission import AccessContext, RequestContext
+
+
+def test_fields_param_parsing():
+    assert FieldsParams(fields=" id, name ,id,").columns == ("id", "name")
+    assert FieldsParams(fields="").columns is None
+    assert FieldsParams().columns is None
+
+
+@pytest.mark.asyncio
+async def test_projection_returns_plain_dicts(category_session):
+    rows = await CategoryDAO.find_many(
+        session=category_session,
+        pagination=PaginationParams(page=1, per_page=10),
+        fields=("id", "name"),
+    )
+    assert [set(row) for row in rows] == [{"id", "name"}] * 3
+    assert sorted(row["name"] for row in rows) == ["books", "games", "music"]
+
+
+@pytest.mark.asyncio
+async def test_projection_with_cursor_keeps_only_requested_fields(category_session):
+    pagination = PaginationParams(page=1, per_page=2, cursor="")
+    rows = await CategoryDAO.find_many(
+        session=category_session, pagination=pagination, fields=("name",)
+    )
+    assert [set(row) for row in rows] == [{"name"}] * 2
+    assert "X-Next-Cursor" in pagination.page_headers()
+
+
+def test_only_response_columns_are_projectable():
+    assert "password" not in UserDAO._projectable_fields
+    assert "sheet" not in FileUploadDAO._projectable_fields
+    with pytest.raises(InvalidFieldsError):
+        CategoryDAO._projection(("id", "secret"))
+
+
+def read_all_context(session):
+    return RequestContext(
+        session=session,
+        access=AccessContext(user_id=uuid4(), permissions=["read_all_permission"]),
+    )
+
+
+async def get_category_page(session, pagination):
+    response = Response()
+    rows = await get_categorys(
+        response=response,
+        request_context=read_all_context(session),
+        filters=SchemaCategoryFilter(),
+        pagination=pagination,
+        projection=FieldsParams(fields="name"),
+    )
+    return [row["name"] for row in rows], response.headers
+
+
+@pytest.mark.asyncio
+async def test_category_route_sends_cursor_headers(category_session):
+    names, headers = await get_category_page(
+        category_session, PaginationParams(page=1, per_page=2, cursor="")
+    )
+    assert len(names) == 2
+    assert "X-Next-Cursor" in headers
+    assert "X-Prev-Cursor" not in headers
@@ -0,0 +1,108 @@
+from typing import Optional
+from uuid import uuid4
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from sqlalchemy.dialects import postgresql
+from app.crud.base import BaseDAO
+from app.crud.product import ProductDAO
+from app.models.product import Product
+from app.schemas.order import SchemaOrderFilter
+from app.schemas.product import SchemaProductBase, SchemaProductFilter
+
+
+def compile_sql(query):
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def test_operators_compile_to_predicates():
+    filters = SchemaProductFilter(
+        price__gte=100,
+        price__lte=500,
+        name__startswith="50%_off",
+        category_id__in=[],
+    )
+    query, params = ProductDAO._select_with_params(filters)
+    sql = compile_sql(query)
+
+    assert "product.price >= %(filter_price__gte)s" in sql
+    assert "product.price <= %(filter_price__lte)s" in sql
+    assert "product.name LIKE %(filter_name__startswith)s" in sql
+    assert "ESCAPE '\\'" in sql
+    assert "product.category_id = ANY (%(filter_category_id__in)s" in sql
+    assert params["filter_name__startswith"] == "50\\%\\_off%"
+
+
+def test_operator_is_part_of_statement_shape():
+    by_gte, _ = ProductDAO._select_with_params(SchemaProductFilter(price__gte=1))
+    by_gte_again, params = ProductDAO._select_with_params(
+        SchemaProductFilter(price__gte=99)
+    )
+    by_eq, _ = ProductDAO._select_with_params(SchemaProductFilter(price=1))
+    assert by_gte is by_gte_again
+    assert by_gte is not by_eq
+    assert params == {"filter_price__gte": 99}
+
+
+class NullableFilter(BaseModel):
+    category_id__isnull: Optional[bool] = None
+
+
+class NullableProductDAO(BaseDAO):
+    model = Product
+    filter_schema = NullableFilter
+    pydantic_model = SchemaProductBase
+    filter_operators = {"category_id": ("isnull",)}
+
+
+def test_isnull_value_selects_statement_without_param():
+    is_null, params = NullableProductDAO._select_with_params(
+        NullableFilter(category_id__isnull=True)
+    )
+    not_null, _ = NullableProductDAO._select_with_params(
+        NullableFilter(category_id__isnull=False)
+    )
+    assert "product.category_id IS NULL" in compile_sql(is_null)
+    assert "product.category_id IS NOT NULL" in compile_sql(not_null)
+    assert params == {}
+
+
+def test_operator_outside_whitelist_rejected():
+    class PriceRange(BaseModel):
+        price__gt: Optional[int] = None
+
+    with pytest.raises(ValueError, match="не разрешён"):
+        type(
+            "NoWhitelistDAO",
+            (BaseDAO,),
+            {"model": Product, "filter_schema": PriceRange},
+        )
+
+
+def test_whitelist_requires_index():
+    with pytest.raises(ValueError, match="без индекса"):
+        type(
+            "UpdatedAtDAO",
+            (BaseDAO,),
+            {
+                "model": Product,
+                "filter_schema": SchemaProductFilter,
+                "filter_operators": {"updated_at": ("gte",)},
+            },
+        )
+
+
+def test_in_filter_read_from_repeated_query_params():
+    app = FastAPI()
+
+    @app.get("/orders")
+    async def orders(filters: SchemaOrderFilter = Depends()):
+        return filters.model_dump(mode="json", exclude_none=True)
+
+    ids = [str(uuid4()), str(uuid4())]
+    response = TestClient(app).get(
+        "/orders", params={"id__in": ids, "created_at__gte": "2026-01-01T00:00:00"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"id__in": ids, "created_at__gte": "2026-01-01T00:00:00"}
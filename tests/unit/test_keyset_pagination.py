@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.crud.order import OrderDAO
+from app.exceptions.base import InvalidCursorError
+from app.models import Order
+from app.schemas.base import PaginationParams
+from app.schemas.order import SchemaOrderFilter
+
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+ORDERS = [
+    Order(
+        id=uuid4(),
+        user_id=uuid4(),
+        product_id=uuid4(),
+        quantity=1,
+        is_paid=False,
+        created_at=START + timedelta(minutes=index),
+        updated_at=START,
+    )
+    for index in range(5)
+]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def unique(self):
+        return self
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Выполняет keyset-выборку над списком ORDERS по переданным параметрам"""
+
+    async def execute(self, query, params):
+        backward = "DESC" in str(query)
+        rows = sorted(ORDERS, key=lambda o: (o.created_at, o.id), reverse=backward)
+        if "cursor_created_at" in params:
+            key = (params["cursor_created_at"], params["cursor_id"])
+            rows = [
+                o
+                for o in rows
+                if (
+                    (o.created_at, o.id) < key
+                    if backward
+                    else (o.created_at, o.id) > key
+                )
+            ]
+        return FakeResult(rows[: params["limit"]])
+
+
+async def fetch(cursor, per_page=2):
+    pagination = PaginationParams(page=1, per_page=per_page, cursor=cursor)
+    items = await OrderDAO.find_many(
+        session=FakeSession(), filters=SchemaOrderFilter(), pagination=pagination
+    )
+    return [item.id for item in items], pagination.page_headers()
+
+
+def test_keyset_template_compares_row_values():
+    query = OrderDAO._keyset_template((("user_id", "eq"),), True, False)
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert '("order".created_at, "order".id) > (%(cursor_created_at)s' in sql
+    assert 'ORDER BY "order".created_at, "order".id' in sql
+    assert "OFFSET" not in sql
+    assert OrderDAO._keyset_template((("user_id", "eq"),), True, False) is query
+
+
+@pytest.mark.asyncio
+async def test_walks_forward_and_back():
+    ids = [order.id for order in ORDERS]
+
+    first, headers = await fetch("")
+    assert first == ids[:2]
+    assert "X-Prev-Cursor" not in headers
+
+    second, headers = await fetch(headers["X-Next-Cursor"])
+    assert second == ids[2:4]
+
+    last, last_headers = await fetch(headers["X-Next-Cursor"])
+    assert last == ids[4:]
+    assert "X-Next-Cursor" not in last_headers
+
+    back, back_headers = await fetch(headers["X-Prev-Cursor"])
+    assert back == ids[:2]
+    assert "X-Prev-Cursor" not in back_headers
+    assert "X-Next-Cursor" in back_headers
+
+
+def test_offset_mode_orders_by_cursor_key():
+    query, _ = OrderDAO._select_with_params(
+        pagination=PaginationParams(page=2, per_page=10)
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert 'ORDER BY "order".created_at, "order".id' in sql
+
+
+def test_invalid_cursor_rejected():
+    with pytest.raises(InvalidCursorError):
+        OrderDAO._decode_cursor("not-a-cursor")
@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+from app.crud.user import UserDAO
+from app.models import User
+
+
+@pytest.mark.asyncio
+async def test_find_many_issues_single_select_without_collections(
+    user_session, sql_statements
+):
+    statements = sql_statements(user_session)
+    users = await UserDAO.find_many(session=user_session)
+    assert [user.email for user in users] == ["user@example.com"]
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_unlisted_relationship_raises(user_session):
+    user = await user_session.scalar(select(User))
+    with pytest.raises(InvalidRequestError):
+        _ = user.orders
+
+
+@pytest.mark.asyncio
+async def test_roles_profile_loads_roles(user_session):
+    user_id = await user_session.scalar(select(User.id))
+    user = await UserDAO.get_with_roles(session=user_session, user_id=user_id)
+    assert [role.name for role in user.roles] == ["user"]
+
+
+def test_unknown_profile_rejected():
+    with pytest.raises(ValueError):
+        UserDAO._loader_options("orders")
@@ -0,0 +1,62 @@
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+import pytest
+from app.exceptions.base import BadCredentialsError, UserInactiveError
+from app.schemas.user import SchemaUserLoginMain, UserLoginContext
+from app.services.auth_service import AuthService
+from app.services.user import authenticate_user
+
+
+def make_context(is_active=True):
+    return UserLoginContext(
+        id=uuid4(), is_active=is_active, password="hash", roles=["user"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_login_uses_single_query():
+    context = make_context()
+    user_in = SchemaUserLoginMain(email="user@example.com", password="secret")
+    with (
+        patch(
+            "app.services.user.UserDAO.get_login_context",
+            AsyncMock(return_value=context),
+        ) as mock_query,
+        patch(
+            "app.services.user.AuthService.verify_password",
+            AsyncMock(return_value=True),
+        ),
+        patch("app.services.user.get_user_roles", AsyncMock()) as mock_roles,
+    ):
+        tokens = await authenticate_user(user_in=user_in, session=AsyncMock())
+
+    mock_query.assert_awaited_once()
+    mock_roles.assert_not_awaited()
+    payload = await AuthService.decode_access_token(tokens.access_token)
+    assert payload.sub == context.id
+    assert payload.role == ["user"]
+
+
+@pytest.mark.asyncio
+async def test_login_unknown_email():
+    user_in = SchemaUserLoginMain(email="nobody@example.com", password="secret")
+    with patch(
+        "app.services.user.UserDAO.get_login_context", AsyncMock(return_value=None)
+    ):
+        with pytest.raises(BadCredentialsError):
+            await authenticate_user(user_in=user_in, session=AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_login_inactive_user_skips_bcrypt():
+    user_in = SchemaUserLoginMain(email="user@example.com", password="secret")
+    with (
+        patch(
+            "app.services.user.UserDAO.get_login_context",
+            AsyncMock(return_value=make_context(is_active=False)),
+        ),
+        patch("app.services.user.AuthService.verify_password", AsyncMock()) as verify,
+    ):
+        with pytest.raises(UserInactiveError):
+            await authenticate_user(user_in=user_in, session=AsyncMock())
+    verify.assert_not_awaited()
@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import patch
+from fastapi import Request
+from app.core.login_throttle import (
+    LoginThrottler,
+    MemoryLoginThrottleBackend,
+    get_throttle_ip,
+)
+from app.exceptions.base import PasswordHasherBusyError, TooManyLoginAttemptsError
+
+
+def make_throttler(email_burst=2, ip_burst=10):
+    return LoginThrottler(
+        backend=MemoryLoginThrottleBackend(maxsize=100),
+        email_burst=email_burst,
+        email_per_minute=1,
+        ip_burst=ip_burst,
+        ip_per_minute=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_email_bucket_exhausted():
+    throttler = make_throttler()
+    await throttler.check(email="user@example.com", ip="10.0.0.1")
+    await throttler.check(email="USER@example.com", ip="10.0.0.2")
+    with pytest.raises(TooManyLoginAttemptsError) as exc_info:
+        await throttler.check(email="user@example.com", ip="10.0.0.3")
+    assert exc_info.value.status_code == 429
+    assert int(exc_info.value.headers["Retry-After"]) > 0
+    # другой email с того же IP проходит
+    await throttler.check(email="other@example.com", ip="10.0.0.3")
+
+
+@pytest.mark.asyncio
+async def test_ip_bucket_exhausted():
+    throttler = make_throttler(email_burst=10, ip_burst=1)
+    await throttler.check(email="a@example.com", ip="10.0.0.1")
+    with pytest.raises(TooManyLoginAttemptsError):
+        await throttler.check(email="b@example.com", ip="10.0.0.1")
+
+
+@pytest.mark.asyncio
+async def test_busy_hasher_rejected_before_buckets():
+    throttler = make_throttler()
+    with patch("app.core.security.PasswordHasher.busy", True):
+        with pytest.raises(PasswordHasherBusyError):
+            await throttler.check(email="user@example.com", ip="10.0.0.1")
+    assert len(throttler.backend.buckets) == 0
+
+
+def make_request(peer, forwarded=None):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "client": (peer, 5000), "headers": headers})
+
+
+def test_forwarded_for_ignored_without_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(
+        "app.core.login_throttle.settings.LOGIN_THROTTLE_TRUSTED_PROXIES", ""
+    )
+    # подмена заголовка не даёт новую корзину
+    assert get_throttle_ip(make_request("203.0.113.7", "1.2.3.4")) == "203.0.113.7"
+    assert get_throttle_ip(make_request("203.0.113.7", "5.6.7.8")) == "203.0.113.7"
+
+
+def test_forwarded_for_from_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(
+        "app.core.login_throttle.settings.LOGIN_THROTTLE_TRUSTED_PROXIES",
+        "10.0.0.0/8, 192.168.1.1",
+    )
+    # левые адреса цепочки приписал клиент - берётся то, что видел наш прокси
+    request = make_request("10.0.0.2", "1.2.3.4, 198.51.100.9, 192.168.1.1")
+    assert get_throttle_ip(request) == "198.51.100.9"
+    # недоверенный пир со своим X-Forwarded-For
+    assert get_throttle_ip(make_request("203.0.113.7", "1.2.3.4")) == "203.0.113.7"
@@ -0,0 +1,114 @@
+import asyncio
+import json
+from uuid import uuid4
+import pytest
+from structlog.testing import capture_logs
+from app.core.enums import BusinessDomain
+from app.crud.category import CategoryDAO
+from app.exceptions.base import PermissionDenied
+from app.schemas.order import SchemaOrderFilter
+from app.schemas.permission import AccessContext
+from app.services.base import stream_many_business_element
+from app.services.base_scoped_operations import stream_many_scoped
+from app.utils.ndjson_stream import ndjson_chunks, ndjson_response
+
+
+@pytest.mark.asyncio
+async def test_stream_many_yields_batches_of_response_columns(category_session):
+    stream = CategoryDAO.stream_many(session=category_session, batch_size=2)
+    batches = [batch async for batch in stream]
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert set(batches[0][0]) == {"id", "name", "created_at", "updated_at"}
+
+
+@pytest.mark.asyncio
+async def test_ndjson_one_line_per_row(category_session):
+    batches = CategoryDAO.stream_many(session=category_session, fields=("name",))
+    body = b"".join([chunk async for chunk in ndjson_chunks(batches)])
+    lines = [json.loads(line) for line in body.splitlines()]
+    assert sorted(line["name"] for line in lines) == ["books", "games", "music"]
+
+
+@pytest.mark.asyncio
+async def test_disconnect_while_client_is_slow_closes_cursor():
+    closed = asyncio.Event()
+    client_reads = asyncio.Event()
+    produced = []
+
+    async def batches():
+        try:
+            while True:
+                produced.append(1)
+                yield [{"n": len(produced)}]
+        finally:
+            closed.set()
+
+    async def send(message):
+        # клиент не читает: send висит, курсор дальше не выбирается
+        if message["type"] == "http.response.body":
+            await client_reads.wait()
+
+    async def receive():
+        await asyncio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    response = ndjson_response(batches(), filename="orders")
+    await response({"type": "http", "asgi": {"spec_version": "2.0"}}, receive, send)
+
+    assert closed.is_set()
+    assert len(produced) == 1
+
+
+owner_id = uuid4()
+
+
+class RecordingDAO:
+    calls = []
+
+    @classmethod
+    def stream_many(cls, **kwargs):
+        cls.calls.append(kwargs)
+        return "batches"
+
+
+async def stream_orders(filters, permissions):
+    return await stream_many_scoped(
+        business_element=BusinessDomain.ORDER,
+        methodDAO=RecordingDAO,
+        access=AccessContext(user_id=owner_id, permissions=permissions),
+        filters=filters,
+        session=None,
+        owner_field="user_id",
+    )
+
+
+@pytest.mark.asyncio
+async def test_export_scoped_to_owner_before_streaming():
+    filters = SchemaOrderFilter()
+    assert await stream_orders(filters, ["read_permission"]) == "batches"
+    assert RecordingDAO.calls[-1]["filters"].user_id == owner_id
+
+    with pytest.raises(PermissionDenied):
+        await stream_orders(SchemaOrderFilter(user_id=uuid4()), ["read_permission"])
+    with pytest.raises(PermissionDenied):
+        await stream_orders(SchemaOrderFilter(), [])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "permissions, applied",
+    [
+        (["read_all_permission", "read_permission"], "read_all_permission"),
+        (["read_permission"], "read_permission"),
+    ],
+)
+async def test_export_logs_applied_permission(permissions, applied):
+    with capture_logs() as logs:
+        await stream_many_business_element(
+            business_element=BusinessDomain.PRODUCT,
+            methodDAO=RecordingDAO,
+            access=AccessContext(user_id=owner_id, permissions=permissions),
+            filters=None,
+            session=None,
+        )
+    assert [log["event"] for log in logs] == [applied]
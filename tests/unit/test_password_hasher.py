@@ -0,0 +1,25 @@
+import asyncio
+import time
+import pytest
+from app.core.security import PasswordHasher, get_password_hash, verify_password
+from app.exceptions.base import PasswordHasherBusyError
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_in_process_pool():
+    hashed = await get_password_hash("mypassword")
+    assert await verify_password("mypassword", hashed) is True
+    assert await verify_password("otherpassword", hashed) is False
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected():
+    hasher = PasswordHasher(max_workers=1, max_queue=0)
+    try:
+        running = asyncio.create_task(hasher.run("hash", time.sleep, 0.5))
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher.run("hash", time.sleep, 0)
+        await running
+    finally:
+        hasher.shutdown()
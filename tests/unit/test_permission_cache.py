@@ -0,0 +1,94 @@
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+import pytest
+from app.core.enums import BusinessDomain
+from app.core.permission_cache import (
+    permission_cache,
+    get_cached_permissions,
+    set_cached_permissions,
+    invalidate_user_permissions,
+    invalidate_all_permissions,
+)
+from app.exceptions.base import UserInactiveError
+from app.schemas.permission import SchemaUserAuth
+from app.services.user import resolve_user_access
+
+
+def make_auth(user_id, permissions, is_active=True):
+    return SchemaUserAuth(user_id=user_id, is_active=is_active, permissions=permissions)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    permission_cache.clear()
+    yield
+    permission_cache.clear()
+
+
+def test_enum_and_str_share_key():
+    user_id = uuid4()
+    set_cached_permissions(user_id, BusinessDomain.PRODUCT, ["read_permission"])
+    assert get_cached_permissions(user_id, "product") == ["read_permission"]
+
+
+def test_invalidate_user_keeps_other_users():
+    user_id, other_id = uuid4(), uuid4()
+    set_cached_permissions(user_id, "product", ["read_permission"])
+    set_cached_permissions(user_id, "order", ["read_permission"])
+    set_cached_permissions(other_id, "product", ["read_all_permission"])
+
+    invalidate_user_permissions(user_id)
+
+    assert get_cached_permissions(user_id, "product") is None
+    assert get_cached_permissions(user_id, "order") is None
+    assert get_cached_permissions(other_id, "product") == ["read_all_permission"]
+
+
+def test_invalidate_all():
+    set_cached_permissions(uuid4(), "product", ["read_permission"])
+    invalidate_all_permissions()
+    assert len(permission_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_resolve_user_access_queries_permissions_once():
+    user_id = uuid4()
+    db_mock = AsyncMock()
+    with (
+        patch(
+            "app.services.user.UserDAO.get_auth_context",
+            AsyncMock(return_value=make_auth(user_id, ["read_permission"])),
+        ) as mock_query,
+        patch(
+            "app.services.user.UserDAO.get_is_active", AsyncMock(return_value=True)
+        ) as mock_is_active,
+    ):
+        first = await resolve_user_access(user_id, "product", db_mock)
+        second = await resolve_user_access(user_id, "product", db_mock)
+
+    assert first.permissions == second.permissions == ["read_permission"]
+    mock_query.assert_awaited_once()
+    mock_is_active.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_deactivation_rejects_next_request_despite_cache():
+    # запись в кеше осталась (деактивация прошла в другом воркере)
+    user_id = uuid4()
+    set_cached_permissions(user_id, "product", ["read_all_permission"])
+    with patch(
+        "app.services.user.UserDAO.get_is_active", AsyncMock(return_value=False)
+    ):
+        with pytest.raises(UserInactiveError):
+            await resolve_user_access(user_id, "product", AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_resolve_user_access_inactive_user():
+    user_id = uuid4()
+    with patch(
+        "app.services.user.UserDAO.get_auth_context",
+        AsyncMock(return_value=make_auth(user_id, [], is_active=False)),
+    ):
+        with pytest.raises(UserInactiveError):
+            await resolve_user_access(user_id, "product", AsyncMock())
@@ -0,0 +1,74 @@
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.enums import BusinessDomain
+from app.crud.access_rule import AccessRuleDAO
+from app.exceptions.base import TokenExpiredError
+from app.schemas.permission import SchemaPermissionBase
+from app.schemas.token import AccessToken
+from app.services.user import get_access_from_claims
+
+
+def make_payload(perm, pv):
+    return AccessToken(sub=uuid4(), role=["user"], exp=0, iat=0, perm=perm, pv=pv)
+
+
+def test_bitmap_roundtrip():
+    permissions = SchemaPermissionBase(read_permission=True, update_permission=True)
+    restored = SchemaPermissionBase.from_bitmap(permissions.to_bitmap())
+    assert restored.to_permission_list() == ["read_permission", "update_permission"]
+
+
+@pytest.mark.asyncio
+async def test_access_from_claims():
+    bitmap = SchemaPermissionBase(read_all_permission=True).to_bitmap()
+    payload = make_payload(perm={"product": bitmap}, pv=3)
+    with patch("app.services.user.get_permission_version", AsyncMock(return_value=3)):
+        access = await get_access_from_claims(
+            payload=payload, business_element=BusinessDomain.PRODUCT, session=None
+        )
+        missing = await get_access_from_claims(
+            payload=payload, business_element=BusinessDomain.ORDER, session=None
+        )
+
+    assert access.user_id == payload.sub
+    assert access.permissions == ["read_all_permission"]
+    assert missing.permissions == []
+
+
+@pytest.mark.asyncio
+async def test_stale_permission_version_rejected():
+    payload = make_payload(perm={"product": 1}, pv=3)
+    with patch("app.services.user.get_permission_version", AsyncMock(return_value=4)):
+        with pytest.raises(TokenExpiredError):
+            await get_access_from_claims(
+                payload=payload, business_element="product", session=None
+            )
+
+
+@pytest.mark.asyncio
+async def test_permission_version_follows_sequence_is_called():
+    # отношение последовательности Postgres: SELECT * FROM seq -> last_value,
+    # is_called; nextval на свежей оставляет last_value = 1 и ставит is_called
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "CREATE TABLE permission_version_seq "
+                "(last_value INTEGER NOT NULL, is_called BOOLEAN NOT NULL)"
+            )
+        )
+        await conn.execute(text("INSERT INTO permission_version_seq VALUES (1, 0)"))
+    async with async_sessionmaker(engine)() as session:
+        fresh = await AccessRuleDAO.get_permission_version(session=session)
+        await session.execute(text("UPDATE permission_version_seq SET is_called = 1"))
+        first = await AccessRuleDAO.get_permission_version(session=session)
+        await session.execute(
+            text("UPDATE permission_version_seq SET last_value = last_value + 1")
+        )
+        second = await AccessRuleDAO.get_permission_version(session=session)
+    await engine.dispose()
+
+    assert (fresh, first, second) == (0, 1, 2)
@@ -0,0 +1,37 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+import pytest
+from app.core.permission_cache import (
+    get_cached_permissions,
+    permission_cache,
+    set_cached_permissions,
+)
+from app.services.access_rule import invalidate_permissions
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    permission_cache.clear()
+    yield
+    permission_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_commit_happens_before_cache_is_cleared():
+    user_id = uuid4()
+    set_cached_permissions(user_id, "product", ["read_permission"])
+    cached_at_commit = []
+
+    async def commit():
+        cached_at_commit.append(get_cached_permissions(user_id, "product"))
+
+    session = AsyncMock()
+    session.in_transaction = MagicMock(return_value=True)
+    session.commit = AsyncMock(side_effect=commit)
+
+    with patch("app.services.access_rule.settings.AUTH_PERMISSIONS_IN_TOKEN", False):
+        await invalidate_permissions(session=session, user_id=user_id)
+
+    session.commit.assert_awaited_once()
+    assert cached_at_commit == [["read_permission"]]
+    assert get_cached_permissions(user_id, "product") is None
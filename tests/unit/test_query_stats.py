@@ -0,0 +1,86 @@
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from structlog.testing import capture_logs
+from app.db import query_stats
+from app.middleware.auth_logging_middleware import auth_logging_middleware
+
+
+def test_stats_counts_statements_and_repeated_shapes():
+    stats = query_stats.QueryStats()
+    for _ in range(3):
+        stats.add("SELECT 1", 0.01)
+    stats.add("SELECT 2", 0.02)
+
+    assert stats.count == 4
+    assert round(stats.duration, 3) == 0.05
+    assert stats.repeated_shapes(2) == [("SELECT 1", 3)]
+    assert stats.repeated_shapes(3) == []
+
+
+def test_engine_events_feed_current_request_stats():
+    engine = create_engine("sqlite://")
+    stats = query_stats.start_request_stats()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 1"))
+
+    assert stats.count == 2
+    assert stats.shapes["SELECT 1"] == 2
+    assert stats.duration > 0
+
+
+def test_middleware_observes_route_template(monkeypatch):
+    monkeypatch.setattr(
+        "app.middleware.auth_logging_middleware.settings.SQL_N_PLUS_ONE_THRESHOLD", 1
+    )
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.middleware("http")(auth_logging_middleware)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    labels = {"route": "/items/{item_id}"}
+    registry = query_stats.SQL_QUERIES_PER_REQUEST._metrics
+    before_n_plus_one = query_stats.SQL_N_PLUS_ONE.labels(**labels)._value.get()
+
+    response = TestClient(app).get("/items/42")
+
+    assert response.status_code == 200
+    assert ("/items/{item_id}",) in registry
+    assert query_stats.SQL_QUERIES_PER_REQUEST.labels(**labels)._sum.get() >= 3
+    n_plus_one = query_stats.SQL_N_PLUS_ONE.labels(**labels)._value.get()
+    assert n_plus_one == before_n_plus_one + 1
+
+
+def test_middleware_counts_sql_run_while_streaming_body():
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.middleware("http")(auth_logging_middleware)
+
+    @app.get("/export")
+    def export():
+        def rows():
+            with engine.connect() as conn:
+                for _ in range(4):
+                    yield str(conn.execute(text("SELECT 1")).scalar())
+
+        return StreamingResponse(rows())
+
+    histogram = query_stats.SQL_QUERIES_PER_REQUEST.labels(route="/export")
+    before = histogram._sum.get()
+
+    with capture_logs() as logs:
+        response = TestClient(app).get("/export")
+
+    assert response.text == "1111"
+    assert histogram._sum.get() - before == 4
+    (completed,) = [log for log in logs if log["event"] == "Request completed"]
+    assert completed["status"] == 200
+    assert completed["db_queries"] == 4
@@ -0,0 +1,55 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from app.db.replicas import Replica, ReplicaRouter
+
+
+def make_replica(label, checked_out=0):
+    replica = Replica(label=label, session_factory=MagicMock(name=label))
+    pool = replica.session_factory.kw["bind"].sync_engine.pool
+    pool.checkedout.return_value = checked_out
+    return replica
+
+
+def make_router(replicas, strategy="round_robin"):
+    return ReplicaRouter(
+        primary="primary",
+        replicas=replicas,
+        strategy=strategy,
+        max_lag_seconds=5,
+        lag_check_seconds=60,
+    )
+
+
+@pytest.mark.asyncio
+async def test_without_replicas_uses_primary():
+    assert await make_router([]).session_factory() == "primary"
+
+
+@pytest.mark.asyncio
+async def test_round_robin():
+    first, second = make_replica("replica1"), make_replica("replica2")
+    router = make_router([first, second])
+    with patch.object(ReplicaRouter, "_check_replica", AsyncMock()):
+        chosen = [await router.session_factory() for _ in range(4)]
+    assert chosen == [first.session_factory, second.session_factory] * 2
+
+
+@pytest.mark.asyncio
+async def test_least_connections():
+    busy, idle = make_replica("replica1", 7), make_replica("replica2", 1)
+    router = make_router([busy, idle], strategy="least_connections")
+    with patch.object(ReplicaRouter, "_check_replica", AsyncMock()):
+        assert await router.session_factory() is idle.session_factory
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_falls_back_to_primary():
+    replica = make_replica("replica1")
+    router = make_router([replica])
+
+    async def lagging(self, replica):
+        replica.lag = 30.0
+        replica.healthy = replica.lag <= self.max_lag_seconds
+
+    with patch.object(ReplicaRouter, "_check_replica", lagging):
+        assert await router.session_factory() == "primary"
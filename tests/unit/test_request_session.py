@@ -0,0 +1,66 @@
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies.get_db import connection
+from app.dependencies.permissions import require_permission
+from app.schemas.permission import AccessContext
+
+
+@pytest.fixture
+def opened_sessions():
+    sessions = []
+
+    @asynccontextmanager
+    async def fake_session(_session_factory, _isolation_level=None, _read_only=False):
+        session = AsyncMock()
+        session.in_transaction = MagicMock(return_value=True)
+        sessions.append(session)
+        yield session
+
+    access = AccessContext(user_id=uuid4(), permissions=["read_all_permission"])
+    with (
+        patch("app.dependencies.get_db.get_session_with_isolation", fake_session),
+        patch(
+            "app.dependencies.permissions.get_payload_from_jwt",
+            AsyncMock(return_value=access),
+        ) as get_payload,
+    ):
+        yield sessions, get_payload
+
+
+def make_client():
+    app = FastAPI()
+
+    @app.get("/roles")
+    async def get_roles(
+        session: AsyncSession = Depends(connection(read_only=True)),
+        access: AccessContext = Depends(require_permission("user_roles")),
+    ):
+        await session.execute("SELECT 1")
+        return {"user_id": str(access.user_id)}
+
+    return TestClient(app)
+
+
+def test_permission_chain_shares_one_session(opened_sessions):
+    sessions, get_payload = opened_sessions
+    response = make_client().get("/roles", headers={"Authorization": "Bearer t"})
+
+    assert response.status_code == 200
+    assert len(sessions) == 1
+    assert get_payload.await_args.kwargs["session"] is sessions[0]
+    sessions[0].commit.assert_awaited_once()
+
+
+def test_each_request_gets_its_own_session(opened_sessions):
+    sessions, _ = opened_sessions
+    client = make_client()
+    client.get("/roles", headers={"Authorization": "Bearer t"})
+    client.get("/roles", headers={"Authorization": "Bearer t"})
+
+    assert len(sessions) == 2
+    assert sessions[0] is not sessions[1]
@@ -0,0 +1,96 @@
+from uuid import uuid4
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.core.enums import BusinessDomain
+from app.crud.order import OrderDAO
+from app.exceptions.base import ObjectsNotFoundByIDError, PermissionDenied
+from app.schemas.permission import AccessContext
+from app.services.base_scoped_operations import (
+    delete_one_scoped,
+    find_one_scoped_by_id,
+)
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+    def scalar(self):
+        return self.value
+
+    def mappings(self):
+        return self
+
+    def one_or_none(self):
+        return self.value
+
+
+class FakeSession:
+    """Отвечает по очереди заранее заданными значениями и пишет SQL"""
+
+    def __init__(self, *values):
+        self.values = list(values)
+        self.statements = []
+
+    async def execute(self, query):
+        self.statements.append(str(query.compile(dialect=postgresql.dialect())))
+        return FakeResult(self.values.pop(0))
+
+
+def access(*permissions):
+    return AccessContext(user_id=uuid4(), permissions=list(permissions))
+
+
+async def delete_order(session, permissions):
+    return await delete_one_scoped(
+        business_element=BusinessDomain.ORDER,
+        methodDAO=OrderDAO,
+        access=access(*permissions),
+        session=session,
+        business_element_id=uuid4(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_owned_delete_is_one_statement():
+    session = FakeSession(uuid4())
+    assert await delete_order(session, ["delete_permission"]) is True
+    assert len(session.statements) == 1
+    assert '"order".user_id = ' in session.statements[0]
+    assert "RETURNING" in session.statements[0]
+
+
+@pytest.mark.asyncio
+async def test_foreign_row_is_forbidden_missing_row_is_not_found():
+    with pytest.raises(PermissionDenied):
+        await delete_order(FakeSession(None, True), ["delete_permission"])
+    with pytest.raises(ObjectsNotFoundByIDError):
+        await delete_order(FakeSession(None, False), ["delete_permission"])
+
+
+@pytest.mark.asyncio
+async def test_scoped_read_selects_columns_with_owner_predicate():
+    order_id, user_id, product_id = uuid4(), uuid4(), uuid4()
+    row = {
+        "id": order_id,
+        "user_id": user_id,
+        "product_id": product_id,
+        "quantity": 1,
+        "is_paid": False,
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "updated_at": "2026-01-01T00:00:00+00:00",
+    }
+    session = FakeSession(row)
+    order = await find_one_scoped_by_id(
+        business_element=BusinessDomain.ORDER,
+        methodDAO=OrderDAO,
+        access=access("read_permission"),
+        session=session,
+        business_element_id=order_id,
+    )
+    assert order.id == order_id
+    assert len(session.statements) == 1
+    assert '"order".user_id = ' in session.statements[0]
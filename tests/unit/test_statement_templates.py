@@ -0,0 +1,49 @@
+from app.crud.product import ProductDAO
+from app.crud.user import UserDAO
+from app.schemas.base import PaginationParams
+from app.schemas.product import SchemaProductFilter
+
+
+def test_filter_columns_precomputed():
+    assert set(ProductDAO._filter_columns) == {
+        "category_id",
+        "name",
+        "price",
+        "created_at",
+        "updated_at",
+        "id__in",
+        "category_id__in",
+        "name__startswith",
+        "price__gte",
+        "price__lte",
+        "created_at__gte",
+        "created_at__lt",
+    }
+    assert ProductDAO._filter_ops["price__gte"] == "gte"
+    assert ProductDAO._filter_ops["price"] == "eq"
+
+
+def test_same_shape_reuses_statement():
+    first, first_params = ProductDAO._select_with_params(
+        filters=SchemaProductFilter(name="Phone"),
+        pagination=PaginationParams(page=1, per_page=10),
+    )
+    second, second_params = ProductDAO._select_with_params(
+        filters=SchemaProductFilter(name="Laptop"),
+        pagination=PaginationParams(page=3, per_page=20),
+    )
+
+    assert first is second
+    assert first_params == {"filter_name": "Phone", "limit": 10, "offset": 0}
+    assert second_params == {"filter_name": "Laptop", "limit": 20, "offset": 40}
+
+
+def test_different_filters_get_different_statement():
+    by_name, _ = ProductDAO._select_with_params(SchemaProductFilter(name="Phone"))
+    by_price, params = ProductDAO._select_with_params(SchemaProductFilter(price=10))
+    assert by_name is not by_price
+    assert params == {"filter_price": 10}
+
+
+def test_auth_context_statement_built_once():
+    assert UserDAO._auth_context_statement() is UserDAO._auth_context_statement()
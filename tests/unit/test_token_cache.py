@@ -0,0 +1,45 @@
+from unittest.mock import patch
+from uuid import uuid4
+import jwt
+import pytest
+from app.core.blacklist import MemoryBlacklistBackend, TokenBlacklist
+from app.core.token_cache import token_cache
+from app.exceptions.base import BlacklistedError
+from app.services.auth_service import AuthService
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_decode_verifies_signature_once():
+    token = AuthService.create_access_token({"sub": str(uuid4()), "role": ["user"]})
+    with patch("app.services.auth_service.jwt.decode", wraps=jwt.decode) as decode:
+        first = await AuthService.decode_access_token(token)
+        second = await AuthService.decode_access_token(token)
+
+    assert first == second
+    assert decode.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_banned_token_not_served_from_cache():
+    token = AuthService.create_access_token({"sub": str(uuid4()), "role": ["user"]})
+    blacklist = TokenBlacklist(
+        backend=MemoryBlacklistBackend(maxsize=100),
+        bloom_capacity=100,
+        bloom_error_rate=0.001,
+        sync_seconds=0,
+        rebuild_seconds=0,
+    )
+    with patch("app.services.auth_service.token_blacklist", blacklist):
+        await AuthService.decode_access_token(token)
+        await AuthService.ban_token(token)
+
+        with pytest.raises(BlacklistedError):
+            await AuthService.decode_access_token(token)
+    assert len(token_cache) == 0
@@ -0,0 +1,76 @@
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from sqlalchemy.exc import OperationalError
+from app.db.unit_of_work import run_in_transaction
+from app.exceptions.base import (
+    DatabaseConnectionException,
+    SerializationFailureException,
+)
+
+
+class PgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+def db_error(pgcode):
+    return OperationalError("UPDATE ...", {}, PgError(pgcode))
+
+
+def make_session_factory():
+    sessions = []
+
+    @asynccontextmanager
+    async def session_factory():
+        session = AsyncMock()
+        session.in_transaction = MagicMock(return_value=True)
+        sessions.append(session)
+        yield session
+
+    return session_factory, sessions
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("app.db.unit_of_work.asyncio.sleep", AsyncMock()) as sleep:
+        yield sleep
+
+
+@pytest.mark.asyncio
+async def test_retries_serialization_failure_in_fresh_session():
+    session_factory, sessions = make_session_factory()
+    func = AsyncMock(side_effect=[db_error("40001"), db_error("40P01"), "ok"])
+
+    result = await run_in_transaction(
+        func, session_factory=session_factory, attempts=3, order_id=1
+    )
+
+    assert result == "ok"
+    assert func.await_count == 3
+    assert len({id(session) for session in sessions}) == 3
+    sessions[0].rollback.assert_awaited_once()
+    sessions[2].commit.assert_awaited_once()
+    func.assert_awaited_with(session=sessions[2], order_id=1)
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_exhausted():
+    session_factory, _ = make_session_factory()
+    func = AsyncMock(side_effect=db_error("40001"))
+
+    with pytest.raises(SerializationFailureException):
+        await run_in_transaction(func, session_factory=session_factory, attempts=2)
+    assert func.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_other_errors_not_retried(no_sleep):
+    session_factory, _ = make_session_factory()
+    func = AsyncMock(side_effect=db_error("57P01"))
+
+    with pytest.raises(DatabaseConnectionException):
+        await run_in_transaction(func, session_factory=session_factory, attempts=3)
+    assert func.await_count == 1
+    no_sleep.assert_not_awaited()